@@ -0,0 +1,119 @@
+"""Download path throughput and CPU cost per GB.
+
+Compares the original ``StreamingResponse(open(path, "rb"))`` path with
+``SendfileResponse`` both in its pread fallback (plain uvicorn) and with a
+server that implements the ASGI zerocopy extension via ``os.sendfile``.
+Each response is driven by a minimal ASGI server that writes the body to a
+socket pair drained by a reader thread.
+
+    python -m benchmarks.bench_download --size-mb 512 --repeat 3
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from fastapi.responses import StreamingResponse
+
+from interfaces.responses import SendfileResponse
+
+
+class SocketSink:
+    def __init__(self):
+        self.writer, self.reader = socket.socketpair()
+        self.writer.setblocking(True)
+        self.received = 0
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        buffer = bytearray(1024 * 1024)
+        while True:
+            read = self.reader.recv_into(buffer)
+            if not read:
+                break
+            self.received += read
+
+    def close(self):
+        self.writer.shutdown(socket.SHUT_WR)
+        self._thread.join()
+        self.writer.close()
+        self.reader.close()
+
+
+async def serve(response, sink: SocketSink, zerocopy: bool):
+    loop = asyncio.get_running_loop()
+    scope = {"type": "http", "extensions": {"http.response.zerocopy": {}} if zerocopy else {}}
+
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            await loop.sock_sendall(sink.writer, message.get("body", b""))
+        elif message["type"] == "http.response.zerocopy":
+            await loop.sock_sendfile(
+                sink.writer, message["file"], message["offset"], message["count"], fallback=False
+            )
+
+    sink.writer.setblocking(False)
+    await response(scope, receive, send)
+    disconnected.set()
+
+
+def build_response(mode: str, path: str, size: int):
+    if mode == "streaming":
+        return StreamingResponse(open(path, "rb"), media_type="application/octet-stream")
+    return SendfileResponse(path, 0, size, True, media_type="application/octet-stream")
+
+
+def run_once(mode: str, path: str, size: int):
+    sink = SocketSink()
+    response = build_response(mode, path, size)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    loop_cpu_start = time.thread_time()
+    asyncio.run(serve(response, sink, zerocopy=mode == "zerocopy"))
+    loop_cpu = time.thread_time() - loop_cpu_start
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    sink.close()
+    assert sink.received == size, f"{mode}: received {sink.received} of {size} bytes"
+    return wall, cpu, loop_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            temp_file.write(block)
+        path = temp_file.name
+
+    gigabytes = size / 1024 ** 3
+    print(f"{'mode':<10} {'MB/s':>10} {'CPU s/GB':>10} {'loop CPU s/GB':>14}")
+    try:
+        for mode in ("streaming", "pread", "zerocopy"):
+            runs = [run_once(mode, path, size) for _ in range(args.repeat)]
+            wall, cpu, loop_cpu = min(runs)
+            print(
+                f"{mode:<10} {args.size_mb / wall:>10.1f} "
+                f"{cpu / gigabytes:>10.3f} {loop_cpu / gigabytes:>14.3f}"
+            )
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
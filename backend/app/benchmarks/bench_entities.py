@@ -0,0 +1,101 @@
+"""Per-row cost of the entity operations in domain/entities.py.
+
+Measures ``Model(**row)``, ``from_mongo`` (model_validate, what reads use),
+``model_construct`` (what projected reads use), ``model_dump`` and
+``mongo_dict`` for the File and Folder entities, starting from documents
+shaped like the ones Mongo returns.
+
+    python -m benchmarks.bench_entities --rows 10000 --repeat 5
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from bson import ObjectId
+
+from domain.entities import File, Folder
+
+
+def file_documents(rows: int) -> List[dict]:
+    owner_id = ObjectId()
+    folder_id = ObjectId()
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "filename": f"{index:08x}_report.pdf",
+            "original_filename": "report.pdf",
+            "content_type": "application/pdf",
+            "size": index * 1024,
+            "checksum": "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+            "owner_id": owner_id,
+            "parent_folder_id": folder_id,
+            "ancestors": [folder_id],
+            "shared_with": [ObjectId(), ObjectId()],
+            "is_public": False,
+            "public_link": None,
+            "public_link_expiry": None,
+            "trashed_at": None,
+            "purge_attempts": 0,
+            "created_at": now,
+            "updated_at": now
+        }
+        for index in range(rows)
+    ]
+
+
+def folder_documents(rows: int) -> List[dict]:
+    owner_id = ObjectId()
+    parent_id = ObjectId()
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"folder {index}",
+            "owner_id": owner_id,
+            "parent_folder_id": parent_id,
+            "ancestors": [parent_id],
+            "shared_with": [],
+            "created_at": now,
+            "updated_at": now
+        }
+        for index in range(rows)
+    ]
+
+
+def measure(operation: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entity':<8} {'operation':<12} {'us/row':>10} {'rows/s':>12}")
+    for model, documents in ((File, file_documents(args.rows)), (Folder, folder_documents(args.rows))):
+        entities = [model.from_mongo(document) for document in documents]
+        operations = (
+            ("kwargs", lambda: [model(**document) for document in documents]),
+            ("from_mongo", lambda: [model.from_mongo(document) for document in documents]),
+            ("construct", lambda: [model.model_construct(**document) for document in documents]),
+            ("model_dump", lambda: [entity.model_dump(by_alias=True) for entity in entities]),
+            ("mongo_dict", lambda: [entity.mongo_dict() for entity in entities])
+        )
+        for name, operation in operations:
+            elapsed = measure(operation, args.repeat)
+            print(
+                f"{model.__name__:<8} {name:<12} "
+                f"{elapsed / args.rows * 1e6:>10.2f} {args.rows / elapsed:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Cost of rendering a file listing.
+
+Compares the previous path, where a hand-built dict per row was revalidated
+against ``List[FileResponse]`` and encoded with the standard JSONResponse,
+with the shared serializer rendered by orjson through ``JSONBytesResponse``.
+Both start from hydrated ``File`` entities, as the handlers do.
+
+    python -m benchmarks.bench_listing --rows 10000 --repeat 5
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from domain.entities import File
+from interfaces.responses import JSONBytesResponse
+from interfaces.serializers import FileResponse, serialize_file
+
+
+def make_files(rows: int) -> List[File]:
+    owner_id = ObjectId()
+    folder_id = ObjectId()
+    now = datetime.utcnow()
+    return [
+        File(
+            id=ObjectId(),
+            filename=f"{index:08x}_report.pdf",
+            original_filename="report.pdf",
+            content_type="application/pdf",
+            size=index * 1024,
+            checksum="e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+            owner_id=owner_id,
+            parent_folder_id=folder_id,
+            shared_with=[ObjectId(), ObjectId()],
+            created_at=now,
+            updated_at=now
+        )
+        for index in range(rows)
+    ]
+
+
+def render_validated(files: List[File], adapter: TypeAdapter) -> bytes:
+    content = [serialize_file(file) for file in files]
+    validated = adapter.validate_python(content)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def render_fast(files: List[File]) -> bytes:
+    return JSONBytesResponse([serialize_file(file) for file in files]).body
+
+
+def measure(render, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = make_files(args.rows)
+    adapter = TypeAdapter(List[FileResponse])
+
+    print(f"{'path':<10} {'ms':>10} {'rows/s':>12} {'bytes':>10}")
+    for name, render in (
+        ("validated", lambda: render_validated(files, adapter)),
+        ("orjson", lambda: render_fast(files))
+    ):
+        elapsed = measure(render, args.repeat)
+        print(f"{name:<10} {elapsed * 1000:>10.1f} {args.rows / elapsed:>12.0f} {len(render()):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Login throughput and latency of other requests during a login storm.
+
+Runs a burst of password verifications either inline on the event loop, as
+``UserUseCases`` used to, or through ``PasswordHasher``. Meanwhile a probe
+stands in for the rest of the API: it issues a cheap request every few
+milliseconds and records how long each one waits for the loop.
+
+    python -m benchmarks.bench_login --logins 64 --rounds 12 --workers 4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+
+from domain.password_hasher import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+PROBE_INTERVAL = 0.005
+
+
+async def verify_inline(password_hash: str) -> bool:
+    return bcrypt.checkpw(PASSWORD.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+async def probe(stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        latencies.append(time.perf_counter() - started_at - PROBE_INTERVAL)
+
+
+async def storm(mode: str, logins: int, concurrency: int, password_hasher: PasswordHasher, password_hash: str):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if mode == "inline":
+                assert await verify_inline(password_hash)
+            else:
+                assert await password_hasher.verify(PASSWORD, password_hash)
+
+    stop = asyncio.Event()
+    latencies = []
+    prober = asyncio.create_task(probe(stop, latencies))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+    started_at = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    await prober
+    return elapsed, latencies
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    password_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(args.rounds)).decode("utf-8")
+    password_hasher = PasswordHasher(args.rounds, args.workers, max_pending=args.logins)
+
+    print(f"{'mode':<8} {'logins/s':>10} {'probe p50 ms':>13} {'probe p99 ms':>13} {'probe max ms':>13}")
+    try:
+        for mode in ("inline", "pool"):
+            elapsed, latencies = asyncio.run(
+                storm(mode, args.logins, args.concurrency, password_hasher, password_hash)
+            )
+            print(
+                f"{mode:<8} {args.logins / elapsed:>10.1f} "
+                f"{statistics.median(latencies) * 1000 if latencies else 0.0:>13.2f} "
+                f"{percentile(latencies, 0.99) * 1000:>13.2f} "
+                f"{max(latencies, default=0.0) * 1000:>13.2f}"
+            )
+    finally:
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
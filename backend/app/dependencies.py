@@ -1,14 +1,55 @@
 from fastapi import Depends
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+from datetime import timedelta
 from functools import lru_cache
-from domain.use_cases import UserUseCases, FileUseCases, FolderUseCases
-from infrastructure.database.mongodb import MongoDBUserRepository, MongoDBFileRepository, MongoDBFolderRepository
+from domain.use_cases import UserUseCases, FileUseCases, FolderUseCases, UploadSessionUseCases
+from domain.password_hasher import PasswordHasher
+from infrastructure.database.mongodb import (
+    MongoDBUserRepository,
+    MongoDBFileRepository,
+    MongoDBFolderRepository,
+    MongoDBUploadSessionRepository
+)
 from infrastructure.database.local_file_storage_repository import LocalFileStorageRepository
+from infrastructure.database.content_addressable_file_storage_repository import ContentAddressableFileStorageRepository
+from infrastructure.database.indexes import IndexBootstrap
+from infrastructure.database.cached_repositories import (
+    CachedFileRepository,
+    CachedFolderRepository,
+    CachedUserRepository
+)
+from infrastructure.cache import CacheRegistry, LocalInvalidationChannel, MongoInvalidationChannel
+from infrastructure.io_executor import BoundedIOExecutor
+from infrastructure.purge_worker import PurgeWorker
 
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "file_storage")
+MONGODB_ENSURE_INDEXES = os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() == "true"
 STORAGE_PATH = os.getenv("STORAGE_PATH", "./storage")
+STORAGE_CHUNK_SIZE = int(os.getenv("STORAGE_CHUNK_SIZE", 1024 * 1024))
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_FANOUT_LEVELS = int(os.getenv("STORAGE_FANOUT_LEVELS", 2))
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", 16))
+STORAGE_IO_MAX_PENDING = int(os.getenv("STORAGE_IO_MAX_PENDING", 256))
+SENDFILE_MIN_SIZE = int(os.getenv("SENDFILE_MIN_SIZE", 1024 * 1024))
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", 1000))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", 1000))
+BULK_UPLOAD_CONCURRENCY = int(os.getenv("BULK_UPLOAD_CONCURRENCY", 8))
+UPLOAD_SESSION_TTL = int(os.getenv("UPLOAD_SESSION_TTL", 24 * 60 * 60))
+UPLOAD_SESSION_GC_INTERVAL = int(os.getenv("UPLOAD_SESSION_GC_INTERVAL", 60 * 60))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", 100))
+PURGE_CONCURRENCY = int(os.getenv("PURGE_CONCURRENCY", 8))
+PURGE_MAX_ATTEMPTS = int(os.getenv("PURGE_MAX_ATTEMPTS", 5))
+PURGE_IDLE_INTERVAL = int(os.getenv("PURGE_IDLE_INTERVAL", 30))
+PURGE_CLAIM_TIMEOUT = int(os.getenv("PURGE_CLAIM_TIMEOUT", 600))
+METADATA_CACHE_SIZE = int(os.getenv("METADATA_CACHE_SIZE", 10000))
+METADATA_CACHE_TTL = int(os.getenv("METADATA_CACHE_TTL", 30))
+METADATA_CACHE_CHANNEL = os.getenv("METADATA_CACHE_CHANNEL", "local")
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 60))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 
 os.makedirs(STORAGE_PATH, exist_ok=True)
@@ -18,32 +59,101 @@ def get_database():
     client = AsyncIOMotorClient(MONGODB_URL)
     return client[MONGODB_DB_NAME]
 
+@lru_cache
+def get_cache_registry():
+    if METADATA_CACHE_CHANNEL == "mongodb":
+        channel = MongoInvalidationChannel(get_database()["cache_invalidations"])
+    else:
+        channel = LocalInvalidationChannel()
+    return CacheRegistry(channel, METADATA_CACHE_SIZE, METADATA_CACHE_TTL)
+
 def get_user_repository():
     db = get_database()
-    return MongoDBUserRepository(db["users"])
+    repository = MongoDBUserRepository(db["users"])
+    if not METADATA_CACHE_SIZE or not USER_CACHE_TTL:
+        return repository
+    return CachedUserRepository(repository, get_cache_registry(), USER_CACHE_TTL)
 
 def get_file_repository():
     db = get_database()
-    return MongoDBFileRepository(db["files"])
+    repository = MongoDBFileRepository(db["files"])
+    if not METADATA_CACHE_SIZE:
+        return repository
+    return CachedFileRepository(repository, get_cache_registry())
 
 def get_folder_repository():
     db = get_database()
-    return MongoDBFolderRepository(db["folders"])
+    repository = MongoDBFolderRepository(db["folders"])
+    if not METADATA_CACHE_SIZE:
+        return repository
+    return CachedFolderRepository(repository, get_cache_registry())
+
+def get_upload_session_repository():
+    db = get_database()
+    return MongoDBUploadSessionRepository(db["upload_sessions"])
+
+@lru_cache
+def get_index_bootstrap():
+    return IndexBootstrap()
+
+@lru_cache
+def get_io_executor():
+    return BoundedIOExecutor(STORAGE_IO_WORKERS, STORAGE_IO_MAX_PENDING)
 
+@lru_cache
 def get_file_storage_repository():
-    return LocalFileStorageRepository(STORAGE_PATH)
+    if STORAGE_BACKEND == "content_addressable":
+        db = get_database()
+        return ContentAddressableFileStorageRepository(
+            STORAGE_PATH, db["blobs"], STORAGE_CHUNK_SIZE, STORAGE_FANOUT_LEVELS, get_io_executor()
+        )
+    return LocalFileStorageRepository(
+        STORAGE_PATH, STORAGE_CHUNK_SIZE, STORAGE_FANOUT_LEVELS, get_io_executor()
+    )
+
+@lru_cache
+def get_password_hasher():
+    return PasswordHasher(BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+@lru_cache
+def get_purge_worker():
+    return PurgeWorker(
+        get_file_repository(),
+        get_file_storage_repository(),
+        batch_size=PURGE_BATCH_SIZE,
+        concurrency=PURGE_CONCURRENCY,
+        max_attempts=PURGE_MAX_ATTEMPTS,
+        idle_interval=PURGE_IDLE_INTERVAL,
+        claim_timeout=PURGE_CLAIM_TIMEOUT
+    )
 
-def get_user_use_cases(user_repository=Depends(get_user_repository)):
-    return UserUseCases(user_repository, SECRET_KEY)
+def get_user_use_cases(
+    user_repository=Depends(get_user_repository),
+    password_hasher=Depends(get_password_hasher)
+):
+    return UserUseCases(user_repository, SECRET_KEY, password_hasher)
 
 def get_file_use_cases(
     file_repository=Depends(get_file_repository),
-    file_storage_repository=Depends(get_file_storage_repository)
+    file_storage_repository=Depends(get_file_storage_repository),
+    folder_repository=Depends(get_folder_repository)
 ):
-    return FileUseCases(file_repository, file_storage_repository)
+    return FileUseCases(file_repository, file_storage_repository, folder_repository)
 
 def get_folder_use_cases(
     folder_repository=Depends(get_folder_repository),
     file_repository=Depends(get_file_repository)
 ):
     return FolderUseCases(folder_repository, file_repository)
+
+def get_upload_session_use_cases(
+    upload_session_repository=Depends(get_upload_session_repository),
+    file_storage_repository=Depends(get_file_storage_repository),
+    file_use_cases=Depends(get_file_use_cases)
+):
+    return UploadSessionUseCases(
+        upload_session_repository,
+        file_storage_repository,
+        file_use_cases,
+        timedelta(seconds=UPLOAD_SESSION_TTL)
+    )
@@ -39,22 +39,34 @@ class MongoBaseModel(BaseModel):
     
     @classmethod
     def from_mongo(cls, data: dict[str, Any]):
+        # model_validate keeps rows validated and skips the keyword copy of Model(**row).
         if data is None:
             return None
         return cls.model_validate(data)
 
 
+class StoredBlob(BaseModel):
+    filename: str
+    size: int
+    checksum: str
+
+
 class File(MongoBaseModel):
     filename: str
     original_filename: str
     content_type: str
     size: int
+    checksum: Optional[str] = None
     owner_id: ObjectIdField
     parent_folder_id: Optional[ObjectIdField] = None
+    ancestors: List[ObjectIdField] = []
     shared_with: List[ObjectIdField] = []
     is_public: bool = False
     public_link: Optional[str] = None
     public_link_expiry: Optional[datetime] = None
+    trashed_at: Optional[datetime] = None
+    purge_attempts: int = 0
+    purge_claimed_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -77,6 +89,7 @@ class Folder(MongoBaseModel):
     name: str
     owner_id: ObjectIdField
     parent_folder_id: Optional[ObjectIdField] = None
+    ancestors: List[ObjectIdField] = []
     shared_with: List[ObjectIdField] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -116,3 +129,40 @@ class User(MongoBaseModel):
         if data.get("_id") is not None:
             data["_id"] = str(data["_id"])
         return data
+
+
+class FolderContents(BaseModel):
+    folder: Optional[Folder] = None
+    ancestors: List[Folder] = []
+    folders: List[Folder] = []
+    files: List[File] = []
+    folder_count: int = 0
+    file_count: int = 0
+    total_size: int = 0
+
+
+class UploadSession(MongoBaseModel):
+    owner_id: ObjectIdField
+    filename: str
+    content_type: str
+    parent_folder_id: Optional[ObjectIdField] = None
+    total_chunks: Optional[int] = None
+    received_chunks: List[int] = []
+    status: str = "open"
+    expires_at: datetime
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_schema_extra = {
+            "json_encoders": {ObjectId: str}
+        }
+
+    def model_dump(self, **kwargs):
+        kwargs.pop("exclude_none", None)
+        data = super().model_dump(**kwargs)
+        if data.get("_id") is not None:
+            data["_id"] = str(data["_id"])
+        return data
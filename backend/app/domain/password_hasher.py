@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+import asyncio
+import bcrypt
+import threading
+import time
+
+T = TypeVar("T")
+
+DEFAULT_ROUNDS = 12
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    # bcrypt releases the GIL, so a small pool keeps logins off the event loop.
+    def __init__(
+        self,
+        rounds: int = DEFAULT_ROUNDS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._total_time = 0.0
+
+    async def hash(self, password: str) -> str:
+        password_hash = await self._run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(self.rounds))
+        return password_hash.decode("utf-8")
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        try:
+            return await self._run(bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+        except ValueError:
+            # Not a bcrypt hash.
+            return False
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        parts = password_hash.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return True
+        return int(parts[2]) != self.rounds
+
+    def record_rehash(self) -> None:
+        with self._lock:
+            self._rehashed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+                "time_avg_ms": (self._total_time / self._completed * 1000) if self._completed else 0.0
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy("Too many password checks in progress")
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hasher")
+        started_at = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._total_time += time.perf_counter() - started_at
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List, BinaryIO, Optional
-from domain.entities import File, Folder, User
+from typing import Optional, List, BinaryIO, AsyncIterator, Tuple
+from datetime import datetime, timedelta
+from bson import ObjectId
+import asyncio
+from domain.entities import File, Folder, User, StoredBlob, UploadSession
 from fastapi import UploadFile
 
 
@@ -9,30 +12,121 @@ class FileRepository(ABC):
     async def create(self, file: File) -> File:
         pass
     
+    @abstractmethod
+    async def create_many(self, files: List[File]) -> List[Optional[File]]:
+        pass
+    
     @abstractmethod
     async def get_by_id(self, file_id: str) -> Optional[File]:
         pass
     
     @abstractmethod
-    async def list_by_owner(self, owner_id: str, folder_id: Optional[str] = None) -> List[File]:
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        shared_with: Optional[str] = None
+    ) -> List[File]:
+        pass
+    
+    @abstractmethod
+    def iter_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[File]:
         pass
     
     @abstractmethod
-    async def list_shared_with_user(self, user_id: str) -> List[File]:
+    async def list_shared_with_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[File]:
         pass
     
     @abstractmethod
     async def update(self, file_id: str, data: dict) -> Optional[File]:
         pass
     
+    @abstractmethod
+    async def add_shared_user(self, file_id: str, owner_id: str, user_id: str) -> Optional[File]:
+        pass
+    
+    @abstractmethod
+    async def list_by_ancestor(
+        self,
+        folder_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None
+    ) -> List[File]:
+        pass
+    
+    @abstractmethod
+    async def trash(self, file_id: str, owner_id: str) -> bool:
+        pass
+    
+    @abstractmethod
+    async def trash_by_ancestor(self, folder_id: str) -> int:
+        pass
+    
+    @abstractmethod
+    async def claim_trashed(self, limit: int, max_attempts: int, claim_timeout: timedelta) -> List[File]:
+        pass
+    
+    @abstractmethod
+    async def count_trashed(self) -> int:
+        pass
+    
+    @abstractmethod
+    async def record_purge_failures(self, file_ids: List[str]) -> None:
+        pass
+    
+    @abstractmethod
+    async def delete_many(self, file_ids: List[str]) -> int:
+        pass
+    
+    @abstractmethod
+    def iter_by_filename(self, after: Optional[str] = None) -> AsyncIterator[File]:
+        pass
+    
+    @abstractmethod
+    async def rebase_ancestors(self, folder_id: str, ancestors: List[ObjectId]) -> int:
+        pass
+    
+    @abstractmethod
+    async def usage_by_ancestor(self, folder_id: str) -> Tuple[int, int]:
+        pass
+    
+    @abstractmethod
+    async def usage_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        shared_with: Optional[str] = None
+    ) -> Tuple[int, int]:
+        pass
+    
     @abstractmethod
     async def delete(self, file_id: str) -> bool:
         pass
 
 
 class FileStorageRepository(ABC):
+    # reference is the File id a blob is saved or deleted for.
+    @abstractmethod
+    async def save(self, file: UploadFile, filename: str, reference: Optional[str] = None) -> StoredBlob:
+        pass
+    
     @abstractmethod
-    async def save(self, file: UploadFile, filename: str) -> str:
+    async def save_stream(self, chunks: AsyncIterator[bytes], filename: str, reference: Optional[str] = None) -> StoredBlob:
         pass
     
     @abstractmethod
@@ -40,8 +134,72 @@ class FileStorageRepository(ABC):
         pass
     
     @abstractmethod
-    async def delete(self, filename: str) -> bool:
+    async def delete(self, filename: str, reference: Optional[str] = None) -> bool:
+        pass
+    
+    async def open_range(
+        self,
+        filename: str,
+        start: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        file = await self.get(filename)
+        if not file:
+            return None
+        return _iter_file_range(file, start, length)
+    
+    async def get_path(self, filename: str) -> Optional[str]:
+        return None
+    
+    @abstractmethod
+    async def save_part(self, upload_id: str, index: int, chunks: AsyncIterator[bytes]) -> int:
+        pass
+    
+    @abstractmethod
+    def iter_parts(self, upload_id: str, count: int) -> AsyncIterator[bytes]:
+        pass
+    
+    @abstractmethod
+    async def delete_parts(self, upload_id: str) -> None:
+        pass
+    
+    @abstractmethod
+    def iter_blob_names(self, after: Optional[str] = None) -> AsyncIterator[str]:
+        pass
+    
+    @abstractmethod
+    async def get_modified_at(self, filename: str) -> Optional[datetime]:
+        pass
+    
+    @abstractmethod
+    async def quarantine(self, filename: str) -> bool:
         pass
+    
+    @abstractmethod
+    async def remove_orphan(self, filename: str) -> bool:
+        pass
+
+
+async def _iter_file_range(
+    file: BinaryIO,
+    start: int,
+    length: Optional[int],
+    chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, file.seek, start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            read_size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = await loop.run_in_executor(None, file.read, read_size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
 
 
 class FolderRepository(ABC):
@@ -54,13 +212,60 @@ class FolderRepository(ABC):
         pass
     
     @abstractmethod
-    async def list_by_owner(self, owner_id: str, parent_folder_id: Optional[str] = None) -> List[Folder]:
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        shared_with: Optional[str] = None
+    ) -> List[Folder]:
+        pass
+    
+    @abstractmethod
+    def iter_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Folder]:
+        pass
+    
+    @abstractmethod
+    async def list_by_ids(self, folder_ids: List[str]) -> List[Folder]:
+        pass
+    
+    @abstractmethod
+    async def count_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        shared_with: Optional[str] = None
+    ) -> int:
         pass
     
     @abstractmethod
     async def update(self, folder_id: str, data: dict) -> Optional[Folder]:
         pass
     
+    @abstractmethod
+    async def add_shared_user(self, folder_id: str, owner_id: str, user_id: str) -> Optional[Folder]:
+        pass
+    
+    @abstractmethod
+    async def list_by_ancestor(self, folder_id: str) -> List[Folder]:
+        pass
+    
+    @abstractmethod
+    async def delete_subtree(self, folder_id: str) -> int:
+        pass
+    
+    @abstractmethod
+    async def move(self, folder_id: str, parent_folder_id: Optional[str], ancestors: List[ObjectId]) -> Optional[Folder]:
+        pass
+    
     @abstractmethod
     async def delete(self, folder_id: str) -> bool:
         pass
@@ -86,3 +291,34 @@ class UserRepository(ABC):
     @abstractmethod
     async def update(self, user_id: str, data: dict) -> Optional[User]:
         pass
+
+
+
+class UploadSessionRepository(ABC):
+    @abstractmethod
+    async def create(self, upload_session: UploadSession) -> UploadSession:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, session_id: str) -> Optional[UploadSession]:
+        pass
+    
+    @abstractmethod
+    async def add_received_chunk(self, session_id: str, index: int, expires_at: datetime) -> Optional[UploadSession]:
+        pass
+    
+    @abstractmethod
+    async def claim_for_commit(self, session_id: str, expires_at: datetime) -> Optional[UploadSession]:
+        pass
+    
+    @abstractmethod
+    async def release_commit(self, session_id: str) -> None:
+        pass
+    
+    @abstractmethod
+    async def list_expired(self, now: datetime, limit: int) -> List[UploadSession]:
+        pass
+    
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        pass
@@ -1,22 +1,45 @@
-from domain.entities import File, Folder, User
-from domain.repositories import FolderRepository, FileRepository, UserRepository, FileStorageRepository
+from domain.entities import File, Folder, FolderContents, User, StoredBlob, UploadSession
+from domain.repositories import FolderRepository, FileRepository, UserRepository, FileStorageRepository, UploadSessionRepository
+from domain.password_hasher import PasswordHasher, PasswordHasherBusy
 from datetime import datetime, timedelta
 import uuid
-from typing import Optional, List, BinaryIO
+from typing import Optional, List, AsyncIterator, Tuple
+import asyncio
 from fastapi import UploadFile
 from bson import ObjectId
 import jwt
-import bcrypt
 from jwt.exceptions import InvalidTokenError
 
+WALK_PAGE_SIZE = 1000
+MAX_UPLOAD_CHUNKS = 10000
+DEFAULT_FILENAME = "file"
+
+def safe_filename(filename: Optional[str]) -> str:
+    name = (filename or "").replace("\\", "/").rsplit("/", 1)[-1].replace("\0", "")
+    if name in ("", ".", ".."):
+        return DEFAULT_FILENAME
+    return name
+
+def _can_access_file(file: File, user_id: str) -> bool:
+    return str(file.owner_id) == user_id or ObjectId(user_id) in file.shared_with or file.is_public
+
+def _without_sharing(entity):
+    # Who else has access, and the public link token, are the owner's business.
+    update = {"shared_with": []}
+    if isinstance(entity, File):
+        update.update(public_link=None, public_link_expiry=None)
+    return entity.model_copy(update=update)
+
 class FileUseCases:
     def __init__(
         self, 
         file_repository: FileRepository, 
-        file_storage_repository: FileStorageRepository
+        file_storage_repository: FileStorageRepository,
+        folder_repository: Optional[FolderRepository] = None
     ):
         self.file_repository = file_repository
         self.file_storage_repository = file_storage_repository
+        self.folder_repository = folder_repository
     
     async def upload_file(
         self, 
@@ -24,60 +47,184 @@ class FileUseCases:
         owner_id: str,
         parent_folder_id: Optional[str] = None
     ) -> File:
-        unique_filename = f"{uuid.uuid4().hex}_{upload_file.filename}"
-        stored_filename = await self.file_storage_repository.save(upload_file, unique_filename)
-        file = File(
-            filename=stored_filename,
-            original_filename=upload_file.filename,
-            content_type=upload_file.content_type,
-            size=await self._get_file_size(upload_file),
-            owner_id=ObjectId(owner_id),
-            parent_folder_id=ObjectId(parent_folder_id) if parent_folder_id else None
+        ancestors = await self._folder_ancestors(parent_folder_id, owner_id)
+        file_id = ObjectId()
+        original_filename = safe_filename(upload_file.filename)
+        unique_filename = f"{uuid.uuid4().hex}_{original_filename}"
+        stored_blob = await self.file_storage_repository.save(upload_file, unique_filename, str(file_id))
+        return await self._create_file(
+            file_id, stored_blob, original_filename, upload_file.content_type, owner_id, parent_folder_id, ancestors
+        )
+    
+    async def create_file_from_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        original_filename: str,
+        content_type: str,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None
+    ) -> File:
+        ancestors = await self._folder_ancestors(parent_folder_id, owner_id)
+        file_id = ObjectId()
+        original_filename = safe_filename(original_filename)
+        unique_filename = f"{uuid.uuid4().hex}_{original_filename}"
+        stored_blob = await self.file_storage_repository.save_stream(chunks, unique_filename, str(file_id))
+        return await self._create_file(
+            file_id, stored_blob, original_filename, content_type, owner_id, parent_folder_id, ancestors
         )
+    
+    async def upload_files(
+        self,
+        upload_files: List[UploadFile],
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        concurrency: int = 8
+    ) -> List[Tuple[Optional[File], Optional[str]]]:
+        ancestors = await self._folder_ancestors(parent_folder_id, owner_id)
+        semaphore = asyncio.Semaphore(concurrency)
+        file_ids = [ObjectId() for _ in upload_files]
+        
+        async def save(upload_file: UploadFile, file_id: ObjectId) -> StoredBlob:
+            async with semaphore:
+                unique_filename = f"{uuid.uuid4().hex}_{safe_filename(upload_file.filename)}"
+                return await self.file_storage_repository.save(upload_file, unique_filename, str(file_id))
         
+        stored_blobs = await asyncio.gather(
+            *(save(upload_file, file_id) for upload_file, file_id in zip(upload_files, file_ids)),
+            return_exceptions=True
+        )
+        results: List[Tuple[Optional[File], Optional[str]]] = [(None, None)] * len(upload_files)
+        pending_files = []
+        for index, stored_blob in enumerate(stored_blobs):
+            if isinstance(stored_blob, Exception):
+                results[index] = (None, "Failed to store file")
+                continue
+            if isinstance(stored_blob, BaseException):
+                raise stored_blob
+            upload_file = upload_files[index]
+            pending_files.append((index, self._build_file(
+                file_ids[index], stored_blob, safe_filename(upload_file.filename), upload_file.content_type, owner_id, parent_folder_id, ancestors
+            )))
+        
+        try:
+            created_files = await self.file_repository.create_many([file for _, file in pending_files])
+        except Exception:
+            await asyncio.gather(
+                *(self.file_storage_repository.delete(file.filename, str(file.id)) for _, file in pending_files),
+                return_exceptions=True
+            )
+            raise
+        for (index, file), created_file in zip(pending_files, created_files):
+            if created_file:
+                results[index] = (created_file, None)
+            else:
+                await self.file_storage_repository.delete(file.filename, str(file.id))
+                results[index] = (None, "Failed to save file metadata")
+        return results
+    
+    async def _create_file(
+        self,
+        file_id: ObjectId,
+        stored_blob: StoredBlob,
+        original_filename: str,
+        content_type: str,
+        owner_id: str,
+        parent_folder_id: Optional[str],
+        ancestors: List[ObjectId]
+    ) -> File:
+        file = self._build_file(
+            file_id,
+            stored_blob,
+            original_filename,
+            content_type,
+            owner_id,
+            parent_folder_id,
+            ancestors
+        )
         return await self.file_repository.create(file)
     
-    async def download_file(self, file_id: str, user_id: str) -> Optional[tuple[BinaryIO, str, str]]:
+    async def _folder_ancestors(self, parent_folder_id: Optional[str], owner_id: str) -> List[ObjectId]:
+        if not parent_folder_id:
+            return []
+        parent_folder = None
+        if self.folder_repository:
+            parent_folder = await self.folder_repository.get_by_id(parent_folder_id)
+        if not parent_folder or str(parent_folder.owner_id) != owner_id:
+            raise ValueError("Parent folder not found")
+        return parent_folder.ancestors + [parent_folder.id]
+    
+    def _build_file(
+        self,
+        file_id: ObjectId,
+        stored_blob: StoredBlob,
+        original_filename: str,
+        content_type: str,
+        owner_id: str,
+        parent_folder_id: Optional[str],
+        ancestors: List[ObjectId]
+    ) -> File:
+        return File(
+            id=file_id,
+            filename=stored_blob.filename,
+            original_filename=original_filename,
+            content_type=content_type,
+            size=stored_blob.size,
+            checksum=stored_blob.checksum,
+            owner_id=ObjectId(owner_id),
+            parent_folder_id=ObjectId(parent_folder_id) if parent_folder_id else None,
+            ancestors=ancestors
+        )
+    
+    async def get_file(self, file_id: str, user_id: str) -> Optional[File]:
         file = await self.file_repository.get_by_id(file_id)
-        if not file:
-            return None
-        if (str(file.owner_id) != user_id and 
-            ObjectId(user_id) not in file.shared_with and 
-            not file.is_public):
-            return None
-        file_content = await self.file_storage_repository.get(file.filename)
-        if not file_content:
+        if not file or not _can_access_file(file, user_id):
             return None
-        return (file_content, file.original_filename, file.content_type)
+        return file
+    
+    async def read_file(
+        self,
+        file: File,
+        start: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        return await self.file_storage_repository.open_range(file.filename, start, length)
     
-    async def list_files(self, owner_id: str, folder_id: Optional[str] = None) -> List[File]:
-        return await self.file_repository.list_by_owner(owner_id, folder_id)
+    async def get_file_path(self, file: File) -> Optional[str]:
+        return await self.file_storage_repository.get_path(file.filename)
     
-    async def list_shared_files(self, user_id: str) -> List[File]:
-        return await self.file_repository.list_shared_with_user(user_id)
+    async def list_files(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[File]:
+        return await self.file_repository.list_by_owner(owner_id, folder_id, limit, after_id, fields)
+    
+    def iter_files(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[File]:
+        return self.file_repository.iter_by_owner(owner_id, folder_id, after_id, fields)
+    
+    async def list_shared_files(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[File]:
+        return await self.file_repository.list_shared_with_user(user_id, limit, after_id, fields)
     
     async def delete_file(self, file_id: str, user_id: str) -> bool:
-        file = await self.file_repository.get_by_id(file_id)
-        if not file:
-            return False
-        if str(file.owner_id) != user_id:
-            return False
-        storage_deleted = await self.file_storage_repository.delete(file.filename)
-        if not storage_deleted:
-            return False
-        
-        return await self.file_repository.delete(file_id)
+        return await self.file_repository.trash(file_id, user_id)
     
     async def share_file(self, file_id: str, owner_id: str, shared_with_id: str) -> Optional[File]:
-        file = await self.file_repository.get_by_id(file_id)
-        if not file:
-            return None
-        if str(file.owner_id) != owner_id:
-            return None
-        if ObjectId(shared_with_id) not in file.shared_with:
-            file.shared_with.append(ObjectId(shared_with_id))
-            return await self.file_repository.update(file_id, {"shared_with": file.shared_with})
-        return file
+        return await self.file_repository.add_shared_user(file_id, owner_id, shared_with_id)
     
     async def create_public_link(self, file_id: str, owner_id: str, expires_in_days: Optional[int] = None) -> Optional[str]:
         file = await self.file_repository.get_by_id(file_id)
@@ -108,13 +255,119 @@ class FileUseCases:
                 continue
             return file
         return None
+
+
+class UploadSessionUseCases:
+    def __init__(
+        self,
+        upload_session_repository: UploadSessionRepository,
+        file_storage_repository: FileStorageRepository,
+        file_use_cases: FileUseCases,
+        session_ttl: timedelta = timedelta(hours=24)
+    ):
+        self.upload_session_repository = upload_session_repository
+        self.file_storage_repository = file_storage_repository
+        self.file_use_cases = file_use_cases
+        self.session_ttl = session_ttl
+    
+    async def create_session(
+        self,
+        owner_id: str,
+        filename: str,
+        content_type: str,
+        parent_folder_id: Optional[str] = None,
+        total_chunks: Optional[int] = None
+    ) -> UploadSession:
+        upload_session = UploadSession(
+            owner_id=ObjectId(owner_id),
+            filename=filename,
+            content_type=content_type,
+            parent_folder_id=ObjectId(parent_folder_id) if parent_folder_id else None,
+            total_chunks=total_chunks,
+            expires_at=datetime.utcnow() + self.session_ttl
+        )
+        return await self.upload_session_repository.create(upload_session)
+    
+    async def get_session(self, session_id: str, owner_id: str) -> Optional[UploadSession]:
+        upload_session = await self.upload_session_repository.get_by_id(session_id)
+        if not upload_session:
+            return None
+        if str(upload_session.owner_id) != owner_id:
+            return None
+        if upload_session.expires_at < datetime.utcnow():
+            return None
+        return upload_session
+    
+    async def upload_chunk(
+        self,
+        session_id: str,
+        owner_id: str,
+        index: int,
+        chunks: AsyncIterator[bytes]
+    ) -> Optional[UploadSession]:
+        upload_session = await self.get_session(session_id, owner_id)
+        if not upload_session or upload_session.status != "open":
+            return None
+        total_chunks = upload_session.total_chunks or MAX_UPLOAD_CHUNKS
+        if index < 0 or index >= min(total_chunks, MAX_UPLOAD_CHUNKS):
+            raise ValueError("Chunk index is out of range")
+        await self.file_storage_repository.save_part(session_id, index, chunks)
+        return await self.upload_session_repository.add_received_chunk(
+            session_id, index, datetime.utcnow() + self.session_ttl
+        )
     
-    async def _get_file_size(self, file: UploadFile) -> int:
-        current_position = file.file.tell()
-        file.file.seek(0, 2)
-        size = file.file.tell()
-        file.file.seek(current_position)
-        return size
+    async def commit_session(self, session_id: str, owner_id: str) -> Optional[File]:
+        upload_session = await self.get_session(session_id, owner_id)
+        if not upload_session:
+            return None
+        received_chunks = set(upload_session.received_chunks)
+        total_chunks = upload_session.total_chunks
+        if total_chunks is None:
+            total_chunks = max(received_chunks) + 1 if received_chunks else 0
+        if not received_chunks or len(received_chunks) != total_chunks or max(received_chunks) >= total_chunks:
+            missing_chunks = [
+                index for index in range(min(total_chunks, MAX_UPLOAD_CHUNKS)) if index not in received_chunks
+            ]
+            raise ValueError(f"Upload is incomplete, missing chunks: {missing_chunks or [0]}")
+        
+        claimed_session = await self.upload_session_repository.claim_for_commit(
+            session_id, datetime.utcnow() + self.session_ttl
+        )
+        if not claimed_session:
+            raise ValueError("Upload session is already being committed")
+        try:
+            file = await self.file_use_cases.create_file_from_stream(
+                self.file_storage_repository.iter_parts(session_id, total_chunks),
+                upload_session.filename,
+                upload_session.content_type,
+                owner_id,
+                str(upload_session.parent_folder_id) if upload_session.parent_folder_id else None
+            )
+        except BaseException:
+            await self.upload_session_repository.release_commit(session_id)
+            raise
+        
+        await self.file_storage_repository.delete_parts(session_id)
+        await self.upload_session_repository.delete(session_id)
+        return file
+    
+    async def abort_session(self, session_id: str, owner_id: str) -> bool:
+        upload_session = await self.get_session(session_id, owner_id)
+        if not upload_session:
+            return False
+        await self.file_storage_repository.delete_parts(session_id)
+        return await self.upload_session_repository.delete(session_id)
+    
+    async def purge_expired_sessions(self, batch_size: int = 100) -> int:
+        purged = 0
+        while True:
+            expired_sessions = await self.upload_session_repository.list_expired(datetime.utcnow(), batch_size)
+            for upload_session in expired_sessions:
+                await self.file_storage_repository.delete_parts(str(upload_session.id))
+                await self.upload_session_repository.delete(str(upload_session.id))
+                purged += 1
+            if len(expired_sessions) < batch_size:
+                return purged
 
 
 class FolderUseCases:
@@ -135,12 +388,83 @@ class FolderUseCases:
         folder = Folder(
             name=name,
             owner_id=owner_id,
-            parent_folder_id=parent_folder_id
+            parent_folder_id=parent_folder_id,
+            ancestors=await self._child_ancestors(parent_folder_id, owner_id)
         )
         return await self.folder_repository.create(folder)
     
-    async def list_folders(self, owner_id: str, parent_folder_id: Optional[str] = None) -> List[Folder]:
-        return await self.folder_repository.list_by_owner(owner_id, parent_folder_id)
+    async def list_folders(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Folder]:
+        return await self.folder_repository.list_by_owner(owner_id, parent_folder_id, limit, after_id, fields)
+    
+    def iter_folders(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Folder]:
+        return self.folder_repository.iter_by_owner(owner_id, parent_folder_id, after_id, fields)
+    
+    async def get_folder(self, folder_id: str, user_id: str) -> Optional[Folder]:
+        folder = await self.folder_repository.get_by_id(folder_id)
+        if not folder or not self._can_access(folder, user_id):
+            return None
+        return folder
+    
+    def _can_access(self, folder: Folder, user_id: str) -> bool:
+        return str(folder.owner_id) == user_id or ObjectId(user_id) in folder.shared_with
+    
+    async def walk_folder(self, folder: Folder, user_id: str) -> AsyncIterator[Tuple[str, Optional[File]]]:
+        paths = {folder.id: self._entry_name(folder.name, set())}
+        used_names = {folder.id: set()}
+        yield paths[folder.id], None
+        subfolders = await self.folder_repository.list_by_ancestor(str(folder.id))
+        for subfolder in sorted(subfolders, key=lambda subfolder: len(subfolder.ancestors)):
+            parent_path = paths.get(subfolder.parent_folder_id)
+            if parent_path is None or not self._can_access(subfolder, user_id):
+                continue
+            name = self._entry_name(subfolder.name, used_names[subfolder.parent_folder_id])
+            paths[subfolder.id] = f"{parent_path}/{name}"
+            used_names[subfolder.id] = set()
+            yield paths[subfolder.id], None
+        async for file in self._iter_subtree_files(str(folder.id)):
+            parent_path = paths.get(file.parent_folder_id)
+            if parent_path is None or not _can_access_file(file, user_id):
+                continue
+            name = self._entry_name(file.original_filename, used_names[file.parent_folder_id])
+            yield f"{parent_path}/{name}", file
+    
+    async def _iter_subtree_files(self, folder_id: str) -> AsyncIterator[File]:
+        after_id = None
+        while True:
+            files = await self.file_repository.list_by_ancestor(folder_id, WALK_PAGE_SIZE, after_id)
+            for file in files:
+                yield file
+            if len(files) < WALK_PAGE_SIZE:
+                break
+            after_id = str(files[-1].id)
+    
+    def _entry_name(self, name: str, used_names: set) -> str:
+        name = name.replace("/", "_").replace("\\", "_")
+        if name in ("", ".", ".."):
+            name = "unnamed"
+        base, dot, extension = name.rpartition(".")
+        if not dot:
+            base, extension = name, ""
+        candidate = name
+        counter = 1
+        while candidate.lower() in used_names:
+            candidate = f"{base} ({counter}){dot}{extension}"
+            counter += 1
+        used_names.add(candidate.lower())
+        return candidate
     
     async def delete_folder(self, folder_id: str, owner_id: str) -> bool:
         folder = await self.folder_repository.get_by_id(folder_id)
@@ -148,30 +472,98 @@ class FolderUseCases:
             return False
         if str(folder.owner_id) != owner_id:
             return False
-        files = await self.file_repository.list_by_owner(owner_id, folder_id)
-        for file in files:
-            await self.file_repository.delete(str(file.id))
-        subfolders = await self.folder_repository.list_by_owner(owner_id, folder_id)
-        for subfolder in subfolders:
-            await self.delete_folder(str(subfolder.id), owner_id)
-        return await self.folder_repository.delete(folder_id)
+        await self.file_repository.trash_by_ancestor(folder_id)
+        return await self.folder_repository.delete_subtree(folder_id) > 0
     
-    async def share_folder(self, folder_id: str, owner_id: str, shared_with_id: str) -> Optional[Folder]:
+    async def move_folder(self, folder_id: str, owner_id: str, parent_folder_id: Optional[str]) -> Optional[Folder]:
         folder = await self.folder_repository.get_by_id(folder_id)
         if not folder:
             return None
         if str(folder.owner_id) != owner_id:
             return None
-        if ObjectId(shared_with_id) not in folder.shared_with:
-            folder.shared_with.append(ObjectId(shared_with_id))
-            return await self.folder_repository.update(folder_id, {"shared_with": folder.shared_with})
-        return folder
+        ancestors = await self._child_ancestors(parent_folder_id, owner_id)
+        if folder.id in ancestors:
+            raise ValueError("Cannot move a folder into itself or its subfolder")
+        moved_folder = await self.folder_repository.move(folder_id, parent_folder_id, ancestors)
+        if moved_folder:
+            await self.file_repository.rebase_ancestors(folder_id, ancestors)
+        return moved_folder
+    
+    async def get_folder_usage(self, folder_id: str, user_id: str) -> Optional[Tuple[int, int]]:
+        folder = await self.get_folder(folder_id, user_id)
+        if not folder:
+            return None
+        return await self.file_repository.usage_by_ancestor(folder_id)
+    
+    async def get_folder_contents(
+        self,
+        user_id: str,
+        folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        folders_after_id: Optional[str] = None,
+        files_after_id: Optional[str] = None,
+        folder_fields: Optional[List[str]] = None,
+        file_fields: Optional[List[str]] = None
+    ) -> Optional[FolderContents]:
+        folder = None
+        owner_id = user_id
+        ancestor_ids = []
+        if folder_id:
+            folder = await self.get_folder(folder_id, user_id)
+            if not folder:
+                return None
+            owner_id = str(folder.owner_id)
+            ancestor_ids = folder.ancestors
+        # Someone the folder was shared with sees only what they could open on its own.
+        shared_with = user_id if owner_id != user_id else None
+        ancestors, folders, files, folder_count, (file_count, total_size) = await asyncio.gather(
+            self.folder_repository.list_by_ids([str(ancestor_id) for ancestor_id in ancestor_ids]),
+            self.folder_repository.list_by_owner(owner_id, folder_id, limit, folders_after_id, folder_fields, shared_with),
+            self.file_repository.list_by_owner(owner_id, folder_id, limit, files_after_id, file_fields, shared_with),
+            self.folder_repository.count_by_owner(owner_id, folder_id, shared_with),
+            self.file_repository.usage_by_owner(owner_id, folder_id, shared_with)
+        )
+        ancestors_by_id = {ancestor.id: ancestor for ancestor in ancestors if self._can_access(ancestor, user_id)}
+        ancestors = [ancestors_by_id[ancestor_id] for ancestor_id in ancestor_ids if ancestor_id in ancestors_by_id]
+        if shared_with:
+            folder, ancestors, folders, files = (
+                _without_sharing(folder),
+                [_without_sharing(ancestor) for ancestor in ancestors],
+                [_without_sharing(subfolder) for subfolder in folders],
+                [_without_sharing(file) for file in files]
+            )
+        return FolderContents(
+            folder=folder,
+            ancestors=ancestors,
+            folders=folders,
+            files=files,
+            folder_count=folder_count,
+            file_count=file_count,
+            total_size=total_size
+        )
+    
+    async def _child_ancestors(self, parent_folder_id: Optional[str], owner_id: str) -> List[ObjectId]:
+        if not parent_folder_id:
+            return []
+        parent_folder = await self.folder_repository.get_by_id(parent_folder_id)
+        if not parent_folder or str(parent_folder.owner_id) != owner_id:
+            raise ValueError("Parent folder not found")
+        return parent_folder.ancestors + [parent_folder.id]
+    
+    async def share_folder(self, folder_id: str, owner_id: str, shared_with_id: str) -> Optional[Folder]:
+        return await self.folder_repository.add_shared_user(folder_id, owner_id, shared_with_id)
 
 
 class UserUseCases:
-    def __init__(self, user_repository: UserRepository, secret_key: str):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        secret_key: str,
+        password_hasher: Optional[PasswordHasher] = None
+    ):
         self.user_repository = user_repository
         self.secret_key = secret_key
+        self.password_hasher = password_hasher or PasswordHasher()
     
     async def register_user(self, username: str, email: str, password: str) -> User:
         existing_user = await self.user_repository.get_by_email(email)
@@ -180,7 +572,7 @@ class UserUseCases:
         existing_username = await self.user_repository.get_by_username(username)
         if existing_username:
             raise ValueError("Username is already taken")
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = await self.password_hasher.hash(password)
         user = User(
             username=username,
             email=email,
@@ -192,8 +584,10 @@ class UserUseCases:
         user = await self.user_repository.get_by_email(email)
         if not user:
             return None
-        if not bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
+        if not await self.password_hasher.verify(password, user.password_hash):
             return None
+        if self.password_hasher.needs_rehash(user.password_hash):
+            await self._rehash_password(user, password)
         payload = {
             "sub": str(user.id),
             "username": user.username,
@@ -202,6 +596,15 @@ class UserUseCases:
         token = jwt.encode(payload, self.secret_key, algorithm="HS256")
         return token
     
+    async def _rehash_password(self, user: User, password: str) -> None:
+        # Upgrading to the configured cost must never fail the login itself.
+        try:
+            password_hash = await self.password_hasher.hash(password)
+        except PasswordHasherBusy:
+            return
+        await self.user_repository.update(str(user.id), {"password_hash": password_hash})
+        self.password_hasher.record_rehash()
+    
     async def get_user_from_token(self, token: str) -> Optional[User]:
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
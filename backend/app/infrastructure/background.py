@@ -0,0 +1,16 @@
+from typing import Any, Awaitable, Callable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(interval: float, job: Callable[[], Awaitable[Any]], name: str) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Background job %s failed", name)
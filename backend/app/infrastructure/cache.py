@@ -0,0 +1,197 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import CursorType
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 30.0
+CLEAR_ALL = "*"
+
+InvalidationListener = Callable[[str, str], None]
+
+
+class TTLCache(Generic[T]):
+    # The TTL bounds staleness when an invalidation from another worker is lost.
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T, generation: Optional[int] = None) -> None:
+        # A read that started before an invalidation must not repopulate the entry.
+        if generation is not None and generation != self._generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self._invalidations += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations
+        }
+
+
+class InvalidationChannel(ABC):
+    def __init__(self):
+        self._listeners: List[InvalidationListener] = []
+
+    def subscribe(self, listener: InvalidationListener) -> None:
+        self._listeners.append(listener)
+
+    @abstractmethod
+    async def publish(self, namespace: str, key: str) -> None:
+        pass
+
+    async def listen(self) -> None:
+        pass
+
+    def _notify(self, namespace: str, key: str) -> None:
+        for listener in self._listeners:
+            listener(namespace, key)
+
+
+class LocalInvalidationChannel(InvalidationChannel):
+    async def publish(self, namespace: str, key: str) -> None:
+        self._notify(namespace, key)
+
+
+class MongoInvalidationChannel(InvalidationChannel):
+    # Workers tail a capped collection; their own messages were already applied locally.
+    def __init__(self, collection: AsyncIOMotorCollection, size: int = 1024 * 1024, retry_interval: float = 1.0):
+        super().__init__()
+        self.collection = collection
+        self.size = size
+        self.retry_interval = retry_interval
+        self.origin = str(ObjectId())
+        self._published = 0
+        self._received = 0
+
+    async def publish(self, namespace: str, key: str) -> None:
+        self._notify(namespace, key)
+        try:
+            await self.collection.insert_one({"namespace": namespace, "key": key, "origin": self.origin})
+            self._published += 1
+        except Exception:
+            logger.exception("Failed to publish cache invalidation for %s/%s", namespace, key)
+
+    async def listen(self) -> None:
+        await self._ensure_capped()
+        last_id = ObjectId()
+        while True:
+            try:
+                cursor = self.collection.find({"_id": {"$gt": last_id}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for message in cursor:
+                        last_id = message["_id"]
+                        if message.get("origin") == self.origin:
+                            continue
+                        self._received += 1
+                        self._notify(message["namespace"], message["key"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation listener failed")
+            await asyncio.sleep(self.retry_interval)
+
+    def stats(self) -> dict:
+        return {"origin": self.origin, "published": self._published, "received": self._received}
+
+    async def _ensure_capped(self) -> None:
+        database = self.collection.database
+        if self.collection.name in await database.list_collection_names():
+            return
+        try:
+            await database.create_collection(self.collection.name, capped=True, size=self.size)
+        except Exception:
+            # Another worker created it first.
+            logger.debug("Capped collection %s already exists", self.collection.name)
+
+
+class CacheRegistry:
+    def __init__(self, channel: InvalidationChannel, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.channel = channel
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._caches: Dict[str, TTLCache[Any]] = {}
+        channel.subscribe(self._apply)
+
+    def cache(self, namespace: str, max_entries: Optional[int] = None, ttl: Optional[float] = None) -> TTLCache[Any]:
+        if namespace not in self._caches:
+            self._caches[namespace] = TTLCache(
+                self.max_entries if max_entries is None else max_entries,
+                self.ttl if ttl is None else ttl
+            )
+        return self._caches[namespace]
+
+    async def invalidate(self, namespace: str, key: str) -> None:
+        await self.channel.publish(namespace, key)
+
+    async def clear(self, namespace: str) -> None:
+        await self.channel.publish(namespace, CLEAR_ALL)
+
+    def stats(self) -> dict:
+        return {namespace: cache.stats() for namespace, cache in self._caches.items()}
+
+    def _apply(self, namespace: str, key: str) -> None:
+        cache = self._caches.get(namespace)
+        if cache is None:
+            return
+        if key == CLEAR_ALL:
+            cache.clear()
+        else:
+            cache.invalidate(key)
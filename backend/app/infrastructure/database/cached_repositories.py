@@ -0,0 +1,257 @@
+from datetime import timedelta
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from bson import ObjectId
+from domain.entities import File, Folder, User
+from domain.repositories import FileRepository, FolderRepository, UserRepository
+from infrastructure.cache import CacheRegistry
+
+FILES_NAMESPACE = "files"
+FOLDERS_NAMESPACE = "folders"
+USERS_NAMESPACE = "users"
+
+
+def _cache_key(entity_id: str) -> str:
+    # ObjectId accepts either hex case, so reads and invalidations agree only on the canonical form.
+    return str(ObjectId(entity_id))
+
+
+class CachedFileRepository(FileRepository):
+    # Cached entities are shared between requests and must be treated as read-only.
+    def __init__(self, repository: FileRepository, registry: CacheRegistry):
+        self.repository = repository
+        self.registry = registry
+        self.cache = registry.cache(FILES_NAMESPACE)
+
+    def __getattr__(self, name: str) -> Any:
+        # Repository specifics such as the collection and its INDEXES.
+        return getattr(self.repository, name)
+
+    async def create(self, file: File) -> File:
+        return await self.repository.create(file)
+
+    async def create_many(self, files: List[File]) -> List[Optional[File]]:
+        return await self.repository.create_many(files)
+
+    async def get_by_id(self, file_id: str) -> Optional[File]:
+        key = _cache_key(file_id)
+        file = self.cache.get(key)
+        if file is not None:
+            return file
+        generation = self.cache.generation
+        file = await self.repository.get_by_id(file_id)
+        if file is not None:
+            self.cache.set(key, file, generation)
+        return file
+
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        shared_with: Optional[str] = None
+    ) -> List[File]:
+        return await self.repository.list_by_owner(owner_id, folder_id, limit, after_id, fields, shared_with)
+
+    def iter_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[File]:
+        return self.repository.iter_by_owner(owner_id, folder_id, after_id, fields)
+
+    async def list_shared_with_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[File]:
+        return await self.repository.list_shared_with_user(user_id, limit, after_id, fields)
+
+    async def update(self, file_id: str, data: dict) -> Optional[File]:
+        file = await self.repository.update(file_id, data)
+        await self.registry.invalidate(FILES_NAMESPACE, _cache_key(file_id))
+        return file
+
+    async def add_shared_user(self, file_id: str, owner_id: str, user_id: str) -> Optional[File]:
+        file = await self.repository.add_shared_user(file_id, owner_id, user_id)
+        await self.registry.invalidate(FILES_NAMESPACE, _cache_key(file_id))
+        return file
+
+    async def list_by_ancestor(
+        self,
+        folder_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None
+    ) -> List[File]:
+        return await self.repository.list_by_ancestor(folder_id, limit, after_id)
+
+    async def trash(self, file_id: str, owner_id: str) -> bool:
+        trashed = await self.repository.trash(file_id, owner_id)
+        await self.registry.invalidate(FILES_NAMESPACE, _cache_key(file_id))
+        return trashed
+
+    async def trash_by_ancestor(self, folder_id: str) -> int:
+        trashed = await self.repository.trash_by_ancestor(folder_id)
+        await self.registry.clear(FILES_NAMESPACE)
+        return trashed
+
+    async def claim_trashed(self, limit: int, max_attempts: int, claim_timeout: timedelta) -> List[File]:
+        return await self.repository.claim_trashed(limit, max_attempts, claim_timeout)
+
+    async def count_trashed(self) -> int:
+        return await self.repository.count_trashed()
+
+    async def record_purge_failures(self, file_ids: List[str]) -> None:
+        await self.repository.record_purge_failures(file_ids)
+
+    async def delete_many(self, file_ids: List[str]) -> int:
+        # Only trashed files are deleted in bulk and those were invalidated when trashed.
+        return await self.repository.delete_many(file_ids)
+
+    def iter_by_filename(self, after: Optional[str] = None) -> AsyncIterator[File]:
+        return self.repository.iter_by_filename(after)
+
+    async def rebase_ancestors(self, folder_id: str, ancestors: List[ObjectId]) -> int:
+        rebased = await self.repository.rebase_ancestors(folder_id, ancestors)
+        await self.registry.clear(FILES_NAMESPACE)
+        return rebased
+
+    async def usage_by_ancestor(self, folder_id: str) -> Tuple[int, int]:
+        return await self.repository.usage_by_ancestor(folder_id)
+
+    async def usage_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        shared_with: Optional[str] = None
+    ) -> Tuple[int, int]:
+        return await self.repository.usage_by_owner(owner_id, folder_id, shared_with)
+
+    async def delete(self, file_id: str) -> bool:
+        deleted = await self.repository.delete(file_id)
+        await self.registry.invalidate(FILES_NAMESPACE, _cache_key(file_id))
+        return deleted
+
+
+class CachedFolderRepository(FolderRepository):
+    def __init__(self, repository: FolderRepository, registry: CacheRegistry):
+        self.repository = repository
+        self.registry = registry
+        self.cache = registry.cache(FOLDERS_NAMESPACE)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
+
+    async def create(self, folder: Folder) -> Folder:
+        return await self.repository.create(folder)
+
+    async def get_by_id(self, folder_id: str) -> Optional[Folder]:
+        key = _cache_key(folder_id)
+        folder = self.cache.get(key)
+        if folder is not None:
+            return folder
+        generation = self.cache.generation
+        folder = await self.repository.get_by_id(folder_id)
+        if folder is not None:
+            self.cache.set(key, folder, generation)
+        return folder
+
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        shared_with: Optional[str] = None
+    ) -> List[Folder]:
+        return await self.repository.list_by_owner(owner_id, parent_folder_id, limit, after_id, fields, shared_with)
+
+    def iter_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Folder]:
+        return self.repository.iter_by_owner(owner_id, parent_folder_id, after_id, fields)
+
+    async def list_by_ids(self, folder_ids: List[str]) -> List[Folder]:
+        return await self.repository.list_by_ids(folder_ids)
+
+    async def count_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        shared_with: Optional[str] = None
+    ) -> int:
+        return await self.repository.count_by_owner(owner_id, parent_folder_id, shared_with)
+
+    async def update(self, folder_id: str, data: dict) -> Optional[Folder]:
+        folder = await self.repository.update(folder_id, data)
+        await self.registry.invalidate(FOLDERS_NAMESPACE, _cache_key(folder_id))
+        return folder
+
+    async def add_shared_user(self, folder_id: str, owner_id: str, user_id: str) -> Optional[Folder]:
+        folder = await self.repository.add_shared_user(folder_id, owner_id, user_id)
+        await self.registry.invalidate(FOLDERS_NAMESPACE, _cache_key(folder_id))
+        return folder
+
+    async def list_by_ancestor(self, folder_id: str) -> List[Folder]:
+        return await self.repository.list_by_ancestor(folder_id)
+
+    async def delete_subtree(self, folder_id: str) -> int:
+        deleted = await self.repository.delete_subtree(folder_id)
+        await self.registry.clear(FOLDERS_NAMESPACE)
+        return deleted
+
+    async def move(self, folder_id: str, parent_folder_id: Optional[str], ancestors: List[ObjectId]) -> Optional[Folder]:
+        folder = await self.repository.move(folder_id, parent_folder_id, ancestors)
+        await self.registry.clear(FOLDERS_NAMESPACE)
+        return folder
+
+    async def delete(self, folder_id: str) -> bool:
+        deleted = await self.repository.delete(folder_id)
+        await self.registry.invalidate(FOLDERS_NAMESPACE, _cache_key(folder_id))
+        return deleted
+
+
+class CachedUserRepository(UserRepository):
+    # Lookups by email or username stay uncached: login and registration need current state.
+    def __init__(self, repository: UserRepository, registry: CacheRegistry, ttl: Optional[float] = None):
+        self.repository = repository
+        self.registry = registry
+        self.cache = registry.cache(USERS_NAMESPACE, ttl=ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
+
+    async def create(self, user: User) -> User:
+        return await self.repository.create(user)
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        key = _cache_key(user_id)
+        user = self.cache.get(key)
+        if user is not None:
+            return user
+        generation = self.cache.generation
+        user = await self.repository.get_by_id(user_id)
+        if user is not None:
+            self.cache.set(key, user, generation)
+        return user
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.repository.get_by_email(email)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await self.repository.get_by_username(username)
+
+    async def update(self, user_id: str, data: dict) -> Optional[User]:
+        user = await self.repository.update(user_id, data)
+        await self.registry.invalidate(USERS_NAMESPACE, _cache_key(user_id))
+        return user
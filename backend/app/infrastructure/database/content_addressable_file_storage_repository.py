@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from domain.entities import StoredBlob
+from infrastructure.database.local_file_storage_repository import LocalFileStorageRepository, DEFAULT_CHUNK_SIZE
+from infrastructure.io_executor import BoundedIOExecutor
+import asyncio
+
+DELETE_CLAIM_TIMEOUT = timedelta(seconds=60)
+DELETE_RETRY_INTERVAL = 0.05
+
+class ContentAddressableFileStorageRepository(LocalFileStorageRepository):
+    # Legacy blob documents with a refcount are never deleted here; the reconciler handles them.
+    def __init__(
+        self,
+        storage_path: str,
+        blob_collection: AsyncIOMotorCollection,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        fanout_levels: int = 0,
+        io_executor: Optional[BoundedIOExecutor] = None
+    ):
+        super().__init__(storage_path, chunk_size, fanout_levels, io_executor)
+        self.blob_collection = blob_collection
+
+    async def save_stream(self, chunks: AsyncIterator[bytes], filename: str, reference: Optional[str] = None) -> StoredBlob:
+        temp_path = self._temp_path()
+        size, digest = await self._write_chunks(chunks, temp_path)
+        return await self._commit_blob(temp_path, size, digest, reference or filename)
+
+    async def delete(self, filename: str, reference: Optional[str] = None) -> bool:
+        blob = await self.blob_collection.find_one_and_update(
+            {"_id": filename},
+            {"$pull": {"refs": reference or filename}},
+            return_document=ReturnDocument.AFTER
+        )
+        if blob is not None and (blob.get("refs") or blob.get("refcount", 0) > 0):
+            return True
+
+        claim = ObjectId()
+        if blob is None:
+            # A blob stored before deduplication, or one whose last reference was already dropped
+            # by an earlier attempt. Inserting the claim keeps a concurrent save out all the same.
+            try:
+                await self.blob_collection.insert_one(
+                    {"_id": filename, "refs": [], "deleting": claim, "deleting_at": datetime.utcnow()}
+                )
+            except DuplicateKeyError:
+                return True
+        else:
+            result = await self.blob_collection.update_one(
+                {"_id": filename, "refs": {"$size": 0}, "refcount": {"$not": {"$gt": 0}}, **self._unclaimed()},
+                {"$set": {"deleting": claim, "deleting_at": datetime.utcnow()}}
+            )
+            if not result.modified_count:
+                return True
+
+        try:
+            deleted = await super().delete(filename)
+        finally:
+            await self.blob_collection.delete_one({"_id": filename, "deleting": claim})
+        return deleted if blob is None else True
+
+    async def remove_orphan(self, filename: str) -> bool:
+        await self.blob_collection.delete_one({"_id": filename})
+        return await super().remove_orphan(filename)
+    
+    async def _commit_blob(self, temp_path: str, size: int, digest: str, reference: str) -> StoredBlob:
+        while True:
+            try:
+                await self.blob_collection.update_one(
+                    {"_id": digest, **self._unclaimed()},
+                    {
+                        "$addToSet": {"refs": reference},
+                        "$unset": {"deleting": "", "deleting_at": ""},
+                        "$setOnInsert": {"size": size, "created_at": datetime.utcnow()}
+                    },
+                    upsert=True
+                )
+                break
+            except DuplicateKeyError:
+                # The last reference is being deleted; the document goes away once the file is unlinked.
+                await asyncio.sleep(DELETE_RETRY_INTERVAL)
+
+        # Same content, so replacing a copy that is already in place is harmless.
+        await self.io_executor.run(self._commit, temp_path, self._path(digest))
+        return StoredBlob(filename=digest, size=size, checksum=digest)
+
+    def _unclaimed(self) -> dict:
+        # A claim older than DELETE_CLAIM_TIMEOUT belongs to a delete that died midway.
+        return {"$or": [
+            {"deleting_at": {"$exists": False}},
+            {"deleting_at": {"$lt": datetime.utcnow() - DELETE_CLAIM_TIMEOUT}}
+        ]}
@@ -0,0 +1,152 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+IndexedQuery = Tuple[str, dict]
+
+
+class IndexBootstrap:
+    def __init__(self, progress_interval: float = DEFAULT_PROGRESS_INTERVAL):
+        self.progress_interval = progress_interval
+        self._collections: Dict[str, dict] = {}
+
+    async def run(self, repositories: Iterable[Any]) -> None:
+        for repository in repositories:
+            collection = repository.collection
+            state = self._collections.setdefault(collection.name, {
+                "status": "pending",
+                "created": [],
+                "rebuilt": [],
+                "progress": None,
+                "collection_scans": [],
+                "error": None
+            })
+            try:
+                await self._ensure_indexes(collection, repository.INDEXES, state)
+                state["collection_scans"] = await find_collection_scans(
+                    collection, repository.INDEXED_QUERIES
+                )
+                state["status"] = "ready"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state["status"] = "failed"
+                state["error"] = str(e)
+                logger.exception("Index bootstrap failed for %s", collection.name)
+                continue
+
+            for query_name in state["collection_scans"]:
+                logger.warning(
+                    "%s.%s runs as a collection scan; add an index for it",
+                    collection.name, query_name
+                )
+
+    def stats(self) -> dict:
+        return {name: dict(state) for name, state in self._collections.items()}
+
+    async def _ensure_indexes(
+        self,
+        collection: AsyncIOMotorCollection,
+        indexes: Sequence[IndexModel],
+        state: dict
+    ) -> None:
+        existing = await collection.index_information()
+        to_create = []
+        for index in indexes:
+            document = index.document
+            current_name = document["name"] if document["name"] in existing else _name_by_key(existing, document)
+            if current_name is not None:
+                if _index_matches(existing[current_name], document):
+                    continue
+                await collection.drop_index(current_name)
+                state["rebuilt"].append(document["name"])
+            to_create.append(index)
+
+        if not to_create:
+            return
+
+        state["status"] = "building"
+        logger.info(
+            "Building indexes on %s: %s",
+            collection.name, ", ".join(index.document["name"] for index in to_create)
+        )
+        reporter = asyncio.create_task(self._report_progress(collection, state))
+        try:
+            await collection.create_indexes(to_create)
+        finally:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+        state["created"].extend(index.document["name"] for index in to_create)
+        state["progress"] = None
+
+    async def _report_progress(self, collection: AsyncIOMotorCollection, state: dict) -> None:
+        namespace = f"{collection.database.name}.{collection.name}"
+        pipeline = [
+            {"$currentOp": {"allUsers": True}},
+            {"$match": {"ns": namespace, "command.createIndexes": {"$exists": True}}}
+        ]
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            try:
+                operations = await collection.database.client.admin.aggregate(pipeline).to_list(None)
+            except OperationFailure as e:
+                logger.info("Index build progress for %s is unavailable: %s", namespace, e)
+                return
+            for operation in operations:
+                progress = operation.get("progress")
+                if not progress:
+                    continue
+                state["progress"] = {"done": progress.get("done"), "total": progress.get("total")}
+                logger.info(
+                    "Building indexes on %s: %s/%s %s",
+                    namespace, progress.get("done"), progress.get("total"), operation.get("msg", "")
+                )
+
+
+async def find_collection_scans(collection: AsyncIOMotorCollection, queries: Sequence[IndexedQuery]) -> List[str]:
+    collection_scans = []
+    for query_name, query in queries:
+        plan = await collection.find(query).explain()
+        if "COLLSCAN" in _plan_stages(plan.get("queryPlanner", {}).get("winningPlan", {})):
+            collection_scans.append(query_name)
+    return collection_scans
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+def _index_key(key: Any) -> List[Tuple[str, Any]]:
+    items = key.items() if hasattr(key, "items") else key
+    return [(field, direction) for field, direction in items]
+
+
+def _name_by_key(existing: dict, document: dict) -> Optional[str]:
+    key = _index_key(document["key"])
+    for name, info in existing.items():
+        if _index_key(info["key"]) == key:
+            return name
+    return None
+
+
+def _index_matches(current: dict, document: dict) -> bool:
+    if _index_key(current["key"]) != _index_key(document["key"]):
+        return False
+    return all(current.get(option) == document.get(option) for option in INDEX_OPTIONS)
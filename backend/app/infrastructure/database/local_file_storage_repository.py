@@ -1,35 +1,297 @@
+from domain.entities import StoredBlob
 from domain.repositories import FileStorageRepository
-from typing import BinaryIO, Optional
+from infrastructure.io_executor import BoundedIOExecutor
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
 from fastapi import UploadFile
+import hashlib
 import os
 import shutil
-import aiofiles
+import uuid
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+SHARD_WIDTH = 2
+HEX_DIGITS = frozenset("0123456789abcdef")
+UPLOADS_DIRNAME = ".uploads"
+TMP_DIRNAME = ".tmp"
+QUARANTINE_DIRNAME = ".quarantine"
 
 class LocalFileStorageRepository(FileStorageRepository):
-    def __init__(self, storage_path: str):
+    def __init__(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        fanout_levels: int = 0,
+        io_executor: Optional[BoundedIOExecutor] = None
+    ):
         self.storage_path = storage_path
+        self.chunk_size = chunk_size
+        self.fanout_levels = fanout_levels
+        self.io_executor = io_executor or BoundedIOExecutor()
         os.makedirs(storage_path, exist_ok=True)
+        self._root = os.path.realpath(storage_path)
+
+    async def save(self, file: UploadFile, filename: str, reference: Optional[str] = None) -> StoredBlob:
+        await file.seek(0)
+        return await self.save_stream(self._iter_upload(file), filename, reference)
+
+    async def save_stream(self, chunks: AsyncIterator[bytes], filename: str, reference: Optional[str] = None) -> StoredBlob:
+        file_path = self._path(filename)
+        temp_path = self._temp_path()
+        size, checksum = await self._write_chunks(chunks, temp_path)
+        await self.io_executor.run(self._commit, temp_path, file_path)
+        return StoredBlob(filename=filename, size=size, checksum=checksum)
+
+    async def get(self, filename: str) -> Optional[BinaryIO]:
+        return await self.io_executor.run(self._open, filename)
+
+    async def delete(self, filename: str, reference: Optional[str] = None) -> bool:
+        return await self.io_executor.run(self._remove, filename)
+
+    async def open_range(
+        self,
+        filename: str,
+        start: int = 0,
+        length: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        in_file = await self.io_executor.run(self._open, filename)
+        if not in_file:
+            return None
+        return self._iter_range(in_file, start, length)
+
+    async def get_path(self, filename: str) -> Optional[str]:
+        return await self.io_executor.run(self._resolve_path, filename)
+
+    async def save_part(self, upload_id: str, index: int, chunks: AsyncIterator[bytes]) -> int:
+        part_path = self._part_path(upload_id, index)
+        temp_path = f"{part_path}.{uuid.uuid4().hex}.tmp"
+        size, _ = await self._write_chunks(chunks, temp_path)
+        await self.io_executor.run(os.replace, temp_path, part_path)
+        return size
+
+    async def iter_parts(self, upload_id: str, count: int) -> AsyncIterator[bytes]:
+        for index in range(count):
+            in_file = await self.io_executor.run(open, self._part_path(upload_id, index), 'rb')
+            async for chunk in self._iter_range(in_file, 0, None):
+                yield chunk
+
+    async def delete_parts(self, upload_id: str) -> None:
+        await self.io_executor.run(
+            shutil.rmtree, os.path.join(self.storage_path, UPLOADS_DIRNAME, upload_id), True
+        )
+
+    async def iter_blob_names(self, after: Optional[str] = None) -> AsyncIterator[str]:
+        flat_names = self._iter_names(await self.io_executor.run(self._list_flat_names, after))
+        if not self.fanout_levels:
+            async for name in flat_names:
+                yield name
+            return
+        sharded_names = self._iter_sharded_names(self.storage_path, "", after)
+        async for name in _merge_sorted(flat_names, sharded_names):
+            yield name
     
-    async def save(self, file: UploadFile, filename: str) -> str:
-        file_path = os.path.join(self.storage_path, filename)
-        async with aiofiles.open(file_path, 'wb') as out_file:
-            await file.seek(0)
-            content = await file.read()
-            await out_file.write(content)
-        
-        return filename
+    async def get_modified_at(self, filename: str) -> Optional[datetime]:
+        return await self.io_executor.run(self._modified_at, filename)
     
-    async def get(self, filename: str) -> Optional[BinaryIO]:
-        file_path = os.path.join(self.storage_path, filename)
-        if not os.path.exists(file_path):
+    async def quarantine(self, filename: str) -> bool:
+        return await self.io_executor.run(self._quarantine, filename)
+    
+    async def remove_orphan(self, filename: str) -> bool:
+        return await self.io_executor.run(self._remove, filename)
+    
+    async def migrate_layout(self) -> int:
+        return await self.io_executor.run(self._migrate_layout)
+
+    def _migrate_layout(self) -> int:
+        moved = 0
+        with os.scandir(self.storage_path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                sharded_path = self._path(entry.name)
+                if sharded_path == entry.path:
+                    continue
+                os.makedirs(os.path.dirname(sharded_path), exist_ok=True)
+                os.replace(entry.path, sharded_path)
+                moved += 1
+        return moved
+
+    async def _iter_names(self, names: List[str]) -> AsyncIterator[str]:
+        for name in names:
+            yield name
+    
+    async def _iter_sharded_names(self, directory: str, prefix: str, after: Optional[str]) -> AsyncIterator[str]:
+        leaf = len(prefix) == self.fanout_levels * SHARD_WIDTH
+        names = await self.io_executor.run(self._list_shard_entries, directory, leaf)
+        for name in names:
+            if leaf:
+                if after is None or name > after:
+                    yield name
+                continue
+            shard_prefix = prefix + name
+            if after is not None and shard_prefix < after[:len(shard_prefix)]:
+                continue
+            async for blob_name in self._iter_sharded_names(os.path.join(directory, name), shard_prefix, after):
+                yield blob_name
+    
+    def _list_flat_names(self, after: Optional[str]) -> List[str]:
+        with os.scandir(self.storage_path) as entries:
+            names = [
+                entry.name for entry in entries
+                if entry.is_file() and (after is None or entry.name > after)
+            ]
+        return sorted(names)
+    
+    def _list_shard_entries(self, directory: str, leaf: bool) -> List[str]:
+        try:
+            with os.scandir(directory) as entries:
+                if leaf:
+                    names = [entry.name for entry in entries if entry.is_file()]
+                else:
+                    names = [
+                        entry.name for entry in entries
+                        if entry.is_dir() and len(entry.name) == SHARD_WIDTH and HEX_DIGITS.issuperset(entry.name)
+                    ]
+        except FileNotFoundError:
+            return []
+        return sorted(names)
+    
+    def _modified_at(self, filename: str) -> Optional[datetime]:
+        file_path = self._resolve_path(filename)
+        if not file_path:
             return None
-        
-        return open(file_path, 'rb')
+        return datetime.utcfromtimestamp(os.path.getmtime(file_path))
     
-    async def delete(self, filename: str) -> bool:
-        file_path = os.path.join(self.storage_path, filename)
-        if not os.path.exists(file_path):
+    def _quarantine(self, filename: str) -> bool:
+        file_path = self._resolve_path(filename)
+        if not file_path:
+            return False
+        self._commit(file_path, os.path.join(self.storage_path, QUARANTINE_DIRNAME, filename))
+        return True
+    
+    def _shard_dir(self, filename: str) -> str:
+        prefix_length = self.fanout_levels * SHARD_WIDTH
+        prefix = filename[:prefix_length]
+        if not prefix or len(prefix) < prefix_length or not HEX_DIGITS.issuperset(prefix):
+            return ""
+        return os.path.join(*(prefix[i:i + SHARD_WIDTH] for i in range(0, prefix_length, SHARD_WIDTH)))
+
+    def _path(self, filename: str) -> str:
+        if (
+            not filename
+            or filename in (os.curdir, os.pardir)
+            or "\0" in filename
+            or "/" in filename
+            or os.sep in filename
+            or (os.altsep and os.altsep in filename)
+        ):
+            raise ValueError(f"Invalid blob name: {filename!r}")
+        file_path = os.path.join(self.storage_path, self._shard_dir(filename), filename)
+        if not os.path.realpath(file_path).startswith(self._root + os.sep):
+            raise ValueError(f"Invalid blob name: {filename!r}")
+        return file_path
+
+    def _temp_path(self) -> str:
+        return os.path.join(self.storage_path, TMP_DIRNAME, uuid.uuid4().hex)
+
+    def _commit(self, temp_path: str, file_path: str) -> None:
+        # file_path comes from _path() or the quarantine directory, so its parent is a shard directory.
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.replace(temp_path, file_path)
+
+    def _part_path(self, upload_id: str, index: int) -> str:
+        return os.path.join(self.storage_path, UPLOADS_DIRNAME, upload_id, f"{index:08d}")
+
+    def _resolve_path(self, filename: str) -> Optional[str]:
+        file_path = self._path(filename)
+        flat_path = os.path.join(self.storage_path, filename)
+        # A concurrent migrate_layout() may move the file between the two checks.
+        for candidate in (file_path, flat_path, file_path):
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def _open(self, filename: str) -> Optional[BinaryIO]:
+        file_path = self._resolve_path(filename)
+        if not file_path:
+            return None
+        return open(file_path, 'rb')
+
+    def _remove(self, filename: str) -> bool:
+        file_path = self._resolve_path(filename)
+        if not file_path:
             return False
-        
         os.remove(file_path)
         return True
+
+    async def _iter_upload(self, file: UploadFile) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await file.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    async def _iter_range(self, in_file: BinaryIO, start: int, length: Optional[int]) -> AsyncIterator[bytes]:
+        fd = in_file.fileno()
+        position = start
+        remaining = length
+        try:
+            while remaining is None or remaining > 0:
+                read_size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await self.io_executor.run(os.pread, fd, read_size, position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await self.io_executor.run(in_file.close)
+
+    async def _write_chunks(self, chunks: AsyncIterator[bytes], file_path: str) -> Tuple[int, str]:
+        out_file = await self.io_executor.run(self._create, file_path)
+        checksum = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                await self.io_executor.run(self._write_chunk, out_file, checksum, chunk)
+            await self.io_executor.run(out_file.close)
+        except BaseException:
+            await self.io_executor.run(self._discard, out_file, file_path)
+            raise
+
+        return size, checksum.hexdigest()
+
+    def _create(self, file_path: str) -> BinaryIO:
+        # Only temp and upload part paths are created directly; both are built from generated ids.
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        return open(file_path, 'wb')
+
+    def _write_chunk(self, out_file: BinaryIO, checksum, chunk: bytes) -> None:
+        checksum.update(chunk)
+        out_file.write(chunk)
+
+    def _discard(self, out_file: BinaryIO, file_path: str) -> None:
+        out_file.close()
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+async def _merge_sorted(first: AsyncIterator[str], second: AsyncIterator[str]) -> AsyncIterator[str]:
+    first_name = await _next(first)
+    second_name = await _next(second)
+    while first_name is not None or second_name is not None:
+        if second_name is None or (first_name is not None and first_name <= second_name):
+            yield first_name
+            first_name = await _next(first)
+        else:
+            yield second_name
+            second_name = await _next(second)
+
+
+async def _next(names: AsyncIterator[str]) -> Optional[str]:
+    try:
+        return await names.__anext__()
+    except StopAsyncIteration:
+        return None
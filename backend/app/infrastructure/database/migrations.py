@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateMany, UpdateOne
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+async def backfill_ancestors(database: AsyncIOMotorDatabase) -> Tuple[int, int]:
+    parents: Dict[ObjectId, Optional[ObjectId]] = {}
+    async for folder_dict in database["folders"].find({}, {"parent_folder_id": 1}):
+        parents[folder_dict["_id"]] = folder_dict.get("parent_folder_id")
+
+    ancestors_by_folder: Dict[ObjectId, List[ObjectId]] = {}
+    for folder_id in parents:
+        _resolve_ancestors(folder_id, parents, ancestors_by_folder)
+
+    folder_updates = [
+        UpdateOne({"_id": folder_id}, {"$set": {"ancestors": ancestors}})
+        for folder_id, ancestors in ancestors_by_folder.items()
+    ]
+    folders_updated = 0
+    for start in range(0, len(folder_updates), BACKFILL_BATCH_SIZE):
+        result = await database["folders"].bulk_write(
+            folder_updates[start:start + BACKFILL_BATCH_SIZE], ordered=False
+        )
+        folders_updated += result.modified_count
+
+    file_updates = [
+        UpdateMany(
+            {"parent_folder_id": folder_id},
+            {"$set": {"ancestors": ancestors + [folder_id]}}
+        )
+        for folder_id, ancestors in ancestors_by_folder.items()
+    ]
+    file_updates.append(UpdateMany({"parent_folder_id": None}, {"$set": {"ancestors": []}}))
+    files_updated = 0
+    for start in range(0, len(file_updates), BACKFILL_BATCH_SIZE):
+        result = await database["files"].bulk_write(
+            file_updates[start:start + BACKFILL_BATCH_SIZE], ordered=False
+        )
+        files_updated += result.modified_count
+
+    return folders_updated, files_updated
+
+
+def _resolve_ancestors(
+    folder_id: ObjectId,
+    parents: Dict[ObjectId, Optional[ObjectId]],
+    ancestors_by_folder: Dict[ObjectId, List[ObjectId]]
+) -> None:
+    chain = []
+    visited = set()
+    current = folder_id
+    while current in parents and current not in ancestors_by_folder and current not in visited:
+        chain.append(current)
+        visited.add(current)
+        current = parents[current]
+
+    # Roots, dangling parents and cycles all start a fresh path.
+    ancestors = ancestors_by_folder[current] + [current] if current in ancestors_by_folder else []
+    for chain_folder in reversed(chain):
+        ancestors_by_folder[chain_folder] = ancestors
+        ancestors = ancestors + [chain_folder]
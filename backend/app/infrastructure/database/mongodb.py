@@ -1,19 +1,101 @@
-from typing import Optional, List
-from datetime import datetime
+from typing import AsyncIterator, Optional, List, Tuple, Type, TypeVar
+from datetime import datetime, timedelta
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorCollection
-from domain.entities import File, Folder, User
-from domain.repositories import FolderRepository, FileRepository, UserRepository, FileStorageRepository
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorCursor
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError
+from domain.entities import File, Folder, User, UploadSession
+from domain.repositories import FolderRepository, FileRepository, UserRepository, UploadSessionRepository
+
+T = TypeVar("T")
+
+# Documents per getMore while streaming, which bounds what a cursor holds in memory.
+STREAM_BATCH_SIZE = 500
+
+
+def _find_page(
+    collection: AsyncIOMotorCollection,
+    query: dict,
+    limit: Optional[int],
+    after_id: Optional[str],
+    fields: Optional[List[str]] = None
+) -> AsyncIOMotorCursor:
+    if after_id:
+        query["_id"] = {"$gt": ObjectId(after_id)}
+    cursor = collection.find(query, _projection(fields)).sort("_id", ASCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor
+
+
+def _projection(fields: Optional[List[str]]) -> Optional[dict]:
+    if not fields:
+        return None
+    projection = {field: 1 for field in fields if field != "id"}
+    projection["_id"] = 1
+    return projection
+
+
+def _hydrate(model: Type[T], document: dict, fields: Optional[List[str]]) -> T:
+    # A projected document would fail validation on the missing required fields.
+    if fields:
+        return model.model_construct(**document)
+    return model.from_mongo(document)
+
+
+def _shared_query(shared_with: Optional[str], include_public: bool = False) -> dict:
+    # Narrows an owner's listing to the entries another user can open on their own.
+    if not shared_with:
+        return {}
+    if include_public:
+        return {"$or": [{"shared_with": ObjectId(shared_with)}, {"is_public": True}]}
+    return {"shared_with": ObjectId(shared_with)}
+
+
+def _insert_dict(file: File) -> dict:
+    # Uploads pick the id up front so storage can record the reference before the insert.
+    file_dict = file.dict(by_alias=True, exclude={"id"})
+    if file.id is not None:
+        file_dict["_id"] = file.id
+    return file_dict
+
+
+async def _rebase_ancestors(collection: AsyncIOMotorCollection, folder_oid: ObjectId, ancestors: List[ObjectId]) -> int:
+    result = await collection.update_many(
+        {"ancestors": folder_oid},
+        [{"$set": {
+            "ancestors": {"$concatArrays": [
+                ancestors,
+                {"$slice": [
+                    "$ancestors",
+                    {"$indexOfArray": ["$ancestors", folder_oid]},
+                    {"$size": "$ancestors"}
+                ]}
+            ]},
+            "updated_at": datetime.utcnow()
+        }}]
+    )
+    return result.modified_count
+
 
 class MongoDBUserRepository(UserRepository):
+    INDEXES = [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True)
+    ]
+    INDEXED_QUERIES = [
+        ("get_by_email", {"email": ""}),
+        ("get_by_username", {"username": ""})
+    ]
+    
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
     
     async def create(self, user: User) -> User:
         user_dict = user.mongo_dict()
         result = await self.collection.insert_one(user_dict)
-        created_user = await self.collection.find_one({"_id": result.inserted_id})
-        return User.from_mongo(created_user)
+        user_dict["_id"] = result.inserted_id
+        return User.from_mongo(user_dict)
     
     async def get_by_id(self, user_id: str) -> Optional[User]:
         user_dict = await self.collection.find_one({"_id": ObjectId(user_id)})
@@ -28,15 +110,24 @@ class MongoDBUserRepository(UserRepository):
         return User.from_mongo(user_dict)
     
     async def update(self, user_id: str, data: dict) -> Optional[User]:
-        result = await self.collection.update_one(
+        user_dict = await self.collection.find_one_and_update(
             {"_id": ObjectId(user_id)},
-            {"$set": data}
+            {"$set": data},
+            return_document=ReturnDocument.AFTER
         )
-        if result.modified_count:
-            return await self.get_by_id(user_id)
-        return None
+        return User.from_mongo(user_dict)
 
 class MongoDBFolderRepository(FolderRepository):
+    INDEXES = [
+        IndexModel([("owner_id", ASCENDING), ("parent_folder_id", ASCENDING), ("_id", ASCENDING)], name="owner_parent"),
+        IndexModel([("shared_with", ASCENDING), ("_id", ASCENDING)], name="shared_with"),
+        IndexModel([("ancestors", ASCENDING), ("_id", ASCENDING)], name="ancestors")
+    ]
+    INDEXED_QUERIES = [
+        ("list_by_owner", {"owner_id": ObjectId(), "parent_folder_id": None}),
+        ("list_by_ancestor", {"ancestors": ObjectId()})
+    ]
+    
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
     
@@ -49,87 +140,422 @@ class MongoDBFolderRepository(FolderRepository):
     async def get_by_id(self, folder_id: str) -> Optional[Folder]:
         folder_dict = await self.collection.find_one({"_id": ObjectId(folder_id)})
         if folder_dict:
-            return Folder(**folder_dict)
+            return Folder.from_mongo(folder_dict)
         return None
     
-    async def list_by_owner(self, owner_id: str, parent_folder_id: Optional[str] = None) -> List[Folder]:
-        query = {"owner_id": ObjectId(owner_id)}
-        if parent_folder_id:
-            query["parent_folder_id"] = ObjectId(parent_folder_id)
-        else:
-            query["parent_folder_id"] = None
-        
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        shared_with: Optional[str] = None
+    ) -> List[Folder]:
+        query = {
+            "owner_id": ObjectId(owner_id),
+            "parent_folder_id": ObjectId(parent_folder_id) if parent_folder_id else None,
+            **_shared_query(shared_with)
+        }
+        folders = []
+        async for folder_dict in _find_page(self.collection, query, limit, after_id, fields):
+            folders.append(_hydrate(Folder, folder_dict, fields))
+        return folders
+    
+    async def iter_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Folder]:
+        query = {
+            "owner_id": ObjectId(owner_id),
+            "parent_folder_id": ObjectId(parent_folder_id) if parent_folder_id else None
+        }
+        cursor = _find_page(self.collection, query, None, after_id, fields)
+        async for folder_dict in cursor.batch_size(STREAM_BATCH_SIZE):
+            yield _hydrate(Folder, folder_dict, fields)
+    
+    async def list_by_ids(self, folder_ids: List[str]) -> List[Folder]:
+        if not folder_ids:
+            return []
         folders = []
+        query = {"_id": {"$in": [ObjectId(folder_id) for folder_id in folder_ids]}}
         async for folder_dict in self.collection.find(query):
-            folders.append(Folder(**folder_dict))
+            folders.append(Folder.from_mongo(folder_dict))
         return folders
     
+    async def count_by_owner(
+        self,
+        owner_id: str,
+        parent_folder_id: Optional[str] = None,
+        shared_with: Optional[str] = None
+    ) -> int:
+        return await self.collection.count_documents({
+            "owner_id": ObjectId(owner_id),
+            "parent_folder_id": ObjectId(parent_folder_id) if parent_folder_id else None,
+            **_shared_query(shared_with)
+        })
+    
     async def update(self, folder_id: str, data: dict) -> Optional[Folder]:
         data["updated_at"] = datetime.utcnow()
-        result = await self.collection.update_one(
+        folder_dict = await self.collection.find_one_and_update(
             {"_id": ObjectId(folder_id)},
-            {"$set": data}
+            {"$set": data},
+            return_document=ReturnDocument.AFTER
+        )
+        if folder_dict:
+            return Folder.from_mongo(folder_dict)
+        return None
+    
+    async def add_shared_user(self, folder_id: str, owner_id: str, user_id: str) -> Optional[Folder]:
+        folder_dict = await self.collection.find_one_and_update(
+            {"_id": ObjectId(folder_id), "owner_id": ObjectId(owner_id)},
+            {
+                "$addToSet": {"shared_with": ObjectId(user_id)},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            return_document=ReturnDocument.AFTER
         )
-        if result.modified_count:
-            return await self.get_by_id(folder_id)
+        if folder_dict:
+            return Folder.from_mongo(folder_dict)
         return None
     
+    async def list_by_ancestor(self, folder_id: str) -> List[Folder]:
+        folders = []
+        async for folder_dict in self.collection.find({"ancestors": ObjectId(folder_id)}):
+            folders.append(Folder.from_mongo(folder_dict))
+        return folders
+    
+    async def delete_subtree(self, folder_id: str) -> int:
+        folder_oid = ObjectId(folder_id)
+        result = await self.collection.delete_many(
+            {"$or": [{"_id": folder_oid}, {"ancestors": folder_oid}]}
+        )
+        return result.deleted_count
+    
+    async def move(self, folder_id: str, parent_folder_id: Optional[str], ancestors: List[ObjectId]) -> Optional[Folder]:
+        folder_oid = ObjectId(folder_id)
+        folder_dict = await self.collection.find_one_and_update(
+            {"_id": folder_oid},
+            {"$set": {
+                "parent_folder_id": ObjectId(parent_folder_id) if parent_folder_id else None,
+                "ancestors": ancestors,
+                "updated_at": datetime.utcnow()
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+        if not folder_dict:
+            return None
+        await _rebase_ancestors(self.collection, folder_oid, ancestors)
+        return Folder.from_mongo(folder_dict)
+    
     async def delete(self, folder_id: str) -> bool:
         result = await self.collection.delete_one({"_id": ObjectId(folder_id)})
         return result.deleted_count > 0
 
 class MongoDBFileRepository(FileRepository):
+    INDEXES = [
+        IndexModel([("owner_id", ASCENDING), ("parent_folder_id", ASCENDING), ("_id", ASCENDING)], name="owner_parent"),
+        IndexModel([("shared_with", ASCENDING), ("_id", ASCENDING)], name="shared_with"),
+        IndexModel(
+            [("public_link", ASCENDING), ("is_public", ASCENDING)],
+            name="public_link_unique",
+            unique=True,
+            partialFilterExpression={"public_link": {"$type": "string"}}
+        ),
+        IndexModel([("filename", ASCENDING)], name="filename"),
+        IndexModel([("ancestors", ASCENDING), ("_id", ASCENDING)], name="ancestors"),
+        IndexModel(
+            [("trashed_at", ASCENDING)],
+            name="trashed_at",
+            partialFilterExpression={"trashed_at": {"$type": "date"}}
+        )
+    ]
+    INDEXED_QUERIES = [
+        ("list_by_owner", {"owner_id": ObjectId(), "parent_folder_id": None, "trashed_at": None}),
+        ("list_shared_with_user", {"shared_with": ObjectId(), "trashed_at": None}),
+        ("list_public_by_link", {"public_link": "", "is_public": True, "trashed_at": None}),
+        ("list_by_ancestor", {"ancestors": ObjectId(), "trashed_at": None}),
+        ("claim_trashed", {
+            "trashed_at": {"$type": "date"},
+            "purge_attempts": {"$lt": 1},
+            "$or": [{"purge_claimed_at": None}, {"purge_claimed_at": {"$lt": datetime.utcnow()}}]
+        }),
+        ("iter_by_filename", {"filename": {"$gt": ""}})
+    ]
+    
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
     
     async def create(self, file: File) -> File:
-        file_dict = file.dict(by_alias=True, exclude={"id"})
+        file_dict = _insert_dict(file)
         result = await self.collection.insert_one(file_dict)
         file_dict["_id"] = result.inserted_id
         return File(**file_dict)
     
+    async def create_many(self, files: List[File]) -> List[Optional[File]]:
+        if not files:
+            return []
+        file_dicts = [_insert_dict(file) for file in files]
+        failed_indexes = set()
+        try:
+            await self.collection.insert_many(file_dicts, ordered=False)
+        except BulkWriteError as e:
+            failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+        return [
+            None if index in failed_indexes else File(**file_dict)
+            for index, file_dict in enumerate(file_dicts)
+        ]
+    
     async def get_by_id(self, file_id: str) -> Optional[File]:
-        file_dict = await self.collection.find_one({"_id": ObjectId(file_id)})
+        file_dict = await self.collection.find_one({"_id": ObjectId(file_id), "trashed_at": None})
         if file_dict:
-            return File(**file_dict)
+            return File.from_mongo(file_dict)
         return None
     
-    async def list_by_owner(self, owner_id: str, folder_id: Optional[str] = None) -> List[File]:
-        query = {"owner_id": ObjectId(owner_id)}
-        if folder_id:
-            query["parent_folder_id"] = ObjectId(folder_id)
-        else:
-            query["parent_folder_id"] = None
-        
+    async def list_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        shared_with: Optional[str] = None
+    ) -> List[File]:
+        query = {
+            "owner_id": ObjectId(owner_id),
+            "parent_folder_id": ObjectId(folder_id) if folder_id else None,
+            "trashed_at": None,
+            **_shared_query(shared_with, include_public=True)
+        }
         files = []
-        async for file_dict in self.collection.find(query):
-            files.append(File(**file_dict))
+        async for file_dict in _find_page(self.collection, query, limit, after_id, fields):
+            files.append(_hydrate(File, file_dict, fields))
         return files
     
-    async def list_shared_with_user(self, user_id: str) -> List[File]:
-        query = {"shared_with": ObjectId(user_id)}
+    async def iter_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[File]:
+        query = {
+            "owner_id": ObjectId(owner_id),
+            "parent_folder_id": ObjectId(folder_id) if folder_id else None,
+            "trashed_at": None
+        }
+        cursor = _find_page(self.collection, query, None, after_id, fields)
+        async for file_dict in cursor.batch_size(STREAM_BATCH_SIZE):
+            yield _hydrate(File, file_dict, fields)
+    
+    async def list_shared_with_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[File]:
+        query = {"shared_with": ObjectId(user_id), "trashed_at": None}
         files = []
-        async for file_dict in self.collection.find(query):
-            files.append(File(**file_dict))
+        async for file_dict in _find_page(self.collection, query, limit, after_id, fields):
+            files.append(_hydrate(File, file_dict, fields))
         return files
     
     async def list_public_by_link(self, public_link: str) -> List[File]:
-        query = {"public_link": public_link, "is_public": True}
+        query = {"public_link": public_link, "is_public": True, "trashed_at": None}
         files = []
         async for file_dict in self.collection.find(query):
-            files.append(File(**file_dict))
+            files.append(File.from_mongo(file_dict))
         return files
     
     async def update(self, file_id: str, data: dict) -> Optional[File]:
         data["updated_at"] = datetime.utcnow()
-        result = await self.collection.update_one(
+        file_dict = await self.collection.find_one_and_update(
             {"_id": ObjectId(file_id)},
-            {"$set": data}
+            {"$set": data},
+            return_document=ReturnDocument.AFTER
+        )
+        if file_dict:
+            return File.from_mongo(file_dict)
+        return None
+    
+    async def add_shared_user(self, file_id: str, owner_id: str, user_id: str) -> Optional[File]:
+        file_dict = await self.collection.find_one_and_update(
+            {"_id": ObjectId(file_id), "owner_id": ObjectId(owner_id), "trashed_at": None},
+            {
+                "$addToSet": {"shared_with": ObjectId(user_id)},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            return_document=ReturnDocument.AFTER
         )
-        if result.modified_count:
-            return await self.get_by_id(file_id)
+        if file_dict:
+            return File.from_mongo(file_dict)
         return None
     
+    async def list_by_ancestor(
+        self,
+        folder_id: str,
+        limit: Optional[int] = None,
+        after_id: Optional[str] = None
+    ) -> List[File]:
+        files = []
+        query = {"ancestors": ObjectId(folder_id), "trashed_at": None}
+        async for file_dict in _find_page(self.collection, query, limit, after_id):
+            files.append(File.from_mongo(file_dict))
+        return files
+    
+    async def trash(self, file_id: str, owner_id: str) -> bool:
+        result = await self.collection.update_one(
+            {"_id": ObjectId(file_id), "owner_id": ObjectId(owner_id), "trashed_at": None},
+            {"$set": {"trashed_at": datetime.utcnow(), "purge_attempts": 0}}
+        )
+        return result.modified_count > 0
+    
+    async def trash_by_ancestor(self, folder_id: str) -> int:
+        result = await self.collection.update_many(
+            {"ancestors": ObjectId(folder_id), "trashed_at": None},
+            {"$set": {"trashed_at": datetime.utcnow(), "purge_attempts": 0}}
+        )
+        return result.modified_count
+    
+    async def claim_trashed(self, limit: int, max_attempts: int, claim_timeout: timedelta) -> List[File]:
+        # A claim older than claim_timeout belongs to a worker that died and can be taken over.
+        files = []
+        now = datetime.utcnow()
+        query = {
+            "trashed_at": {"$type": "date"},
+            "purge_attempts": {"$lt": max_attempts},
+            "$or": [{"purge_claimed_at": None}, {"purge_claimed_at": {"$lt": now - claim_timeout}}]
+        }
+        while len(files) < limit:
+            file_dict = await self.collection.find_one_and_update(
+                query,
+                {"$set": {"purge_claimed_at": now}},
+                sort=[("trashed_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+            if not file_dict:
+                break
+            files.append(File.from_mongo(file_dict))
+        return files
+    
+    async def count_trashed(self) -> int:
+        return await self.collection.count_documents({"trashed_at": {"$type": "date"}})
+    
+    async def record_purge_failures(self, file_ids: List[str]) -> None:
+        await self.collection.update_many(
+            {"_id": {"$in": [ObjectId(file_id) for file_id in file_ids]}},
+            {"$inc": {"purge_attempts": 1}, "$unset": {"purge_claimed_at": ""}}
+        )
+    
+    async def delete_many(self, file_ids: List[str]) -> int:
+        result = await self.collection.delete_many(
+            {"_id": {"$in": [ObjectId(file_id) for file_id in file_ids]}}
+        )
+        return result.deleted_count
+    
+    async def iter_by_filename(self, after: Optional[str] = None) -> AsyncIterator[File]:
+        query = {"filename": {"$gt": after}} if after else {}
+        async for file_dict in self.collection.find(query).sort("filename", ASCENDING):
+            yield File.from_mongo(file_dict)
+    
+    async def rebase_ancestors(self, folder_id: str, ancestors: List[ObjectId]) -> int:
+        return await _rebase_ancestors(self.collection, ObjectId(folder_id), ancestors)
+    
+    async def usage_by_ancestor(self, folder_id: str) -> Tuple[int, int]:
+        pipeline = [
+            {"$match": {"ancestors": ObjectId(folder_id), "trashed_at": None}},
+            {"$group": {"_id": None, "files": {"$sum": 1}, "size": {"$sum": "$size"}}}
+        ]
+        async for usage in self.collection.aggregate(pipeline):
+            return usage["files"], usage["size"]
+        return 0, 0
+    
+    async def usage_by_owner(
+        self,
+        owner_id: str,
+        folder_id: Optional[str] = None,
+        shared_with: Optional[str] = None
+    ) -> Tuple[int, int]:
+        pipeline = [
+            {"$match": {
+                "owner_id": ObjectId(owner_id),
+                "parent_folder_id": ObjectId(folder_id) if folder_id else None,
+                "trashed_at": None,
+                **_shared_query(shared_with, include_public=True)
+            }},
+            {"$group": {"_id": None, "files": {"$sum": 1}, "size": {"$sum": "$size"}}}
+        ]
+        async for usage in self.collection.aggregate(pipeline):
+            return usage["files"], usage["size"]
+        return 0, 0
+    
     async def delete(self, file_id: str) -> bool:
         result = await self.collection.delete_one({"_id": ObjectId(file_id)})
         return result.deleted_count > 0
+
+
+class MongoDBUploadSessionRepository(UploadSessionRepository):
+    INDEXES = [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at")
+    ]
+    INDEXED_QUERIES = [
+        ("list_expired", {"expires_at": {"$lt": datetime.utcnow()}})
+    ]
+    
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+    
+    async def create(self, upload_session: UploadSession) -> UploadSession:
+        session_dict = upload_session.model_dump(by_alias=True, exclude={"id"})
+        result = await self.collection.insert_one(session_dict)
+        session_dict["_id"] = result.inserted_id
+        return UploadSession(**session_dict)
+    
+    async def get_by_id(self, session_id: str) -> Optional[UploadSession]:
+        session_dict = await self.collection.find_one({"_id": ObjectId(session_id)})
+        if session_dict:
+            return UploadSession.from_mongo(session_dict)
+        return None
+    
+    async def add_received_chunk(self, session_id: str, index: int, expires_at: datetime) -> Optional[UploadSession]:
+        session_dict = await self.collection.find_one_and_update(
+            {"_id": ObjectId(session_id), "status": "open"},
+            {
+                "$addToSet": {"received_chunks": index},
+                "$set": {"expires_at": expires_at, "updated_at": datetime.utcnow()}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if session_dict:
+            return UploadSession.from_mongo(session_dict)
+        return None
+    
+    async def claim_for_commit(self, session_id: str, expires_at: datetime) -> Optional[UploadSession]:
+        session_dict = await self.collection.find_one_and_update(
+            {"_id": ObjectId(session_id), "status": "open"},
+            {"$set": {"status": "committing", "expires_at": expires_at, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER
+        )
+        if session_dict:
+            return UploadSession.from_mongo(session_dict)
+        return None
+    
+    async def release_commit(self, session_id: str) -> None:
+        await self.collection.update_one(
+            {"_id": ObjectId(session_id), "status": "committing"},
+            {"$set": {"status": "open", "updated_at": datetime.utcnow()}}
+        )
+    
+    async def list_expired(self, now: datetime, limit: int) -> List[UploadSession]:
+        sessions = []
+        async for session_dict in self.collection.find({"expires_at": {"$lt": now}}).limit(limit):
+            sessions.append(UploadSession.from_mongo(session_dict))
+        return sessions
+    
+    async def delete(self, session_id: str) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(session_id)})
+        return result.deleted_count > 0
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+import asyncio
+import threading
+import time
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_MAX_PENDING = 256
+
+class BoundedIOExecutor:
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage-io")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        call_state = {"submitted_at": time.perf_counter(), "dequeued": False}
+        with self._lock:
+            self._queued += 1
+        try:
+            await self._semaphore.acquire()
+            loop = asyncio.get_running_loop()
+            try:
+                future = self._executor.submit(self._call, call_state, func, args)
+            except BaseException:
+                self._semaphore.release()
+                raise
+            # A cancelled caller stops waiting but the thread keeps running, so the slot is
+            # only given back once the call itself is done.
+            future.add_done_callback(lambda _: self._release(loop))
+            return await asyncio.wrap_future(future)
+        finally:
+            with self._lock:
+                self._dequeue(call_state)
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._semaphore.release)
+
+    def _dequeue(self, call_state: dict) -> None:
+        if not call_state["dequeued"]:
+            call_state["dequeued"] = True
+            self._queued -= 1
+
+    def _call(self, call_state: dict, func: Callable[..., T], args: tuple) -> T:
+        wait_time = time.perf_counter() - call_state["submitted_at"]
+        with self._lock:
+            self._dequeue(call_state)
+            self._running += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queue_depth": self._queued,
+                "in_flight": self._running,
+                "completed": self._completed,
+                "wait_time_avg_ms": (self._total_wait_time / started * 1000) if started else 0.0,
+                "wait_time_max_ms": self._max_wait_time * 1000
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
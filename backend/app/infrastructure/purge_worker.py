@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from domain.entities import File
+from domain.repositories import FileRepository, FileStorageRepository
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RETRIES = 3
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_IDLE_INTERVAL = 30.0
+DEFAULT_CLAIM_TIMEOUT = 600.0
+RETRY_BACKOFF = 0.5
+
+
+class PurgeWorker:
+    # Files whose blob keeps failing stay trashed after max_attempts for inspection.
+    def __init__(
+        self,
+        file_repository: FileRepository,
+        file_storage_repository: FileStorageRepository,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        idle_interval: float = DEFAULT_IDLE_INTERVAL,
+        claim_timeout: float = DEFAULT_CLAIM_TIMEOUT
+    ):
+        self.file_repository = file_repository
+        self.file_storage_repository = file_storage_repository
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.max_attempts = max_attempts
+        self.idle_interval = idle_interval
+        self.claim_timeout = claim_timeout
+        self._backlog: Optional[int] = None
+        self._purged_files = 0
+        self._purged_bytes = 0
+        self._failed = 0
+        self._retried = 0
+        self._last_batch_at: Optional[datetime] = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                purged = await self.purge_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Purge batch failed")
+                purged = 0
+            if not purged:
+                await asyncio.sleep(self.idle_interval)
+
+    async def purge_batch(self) -> int:
+        self._backlog = await self.file_repository.count_trashed()
+        files = await self.file_repository.claim_trashed(
+            self.batch_size, self.max_attempts, timedelta(seconds=self.claim_timeout)
+        )
+        if not files:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def purge(file: File) -> bool:
+            async with semaphore:
+                return await self._delete_blob(file)
+
+        results = await asyncio.gather(*(purge(file) for file in files))
+        purged_files = [file for file, purged in zip(files, results) if purged]
+        failed_ids = [str(file.id) for file, purged in zip(files, results) if not purged]
+
+        if purged_files:
+            await self.file_repository.delete_many([str(file.id) for file in purged_files])
+        if failed_ids:
+            await self.file_repository.record_purge_failures(failed_ids)
+
+        self._purged_files += len(purged_files)
+        self._purged_bytes += sum(file.size for file in purged_files)
+        self._failed += len(failed_ids)
+        self._backlog = max(self._backlog - len(purged_files), 0)
+        self._last_batch_at = datetime.utcnow()
+        return len(purged_files)
+
+    async def _delete_blob(self, file: File) -> bool:
+        for attempt in range(self.retries):
+            if attempt:
+                self._retried += 1
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                await self.file_storage_repository.delete(file.filename, str(file.id))
+                return True
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Failed to delete blob %s (attempt %d)", file.filename, attempt + 1, exc_info=True)
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "backlog": self._backlog,
+            "purged_files": self._purged_files,
+            "purged_bytes": self._purged_bytes,
+            "failed": self._failed,
+            "retried": self._retried,
+            "last_batch_at": self._last_batch_at
+        }
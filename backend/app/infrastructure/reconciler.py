@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional, TypeVar
+from motor.motor_asyncio import AsyncIOMotorCollection
+from domain.entities import File
+from domain.repositories import FileRepository, FileStorageRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MODE_REPORT = "report"
+MODE_QUARANTINE = "quarantine"
+MODE_DELETE = "delete"
+MODES = (MODE_REPORT, MODE_QUARANTINE, MODE_DELETE)
+
+CHECKPOINT_ID = "storage"
+CHECKPOINT_INTERVAL = 10000
+DEFAULT_GRACE_PERIOD = timedelta(hours=6)
+
+
+class StorageReconciler:
+    # Records younger than the grace period may still be mid-upload and are left alone.
+    def __init__(
+        self,
+        file_repository: FileRepository,
+        file_storage_repository: FileStorageRepository,
+        checkpoint_collection: AsyncIOMotorCollection,
+        mode: str = MODE_REPORT,
+        grace_period: timedelta = DEFAULT_GRACE_PERIOD
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown reconcile mode: {mode}")
+        self.file_repository = file_repository
+        self.file_storage_repository = file_storage_repository
+        self.checkpoint_collection = checkpoint_collection
+        self.mode = mode
+        self.grace_period = grace_period
+        self._cutoff = datetime.utcnow() - grace_period
+        self._stats = {
+            "scanned": 0,
+            "matched": 0,
+            "orphan_blobs": 0,
+            "dangling_records": 0,
+            "skipped_recent": 0,
+            "quarantined": 0,
+            "deleted": 0,
+            "trashed": 0,
+            "complete": False,
+            "checkpoint": None
+        }
+
+    async def run(self, max_entries: Optional[int] = None, restart: bool = False) -> dict:
+        if restart:
+            await self._save_checkpoint(None)
+        after = await self._load_checkpoint()
+        self._cutoff = datetime.utcnow() - self.grace_period
+
+        blobs = self.file_storage_repository.iter_blob_names(after)
+        records = self.file_repository.iter_by_filename(after)
+        blob = await _next(blobs)
+        record = await _next(records)
+        last_key = after
+
+        while blob is not None or record is not None:
+            key = min(name for name in (blob, record.filename if record else None) if name is not None)
+            if key != last_key:
+                if max_entries is not None and self._stats["scanned"] >= max_entries:
+                    await self._save_checkpoint(last_key)
+                    return self.stats()
+                if self._stats["scanned"] and self._stats["scanned"] % CHECKPOINT_INTERVAL == 0:
+                    await self._save_checkpoint(last_key)
+
+            if record is not None and record.filename == key:
+                if blob == key:
+                    while record is not None and record.filename == key:
+                        record = await _next(records)
+                    blob = await _next(blobs)
+                    self._stats["matched"] += 1
+                else:
+                    await self._handle_dangling_record(record)
+                    record = await _next(records)
+            else:
+                await self._handle_orphan_blob(blob)
+                blob = await _next(blobs)
+
+            self._stats["scanned"] += 1
+            last_key = key
+
+        await self._save_checkpoint(None)
+        self._stats["complete"] = True
+        return self.stats()
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    async def _handle_orphan_blob(self, filename: str) -> None:
+        modified_at = await self.file_storage_repository.get_modified_at(filename)
+        if modified_at is None:
+            return
+        if modified_at > self._cutoff:
+            self._stats["skipped_recent"] += 1
+            return
+        self._stats["orphan_blobs"] += 1
+        logger.info("Orphan blob %s", filename)
+        if self.mode == MODE_QUARANTINE and await self.file_storage_repository.quarantine(filename):
+            self._stats["quarantined"] += 1
+        elif self.mode == MODE_DELETE and await self.file_storage_repository.remove_orphan(filename):
+            self._stats["deleted"] += 1
+
+    async def _handle_dangling_record(self, file: File) -> None:
+        if file.trashed_at:
+            return
+        if file.created_at > self._cutoff:
+            self._stats["skipped_recent"] += 1
+            return
+        self._stats["dangling_records"] += 1
+        logger.info("File %s has no blob %s", file.id, file.filename)
+        if self.mode != MODE_REPORT and await self.file_repository.trash(str(file.id), str(file.owner_id)):
+            self._stats["trashed"] += 1
+
+    async def _load_checkpoint(self) -> Optional[str]:
+        checkpoint = await self.checkpoint_collection.find_one({"_id": CHECKPOINT_ID})
+        return checkpoint.get("after") if checkpoint else None
+
+    async def _save_checkpoint(self, after: Optional[str]) -> None:
+        self._stats["checkpoint"] = after
+        await self.checkpoint_collection.update_one(
+            {"_id": CHECKPOINT_ID},
+            {"$set": {"after": after, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+
+async def _next(items: AsyncIterator[T]) -> Optional[T]:
+    try:
+        return await items.__anext__()
+    except StopAsyncIteration:
+        return None
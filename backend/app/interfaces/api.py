@@ -4,31 +4,61 @@ from fastapi import (
     Depends, 
     HTTPException, 
     status, 
+    Path,
+    Query,
+    Request,
+    Response,
     UploadFile
 )
 from fastapi import File as FastAPIFile
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
 import bcrypt
 
-from domain.entities import User, File, Folder
-from domain.use_cases import UserUseCases, FileUseCases, FolderUseCases
-from dependencies import get_user_use_cases, get_file_use_cases, get_folder_use_cases
+from domain.entities import User, File, Folder, UploadSession
+from domain.use_cases import MAX_UPLOAD_CHUNKS, UserUseCases, FileUseCases, FolderUseCases, UploadSessionUseCases
+from domain.password_hasher import PasswordHasherBusy
+from infrastructure.io_executor import BoundedIOExecutor
+from dependencies import (
+    get_user_use_cases,
+    get_file_use_cases,
+    get_folder_use_cases,
+    get_upload_session_use_cases,
+    get_io_executor,
+    BULK_UPLOAD_CONCURRENCY,
+    LIST_PAGE_SIZE,
+    LIST_MAX_PAGE_SIZE,
+    SENDFILE_MIN_SIZE
+)
 
 from interfaces.serializers import (
     UserRegistrationRequest,
     ShareFileRequest,
     CreatePublicLinkRequest,
     FolderRequest,
+    MoveFolderRequest,
+    FolderUsageResponse,
+    FolderContentsResponse,
+    BulkUploadItemResponse,
+    UploadSessionRequest,
+    UploadSessionResponse,
     UserResponse,
     TokenResponse,
     FileResponse,
     FolderResponse,
-    PublicLinkResponse
+    PublicLinkResponse,
+    FILE_FIELDS,
+    FOLDER_FIELDS,
+    serialize_file,
+    serialize_folder
 )
+from interfaces.archives import zip_stream
+from interfaces.fields import parse_fields
+from interfaces.pagination import decode_cursor, page_response, paginate, split_page
+from interfaces.responses import NDJSON_MEDIA_TYPE, JSONBytesResponse, content_disposition, file_response, ndjson_stream
 
-router = APIRouter(prefix="/api")
+router = APIRouter(prefix="/api", default_response_class=JSONBytesResponse)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 async def get_current_user(
@@ -44,6 +74,13 @@ async def get_current_user(
         )
     return user
 
+def password_hasher_busy(error: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserRegistrationRequest,
@@ -66,16 +103,21 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHasherBusy as e:
+        raise password_hasher_busy(e)
 
 @router.post("/auth/login", response_model=TokenResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     user_use_cases: UserUseCases = Depends(get_user_use_cases)
 ):
-    token = await user_use_cases.authenticate_user(
-        email=form_data.username,
-        password=form_data.password
-    )
+    try:
+        token = await user_use_cases.authenticate_user(
+            email=form_data.username,
+            password=form_data.password
+        )
+    except PasswordHasherBusy as e:
+        raise password_hasher_busy(e)
     
     if not token:
         raise HTTPException(
@@ -103,83 +145,135 @@ async def upload_file(
     current_user: User = Depends(get_current_user),
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
-    uploaded_file = await file_use_cases.upload_file(
-        upload_file=file,
-        owner_id=str(current_user.id),
-        parent_folder_id=folder_id
-    )
+    try:
+        uploaded_file = await file_use_cases.upload_file(
+            upload_file=file,
+            owner_id=str(current_user.id),
+            parent_folder_id=folder_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return {
-        "id": str(uploaded_file.id),
-        "filename": uploaded_file.filename,
-        "original_filename": uploaded_file.original_filename,
-        "content_type": uploaded_file.content_type,
-        "size": uploaded_file.size,
-        "owner_id": str(uploaded_file.owner_id),
-        "parent_folder_id": str(uploaded_file.parent_folder_id) if uploaded_file.parent_folder_id else None,
-        "shared_with": [str(user_id) for user_id in uploaded_file.shared_with],
-        "is_public": uploaded_file.is_public,
-        "public_link": uploaded_file.public_link,
-        "public_link_expiry": uploaded_file.public_link_expiry,
-        "created_at": uploaded_file.created_at,
-        "updated_at": uploaded_file.updated_at
-    }
+    return serialize_file(uploaded_file)
+
+@router.post("/files/stream", response_model=FileResponse, status_code=status.HTTP_201_CREATED)
+async def upload_file_stream(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    folder_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    file_use_cases: FileUseCases = Depends(get_file_use_cases)
+):
+    try:
+        uploaded_file = await file_use_cases.create_file_from_stream(
+            chunks=request.stream(),
+            original_filename=filename,
+            content_type=request.headers.get("content-type", "application/octet-stream"),
+            owner_id=str(current_user.id),
+            parent_folder_id=folder_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return serialize_file(uploaded_file)
+
+@router.post("/files/bulk", response_model=List[BulkUploadItemResponse])
+async def upload_files_bulk(
+    files: List[UploadFile] = FastAPIFile(...),
+    folder_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    file_use_cases: FileUseCases = Depends(get_file_use_cases)
+):
+    try:
+        results = await file_use_cases.upload_files(
+            upload_files=files,
+            owner_id=str(current_user.id),
+            parent_folder_id=folder_id,
+            concurrency=BULK_UPLOAD_CONCURRENCY
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return [
+        {
+            "original_filename": upload_file.filename,
+            "file": serialize_file(file) if file else None,
+            "error": error
+        }
+        for upload_file, (file, error) in zip(files, results)
+    ]
 
 @router.get("/files/", response_model=List[FileResponse])
 async def list_files(
+    response: Response,
     folder_id: Optional[str] = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
+    selected_fields = parse_fields(fields, FILE_FIELDS)
     files = await file_use_cases.list_files(
         owner_id=str(current_user.id),
-        folder_id=folder_id
+        folder_id=folder_id,
+        limit=limit + 1,
+        after_id=decode_cursor(cursor),
+        fields=selected_fields
     )
+    files = paginate(files, limit, response)
     
-    return [
-        {
-            "id": str(file.id),
-            "filename": file.filename,
-            "original_filename": file.original_filename,
-            "content_type": file.content_type,
-            "size": file.size,
-            "owner_id": str(file.owner_id),
-            "parent_folder_id": str(file.parent_folder_id) if file.parent_folder_id else None,
-            "shared_with": [str(user_id) for user_id in file.shared_with],
-            "is_public": file.is_public,
-            "public_link": file.public_link,
-            "public_link_expiry": file.public_link_expiry,
-            "created_at": file.created_at,
-            "updated_at": file.updated_at
-        }
-        for file in files
-    ]
+    return page_response([serialize_file(file, selected_fields) for file in files], response)
 
 @router.get("/files/shared", response_model=List[FileResponse])
 async def list_shared_files(
+    response: Response,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
-    files = await file_use_cases.list_shared_files(user_id=str(current_user.id))
+    selected_fields = parse_fields(fields, FILE_FIELDS)
+    files = await file_use_cases.list_shared_files(
+        user_id=str(current_user.id),
+        limit=limit + 1,
+        after_id=decode_cursor(cursor),
+        fields=selected_fields
+    )
+    files = paginate(files, limit, response)
     
-    return [
-        {
-            "id": str(file.id),
-            "filename": file.filename,
-            "original_filename": file.original_filename,
-            "content_type": file.content_type,
-            "size": file.size,
-            "owner_id": str(file.owner_id),
-            "parent_folder_id": str(file.parent_folder_id) if file.parent_folder_id else None,
-            "shared_with": [str(user_id) for user_id in file.shared_with],
-            "is_public": file.is_public,
-            "public_link": file.public_link,
-            "public_link_expiry": file.public_link_expiry,
-            "created_at": file.created_at,
-            "updated_at": file.updated_at
-        }
-        for file in files
-    ]
+    return page_response([serialize_file(file, selected_fields) for file in files], response)
+
+@router.get("/files/export")
+async def export_files(
+    folder_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    file_use_cases: FileUseCases = Depends(get_file_use_cases)
+):
+    selected_fields = parse_fields(fields, FILE_FIELDS)
+    files = file_use_cases.iter_files(
+        owner_id=str(current_user.id),
+        folder_id=folder_id,
+        after_id=decode_cursor(cursor),
+        fields=selected_fields
+    )
+    
+    return StreamingResponse(
+        content=ndjson_stream(files, lambda file: serialize_file(file, selected_fields)),
+        media_type=NDJSON_MEDIA_TYPE
+    )
 
 @router.get("/files/{file_id}", response_model=FileResponse)
 async def get_file(
@@ -187,47 +281,34 @@ async def get_file(
     current_user: User = Depends(get_current_user),
     file_use_cases: FileUseCases = Depends(get_file_use_cases)
 ):
-    file_tuple = await file_use_cases.download_file(file_id, str(current_user.id))
-    if not file_tuple:
+    file = await file_use_cases.get_file(file_id, str(current_user.id))
+    if not file:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found or you don't have access to it"
         )
-    file, _, _ = file_tuple
-    file_details = await file_use_cases.file_repository.get_by_id(file_id)
-    return {
-        "id": str(file_details.id),
-        "filename": file_details.filename,
-        "original_filename": file_details.original_filename,
-        "content_type": file_details.content_type,
-        "size": file_details.size,
-        "owner_id": str(file_details.owner_id),
-        "parent_folder_id": str(file_details.parent_folder_id) if file_details.parent_folder_id else None,
-        "shared_with": [str(user_id) for user_id in file_details.shared_with],
-        "is_public": file_details.is_public,
-        "public_link": file_details.public_link,
-        "public_link_expiry": file_details.public_link_expiry,
-        "created_at": file_details.created_at,
-        "updated_at": file_details.updated_at
-    }
+    return serialize_file(file)
 
 @router.get("/files/{file_id}/download")
 async def download_file(
     file_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user),
-    file_use_cases: FileUseCases = Depends(get_file_use_cases)
+    file_use_cases: FileUseCases = Depends(get_file_use_cases),
+    io_executor: BoundedIOExecutor = Depends(get_io_executor)
 ):
-    file_tuple = await file_use_cases.download_file(file_id, str(current_user.id))
-    if not file_tuple:
+    file = await file_use_cases.get_file(file_id, str(current_user.id))
+    if not file:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found or you don't have access to it"
         )
-    file_content, original_filename, content_type = file_tuple
-    return StreamingResponse(
-        content=file_content,
-        media_type=content_type,
-        headers={"Content-Disposition": f"attachment; filename=\"{original_filename}\""}
+    return await file_response(
+        request,
+        file,
+        lambda start, length: file_use_cases.read_file(file, start, length),
+        await file_use_cases.get_file_path(file) if file.size >= SENDFILE_MIN_SIZE else None,
+        io_executor.run
     )
 
 @router.delete("/files/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -260,21 +341,7 @@ async def share_file(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found or you don't have access to share it"
         )
-    return {
-        "id": str(shared_file.id),
-        "filename": shared_file.filename,
-        "original_filename": shared_file.original_filename,
-        "content_type": shared_file.content_type,
-        "size": shared_file.size,
-        "owner_id": str(shared_file.owner_id),
-        "parent_folder_id": str(shared_file.parent_folder_id) if shared_file.parent_folder_id else None,
-        "shared_with": [str(user_id) for user_id in shared_file.shared_with],
-        "is_public": shared_file.is_public,
-        "public_link": shared_file.public_link,
-        "public_link_expiry": shared_file.public_link_expiry,
-        "created_at": shared_file.created_at,
-        "updated_at": shared_file.updated_at
-    }
+    return serialize_file(shared_file)
 
 @router.post("/files/{file_id}/public-link", response_model=PublicLinkResponse)
 async def create_public_link(
@@ -302,7 +369,9 @@ async def create_public_link(
 @router.get("/files/public/{public_key}")
 async def access_public_file(
     public_key: str,
-    file_use_cases: FileUseCases = Depends(get_file_use_cases)
+    request: Request,
+    file_use_cases: FileUseCases = Depends(get_file_use_cases),
+    io_executor: BoundedIOExecutor = Depends(get_io_executor)
 ):
     public_link = f"/api/files/public/{public_key}"
     file = await file_use_cases.get_file_by_public_link(public_link)
@@ -311,17 +380,115 @@ async def access_public_file(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Public file not found or link has expired"
         )
-    file_content = await file_use_cases.file_storage_repository.get(file.filename)
-    if not file_content:
+    return await file_response(
+        request,
+        file,
+        lambda start, length: file_use_cases.read_file(file, start, length),
+        await file_use_cases.get_file_path(file) if file.size >= SENDFILE_MIN_SIZE else None,
+        io_executor.run
+    )
+
+def upload_session_response(upload_session: UploadSession) -> dict:
+    return {
+        "id": str(upload_session.id),
+        "filename": upload_session.filename,
+        "content_type": upload_session.content_type,
+        "parent_folder_id": str(upload_session.parent_folder_id) if upload_session.parent_folder_id else None,
+        "total_chunks": upload_session.total_chunks,
+        "received_chunks": sorted(upload_session.received_chunks),
+        "status": upload_session.status,
+        "expires_at": upload_session.expires_at,
+        "created_at": upload_session.created_at
+    }
+
+@router.post("/uploads/", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    session_data: UploadSessionRequest,
+    current_user: User = Depends(get_current_user),
+    upload_session_use_cases: UploadSessionUseCases = Depends(get_upload_session_use_cases)
+):
+    upload_session = await upload_session_use_cases.create_session(
+        owner_id=str(current_user.id),
+        filename=session_data.filename,
+        content_type=session_data.content_type,
+        parent_folder_id=session_data.folder_id,
+        total_chunks=session_data.total_chunks
+    )
+    return upload_session_response(upload_session)
+
+@router.get("/uploads/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    upload_session_use_cases: UploadSessionUseCases = Depends(get_upload_session_use_cases)
+):
+    upload_session = await upload_session_use_cases.get_session(session_id, str(current_user.id))
+    if not upload_session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="File content not found"
+            detail="Upload session not found or expired"
+        )
+    return upload_session_response(upload_session)
+
+@router.put("/uploads/{session_id}/chunks/{index}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    session_id: str,
+    request: Request,
+    index: int = Path(..., ge=0, le=MAX_UPLOAD_CHUNKS - 1),
+    current_user: User = Depends(get_current_user),
+    upload_session_use_cases: UploadSessionUseCases = Depends(get_upload_session_use_cases)
+):
+    try:
+        upload_session = await upload_session_use_cases.upload_chunk(
+            session_id=session_id,
+            owner_id=str(current_user.id),
+            index=index,
+            chunks=request.stream()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not upload_session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
+        )
+    return upload_session_response(upload_session)
+
+@router.post("/uploads/{session_id}/commit", response_model=FileResponse, status_code=status.HTTP_201_CREATED)
+async def commit_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    upload_session_use_cases: UploadSessionUseCases = Depends(get_upload_session_use_cases)
+):
+    try:
+        uploaded_file = await upload_session_use_cases.commit_session(session_id, str(current_user.id))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not uploaded_file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
+        )
+    return serialize_file(uploaded_file)
+
+@router.delete("/uploads/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    upload_session_use_cases: UploadSessionUseCases = Depends(get_upload_session_use_cases)
+):
+    aborted = await upload_session_use_cases.abort_session(session_id, str(current_user.id))
+    if not aborted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found or expired"
         )
-    return StreamingResponse(
-        content=file_content,
-        media_type=file.content_type,
-        headers={"Content-Disposition": f"attachment; filename=\"{file.original_filename}\""}
-    )
 
 @router.post("/folders/", response_model=FolderResponse, status_code=status.HTTP_201_CREATED)
 async def create_folder(
@@ -329,44 +496,165 @@ async def create_folder(
     current_user: User = Depends(get_current_user),
     folder_use_cases: FolderUseCases = Depends(get_folder_use_cases)
 ):
-    folder = await folder_use_cases.create_folder(
-        name=folder_data.name,
-        owner_id=str(current_user.id),
-        parent_folder_id=folder_data.parent_folder_id
-    )
+    try:
+        folder = await folder_use_cases.create_folder(
+            name=folder_data.name,
+            owner_id=str(current_user.id),
+            parent_folder_id=folder_data.parent_folder_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return {
-        "id": str(folder.id),
-        "name": folder.name,
-        "owner_id": str(folder.owner_id),
-        "parent_folder_id": str(folder.parent_folder_id) if folder.parent_folder_id else None,
-        "shared_with": [str(user_id) for user_id in folder.shared_with],
-        "created_at": folder.created_at,
-        "updated_at": folder.updated_at
-    }
+    return serialize_folder(folder)
 
 @router.get("/folders/", response_model=List[FolderResponse])
 async def list_folders(
+    response: Response,
     parent_folder_id: Optional[str] = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     folder_use_cases: FolderUseCases = Depends(get_folder_use_cases)
 ):
+    selected_fields = parse_fields(fields, FOLDER_FIELDS)
     folders = await folder_use_cases.list_folders(
         owner_id=str(current_user.id),
-        parent_folder_id=parent_folder_id
+        parent_folder_id=parent_folder_id,
+        limit=limit + 1,
+        after_id=decode_cursor(cursor),
+        fields=selected_fields
     )
-    return [
-        {
-            "id": str(folder.id),
-            "name": folder.name,
-            "owner_id": str(folder.owner_id),
-            "parent_folder_id": str(folder.parent_folder_id) if folder.parent_folder_id else None,
-            "shared_with": [str(user_id) for user_id in folder.shared_with],
-            "created_at": folder.created_at,
-            "updated_at": folder.updated_at
-        }
-        for folder in folders
-    ]
+    folders = paginate(folders, limit, response)
+    return page_response([serialize_folder(folder, selected_fields) for folder in folders], response)
+
+@router.get("/folders/export")
+async def export_folders(
+    parent_folder_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    folder_use_cases: FolderUseCases = Depends(get_folder_use_cases)
+):
+    selected_fields = parse_fields(fields, FOLDER_FIELDS)
+    folders = folder_use_cases.iter_folders(
+        owner_id=str(current_user.id),
+        parent_folder_id=parent_folder_id,
+        after_id=decode_cursor(cursor),
+        fields=selected_fields
+    )
+    
+    return StreamingResponse(
+        content=ndjson_stream(folders, lambda folder: serialize_folder(folder, selected_fields)),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+@router.get("/folders/contents", response_model=FolderContentsResponse)
+async def get_folder_contents(
+    folder_id: Optional[str] = None,
+    limit: int = Query(LIST_PAGE_SIZE, ge=1, le=LIST_MAX_PAGE_SIZE),
+    folders_cursor: Optional[str] = None,
+    files_cursor: Optional[str] = None,
+    folder_fields: Optional[str] = None,
+    file_fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    folder_use_cases: FolderUseCases = Depends(get_folder_use_cases)
+):
+    selected_folder_fields = parse_fields(folder_fields, FOLDER_FIELDS)
+    selected_file_fields = parse_fields(file_fields, FILE_FIELDS)
+    contents = await folder_use_cases.get_folder_contents(
+        user_id=str(current_user.id),
+        folder_id=folder_id,
+        limit=limit + 1,
+        folders_after_id=decode_cursor(folders_cursor),
+        files_after_id=decode_cursor(files_cursor),
+        folder_fields=selected_folder_fields,
+        file_fields=selected_file_fields
+    )
+    if not contents:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found or you don't have access"
+        )
+    folders, next_folders_cursor = split_page(contents.folders, limit)
+    files, next_files_cursor = split_page(contents.files, limit)
+    return JSONBytesResponse({
+        "folder": serialize_folder(contents.folder) if contents.folder else None,
+        "ancestors": [serialize_folder(ancestor) for ancestor in contents.ancestors],
+        "folders": [serialize_folder(folder, selected_folder_fields) for folder in folders],
+        "files": [serialize_file(file, selected_file_fields) for file in files],
+        "folder_count": contents.folder_count,
+        "file_count": contents.file_count,
+        "total_size": contents.total_size,
+        "next_folders_cursor": next_folders_cursor,
+        "next_files_cursor": next_files_cursor
+    })
+
+@router.get("/folders/{folder_id}/archive")
+async def download_folder_archive(
+    folder_id: str,
+    current_user: User = Depends(get_current_user),
+    folder_use_cases: FolderUseCases = Depends(get_folder_use_cases),
+    file_use_cases: FileUseCases = Depends(get_file_use_cases)
+):
+    folder = await folder_use_cases.get_folder(folder_id, str(current_user.id))
+    if not folder:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found or you don't have access"
+        )
+    
+    return StreamingResponse(
+        content=zip_stream(
+            folder_use_cases.walk_folder(folder, str(current_user.id)),
+            lambda file: file_use_cases.read_file(file, 0, None)
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(f"{folder.name}.zip")}
+    )
+
+@router.get("/folders/{folder_id}/usage", response_model=FolderUsageResponse)
+async def get_folder_usage(
+    folder_id: str,
+    current_user: User = Depends(get_current_user),
+    folder_use_cases: FolderUseCases = Depends(get_folder_use_cases)
+):
+    usage = await folder_use_cases.get_folder_usage(folder_id, str(current_user.id))
+    if not usage:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found or you don't have access"
+        )
+    files, size = usage
+    return {"files": files, "size": size}
+
+@router.post("/folders/{folder_id}/move", response_model=FolderResponse)
+async def move_folder(
+    folder_id: str,
+    move_data: MoveFolderRequest,
+    current_user: User = Depends(get_current_user),
+    folder_use_cases: FolderUseCases = Depends(get_folder_use_cases)
+):
+    try:
+        folder = await folder_use_cases.move_folder(
+            folder_id=folder_id,
+            owner_id=str(current_user.id),
+            parent_folder_id=move_data.parent_folder_id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not folder:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Folder not found or you don't have access to move it"
+        )
+    return serialize_folder(folder)
 
 @router.delete("/folders/{folder_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_folder(
@@ -398,12 +686,4 @@ async def share_folder(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Folder not found or you don't have access to share it"
         )
-    return {
-        "id": str(shared_folder.id),
-        "name": shared_folder.name,
-        "owner_id": str(shared_folder.owner_id),
-        "parent_folder_id": str(shared_folder.parent_folder_id) if shared_folder.parent_folder_id else None,
-        "shared_with": [str(user_id) for user_id in shared_folder.shared_with],
-        "created_at": shared_folder.created_at,
-        "updated_at": shared_folder.updated_at
-    }
+    return serialize_folder(shared_folder)
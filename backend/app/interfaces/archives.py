@@ -0,0 +1,87 @@
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import os
+import zipfile
+
+from domain.entities import File
+
+COMPRESSED_CONTENT_TYPE_PREFIXES = ("image/", "video/", "audio/")
+COMPRESSED_CONTENT_TYPES = frozenset({
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.rar",
+    "application/zstd",
+    "application/pdf"
+})
+COMPRESSED_EXTENSIONS = frozenset({
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".aac", ".ogg", ".flac", ".mp4", ".mkv", ".mov", ".webm",
+    ".docx", ".xlsx", ".pptx", ".odt", ".jar", ".apk", ".pdf"
+})
+
+ArchiveEntry = Tuple[str, Optional[File]]
+ContentOpener = Callable[[File], Awaitable[Optional[AsyncIterator[bytes]]]]
+
+
+class _ZipOutput:
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def is_compressed(file: File) -> bool:
+    content_type = (file.content_type or "").split(";")[0].strip().lower()
+    if content_type.startswith(COMPRESSED_CONTENT_TYPE_PREFIXES) and content_type != "image/svg+xml":
+        return True
+    if content_type in COMPRESSED_CONTENT_TYPES:
+        return True
+    return os.path.splitext(file.original_filename)[1].lower() in COMPRESSED_EXTENSIONS
+
+
+async def zip_stream(entries: AsyncIterator[ArchiveEntry], open_content: ContentOpener) -> AsyncIterator[bytes]:
+    # A None file marks a directory entry.
+    loop = asyncio.get_running_loop()
+    output = _ZipOutput()
+    archive = zipfile.ZipFile(output, mode="w", allowZip64=True)
+
+    async for path, file in entries:
+        if file is None:
+            archive.writestr(zipfile.ZipInfo(f"{path}/"), b"")
+            yield output.drain()
+            continue
+
+        content = await open_content(file)
+        if content is None:
+            continue
+
+        info = zipfile.ZipInfo(path, date_time=file.created_at.timetuple()[:6])
+        info.file_size = file.size
+        info.compress_type = zipfile.ZIP_STORED if is_compressed(file) else zipfile.ZIP_DEFLATED
+        entry = archive.open(info, mode="w")
+        async for chunk in content:
+            await loop.run_in_executor(None, entry.write, chunk)
+            data = output.drain()
+            if data:
+                yield data
+        entry.close()
+        yield output.drain()
+
+    archive.close()
+    yield output.drain()
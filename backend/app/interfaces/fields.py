@@ -0,0 +1,20 @@
+from typing import Iterable, List, Optional
+from fastapi import HTTPException, status
+
+ALWAYS_INCLUDED = "id"
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    # The id is always included because the next page's cursor is built from it.
+    if not fields:
+        return None
+    allowed = list(allowed)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    selected = [ALWAYS_INCLUDED] + [field for field in requested if field != ALWAYS_INCLUDED]
+    return list(dict.fromkeys(selected))
@@ -0,0 +1,49 @@
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Response, status
+from interfaces.responses import JSONBytesResponse
+import base64
+import binascii
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    return base64.urlsafe_b64encode(last_id.binary).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    try:
+        return str(ObjectId(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+    except (binascii.Error, InvalidId, TypeError, ValueError, UnicodeEncodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def split_page(items: Sequence[T], limit: int) -> Tuple[List[T], Optional[str]]:
+    # Items are fetched with limit + 1; the extra one only signals another page.
+    page = list(items[:limit])
+    next_cursor = encode_cursor(page[-1].id) if len(items) > limit else None
+    return page, next_cursor
+
+
+def paginate(items: Sequence[T], limit: int, response: Response) -> List[T]:
+    page, next_cursor = split_page(items, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
+
+
+def page_response(items: List[Any], response: Response) -> JSONBytesResponse:
+    # FastAPI ignores the injected response once a handler returns its own.
+    headers = {}
+    if NEXT_CURSOR_HEADER in response.headers:
+        headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+    return JSONBytesResponse(items, headers=headers)
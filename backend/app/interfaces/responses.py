@@ -0,0 +1,273 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple, TypeVar
+from email.utils import format_datetime
+from datetime import timezone
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from urllib.parse import quote
+from bson import ObjectId
+import orjson
+import os
+import re
+import uuid
+
+from domain.entities import File
+
+MAX_RANGES = 16
+SENDFILE_FALLBACK_CHUNK_SIZE = 1024 * 1024
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NDJSON_FLUSH_SIZE = 64 * 1024
+
+T = TypeVar("T")
+UNSAFE_FILENAME_CHARACTERS = re.compile(r'[^\x20-\x7e]|["\\]')
+
+ByteRange = Tuple[int, int]
+RangeOpener = Callable[[int, Optional[int]], Awaitable[Optional[AsyncIterator[bytes]]]]
+IORunner = Callable[..., Awaitable[Any]]
+
+
+class JSONBytesResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_json_default)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_stream(items: AsyncIterator[T], serialize: Callable[[T], Any]) -> AsyncIterator[bytes]:
+    # The first line goes out alone so the response starts right away.
+    buffer = bytearray()
+    first = True
+    async for item in items:
+        buffer += orjson.dumps(serialize(item), default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+        if first or len(buffer) >= NDJSON_FLUSH_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+            first = False
+    if buffer:
+        yield bytes(buffer)
+
+
+class SendfileResponse(Response):
+    # Uses the ASGI zerocopy or pathsend extension when offered, else pread via run_io.
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        count: int,
+        whole_file: bool,
+        run_io: IORunner,
+        status_code: int = status.HTTP_200_OK,
+        headers: Optional[dict] = None,
+        media_type: Optional[str] = None
+    ):
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.whole_file = whole_file
+        self.run_io = run_io
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        in_file = await self.run_io(open, self.path, "rb")
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers
+            })
+            if "http.response.zerocopy" in extensions:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": in_file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+            elif self.whole_file and "http.response.pathsend" in extensions:
+                await send({"type": "http.response.pathsend", "path": self.path})
+            else:
+                await self._send_chunks(in_file.fileno(), send)
+        finally:
+            await self.run_io(in_file.close)
+
+    async def _send_chunks(self, fd: int, send: Send) -> None:
+        position = self.offset
+        remaining = self.count
+        while remaining > 0:
+            chunk = await self.run_io(os.pread, fd, min(SENDFILE_FALLBACK_CHUNK_SIZE, remaining), position)
+            if not chunk:
+                break
+            position += len(chunk)
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[List[ByteRange]]:
+    # Inclusive (start, end) pairs, [] if unsatisfiable, None to ignore the header.
+    unit, _, range_set = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not range_set:
+        return None
+
+    ranges = []
+    for range_spec in range_set.split(","):
+        first, sep, last = range_spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if end < start:
+                    return None
+            else:
+                suffix_length = int(last)
+                if suffix_length == 0:
+                    continue
+                start = max(size - suffix_length, 0)
+                end = size - 1
+        except ValueError:
+            return None
+        if start < 0 or start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+
+def file_etag(file: File) -> str:
+    return f'"{file.checksum or file.id}"'
+
+
+def file_last_modified(file: File) -> str:
+    return format_datetime(file.created_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def _if_range_matches(if_range: str, file: File) -> bool:
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == file_etag(file)
+    return if_range == file_last_modified(file)
+
+
+def content_disposition(filename: str) -> str:
+    # Headers are latin-1, so non-ASCII names also get an RFC 5987 filename*.
+    fallback = UNSAFE_FILENAME_CHARACTERS.sub("_", filename)
+    if fallback == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+async def file_response(
+    request: Request,
+    file: File,
+    open_range: RangeOpener,
+    file_path: Optional[str] = None,
+    run_io: Optional[IORunner] = None
+) -> Response:
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": file_etag(file),
+        "Last-Modified": file_last_modified(file),
+        "Content-Disposition": content_disposition(file.original_filename)
+    }
+
+    ranges = None
+    range_header = request.headers.get("range")
+    if range_header and file.size > 0:
+        if_range = request.headers.get("if-range")
+        if not if_range or _if_range_matches(if_range, file):
+            ranges = parse_range_header(range_header, file.size)
+
+    if ranges == []:
+        headers["Content-Range"] = f"bytes */{file.size}"
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    if not ranges:
+        headers["Content-Length"] = str(file.size)
+        if file_path and run_io:
+            return SendfileResponse(
+                file_path, 0, file.size, True, run_io, headers=headers, media_type=file.content_type
+            )
+        content = await _open_or_404(open_range, 0, None)
+        return StreamingResponse(content=content, media_type=file.content_type, headers=headers)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{file.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        if file_path and run_io:
+            return SendfileResponse(
+                file_path,
+                start,
+                end - start + 1,
+                False,
+                run_io,
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                headers=headers,
+                media_type=file.content_type
+            )
+        content = await _open_or_404(open_range, start, end - start + 1)
+        return StreamingResponse(
+            content=content,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=file.content_type,
+            headers=headers
+        )
+
+    boundary = uuid.uuid4().hex
+    part_headers = [
+        (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {file.content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{file.size}\r\n\r\n"
+        ).encode("latin-1")
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    headers["Content-Length"] = str(
+        sum(len(part) for part in part_headers)
+        + sum(end - start + 1 for start, end in ranges)
+        + len(closing)
+    )
+    first_content = await _open_or_404(open_range, ranges[0][0], ranges[0][1] - ranges[0][0] + 1)
+
+    async def multipart_body() -> AsyncIterator[bytes]:
+        content = first_content
+        for index, (start, end) in enumerate(ranges):
+            if index:
+                content = await open_range(start, end - start + 1)
+                if content is None:
+                    return
+            yield part_headers[index]
+            async for chunk in content:
+                yield chunk
+        yield closing
+
+    return StreamingResponse(
+        content=multipart_body(),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers
+    )
+
+
+async def _open_or_404(open_range: RangeOpener, start: int, length: Optional[int]) -> AsyncIterator[bytes]:
+    content = await open_range(start, length)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File content not found"
+        )
+    return content
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional, List
 from datetime import datetime
+from domain.entities import File, Folder
+from domain.use_cases import MAX_UPLOAD_CHUNKS
 
 class FileResponse(BaseModel):
     id: str
@@ -8,6 +10,7 @@ class FileResponse(BaseModel):
     original_filename: str
     content_type: str
     size: int
+    checksum: Optional[str] = None
     owner_id: str
     parent_folder_id: Optional[str] = None
     shared_with: List[str] = []
@@ -17,6 +20,28 @@ class FileResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class UploadSessionRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = "application/octet-stream"
+    folder_id: Optional[str] = None
+    total_chunks: Optional[int] = Field(None, ge=1, le=MAX_UPLOAD_CHUNKS)
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    content_type: str
+    parent_folder_id: Optional[str] = None
+    total_chunks: Optional[int] = None
+    received_chunks: List[int] = []
+    status: str
+    expires_at: datetime
+    created_at: datetime
+
+class BulkUploadItemResponse(BaseModel):
+    original_filename: str
+    file: Optional[FileResponse] = None
+    error: Optional[str] = None
+
 class ShareFileRequest(BaseModel):
     user_id: str
 
@@ -31,6 +56,13 @@ class FolderRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     parent_folder_id: Optional[str] = None
 
+class MoveFolderRequest(BaseModel):
+    parent_folder_id: Optional[str] = None
+
+class FolderUsageResponse(BaseModel):
+    files: int
+    size: int
+
 class FolderResponse(BaseModel):
     id: str
     name: str
@@ -40,6 +72,17 @@ class FolderResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class FolderContentsResponse(BaseModel):
+    folder: Optional[FolderResponse] = None
+    ancestors: List[FolderResponse] = []
+    folders: List[FolderResponse] = []
+    files: List[FileResponse] = []
+    folder_count: int
+    file_count: int
+    total_size: int
+    next_folders_cursor: Optional[str] = None
+    next_files_cursor: Optional[str] = None
+
 class UserRegistrationRequest(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
     email: EmailStr
@@ -57,4 +100,42 @@ class UserResponse(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
-    token_type: str = "bearer"
\ No newline at end of file
+    token_type: str = "bearer"
+
+
+def _object_id(value) -> Optional[str]:
+    return str(value) if value else None
+
+# Response field -> getter; a projected entity only carries the attributes that were requested.
+FILE_FIELDS = {
+    "id": lambda file: str(file.id),
+    "filename": lambda file: file.filename,
+    "original_filename": lambda file: file.original_filename,
+    "content_type": lambda file: file.content_type,
+    "size": lambda file: file.size,
+    "checksum": lambda file: file.checksum,
+    "owner_id": lambda file: str(file.owner_id),
+    "parent_folder_id": lambda file: _object_id(file.parent_folder_id),
+    "shared_with": lambda file: [str(user_id) for user_id in file.shared_with],
+    "is_public": lambda file: file.is_public,
+    "public_link": lambda file: file.public_link,
+    "public_link_expiry": lambda file: file.public_link_expiry,
+    "created_at": lambda file: file.created_at,
+    "updated_at": lambda file: file.updated_at
+}
+
+FOLDER_FIELDS = {
+    "id": lambda folder: str(folder.id),
+    "name": lambda folder: folder.name,
+    "owner_id": lambda folder: str(folder.owner_id),
+    "parent_folder_id": lambda folder: _object_id(folder.parent_folder_id),
+    "shared_with": lambda folder: [str(user_id) for user_id in folder.shared_with],
+    "created_at": lambda folder: folder.created_at,
+    "updated_at": lambda folder: folder.updated_at
+}
+
+def serialize_file(file: File, fields: Optional[List[str]] = None) -> dict:
+    return {field: FILE_FIELDS[field](file) for field in (fields or FILE_FIELDS)}
+
+def serialize_folder(folder: Folder, fields: Optional[List[str]] = None) -> dict:
+    return {field: FOLDER_FIELDS[field](folder) for field in (fields or FOLDER_FIELDS)}
@@ -1,9 +1,70 @@
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 from fastapi import FastAPI
 from interfaces.api import router as api_router
-from dependencies import MONGODB_URL, MONGODB_DB_NAME, STORAGE_PATH, SECRET_KEY
+from dependencies import (
+    MONGODB_URL,
+    MONGODB_DB_NAME,
+    MONGODB_ENSURE_INDEXES,
+    STORAGE_PATH,
+    SECRET_KEY,
+    UPLOAD_SESSION_GC_INTERVAL,
+    get_cache_registry,
+    get_index_bootstrap,
+    get_io_executor,
+    get_password_hasher,
+    get_purge_worker,
+    get_user_repository,
+    get_folder_repository,
+    get_file_repository,
+    get_file_storage_repository,
+    get_file_use_cases,
+    get_upload_session_repository,
+    get_upload_session_use_cases
+)
+from infrastructure.background import run_periodically
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="File Storage API")
+logger = logging.getLogger(__name__)
+
+async def purge_expired_upload_sessions():
+    file_storage_repository = get_file_storage_repository()
+    upload_session_use_cases = get_upload_session_use_cases(
+        get_upload_session_repository(),
+        file_storage_repository,
+        get_file_use_cases(get_file_repository(), file_storage_repository, get_folder_repository())
+    )
+    purged = await upload_session_use_cases.purge_expired_sessions()
+    if purged:
+        logger.info("Purged %d expired upload sessions", purged)
+
+async def bootstrap_indexes():
+    await get_index_bootstrap().run([
+        get_user_repository(),
+        get_folder_repository(),
+        get_file_repository(),
+        get_upload_session_repository()
+    ])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = [
+        asyncio.create_task(run_periodically(
+            UPLOAD_SESSION_GC_INTERVAL, purge_expired_upload_sessions, "upload-session-gc"
+        )),
+        asyncio.create_task(get_purge_worker().run()),
+        asyncio.create_task(get_cache_registry().channel.listen())
+    ]
+    if MONGODB_ENSURE_INDEXES:
+        background_tasks.append(asyncio.create_task(bootstrap_indexes()))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    get_password_hasher().shutdown()
+
+app = FastAPI(title="File Storage API", lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -19,6 +80,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router)
@@ -27,6 +89,16 @@ app.include_router(api_router)
 def read_root():
     return {"message": "Welcome to File Storage API"}
 
+@app.get("/metrics")
+def read_metrics():
+    return {
+        "storage_io": get_io_executor().stats(),
+        "indexes": get_index_bootstrap().stats(),
+        "purge": get_purge_worker().stats(),
+        "metadata_cache": get_cache_registry().stats(),
+        "password_hasher": get_password_hasher().stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
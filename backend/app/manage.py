@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+from datetime import timedelta
+from dependencies import get_database, get_file_repository, get_file_storage_repository
+from infrastructure.database.migrations import backfill_ancestors
+from infrastructure.reconciler import MODES, MODE_REPORT, StorageReconciler
+
+
+async def migrate_storage_layout(args: argparse.Namespace) -> None:
+    storage_repository = get_file_storage_repository()
+    moved = await storage_repository.migrate_layout()
+    print(f"Moved {moved} files into the sharded layout")
+
+
+async def backfill_folder_ancestors(args: argparse.Namespace) -> None:
+    folders_updated, files_updated = await backfill_ancestors(get_database())
+    print(f"Backfilled ancestors on {folders_updated} folders and {files_updated} files")
+
+
+async def reconcile_storage(args: argparse.Namespace) -> None:
+    reconciler = StorageReconciler(
+        get_file_repository(),
+        get_file_storage_repository(),
+        get_database()["reconcile_checkpoints"],
+        mode=args.mode,
+        grace_period=timedelta(hours=args.grace_hours)
+    )
+    stats = await reconciler.run(max_entries=args.max_entries, restart=args.restart)
+    for name, value in stats.items():
+        print(f"{name}: {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="File Storage maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate-storage-layout",
+        help="Move flat storage files into the STORAGE_FANOUT_LEVELS directory layout"
+    )
+    migrate_parser.set_defaults(handler=migrate_storage_layout)
+
+    backfill_parser = subparsers.add_parser(
+        "backfill-ancestors",
+        help="Populate the ancestors path on folders and files created before it existed"
+    )
+    backfill_parser.set_defaults(handler=backfill_folder_ancestors)
+
+    reconcile_parser = subparsers.add_parser(
+        "reconcile-storage",
+        help="Find orphan blobs and file records without a blob, resuming from the last checkpoint"
+    )
+    reconcile_parser.add_argument("--mode", choices=MODES, default=MODE_REPORT)
+    reconcile_parser.add_argument("--max-entries", type=int, default=None)
+    reconcile_parser.add_argument("--grace-hours", type=float, default=6)
+    reconcile_parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    reconcile_parser.set_defaults(handler=reconcile_storage)
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
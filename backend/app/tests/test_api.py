@@ -5,10 +5,17 @@ from datetime import datetime, timedelta
 from bson import ObjectId
 import jwt
 import io
+import json
+import zipfile
 
 from main import app
-from domain.entities import User, File, Folder
+from dependencies import get_file_use_cases, get_folder_use_cases, get_io_executor, get_user_use_cases
+from infrastructure.io_executor import BoundedIOExecutor
+from interfaces.api import get_current_user
+from interfaces.pagination import encode_cursor
+from domain.entities import User, File, Folder, FolderContents
 from domain.use_cases import UserUseCases, FileUseCases, FolderUseCases
+from domain.password_hasher import PasswordHasherBusy
 
 # Создаем функцию для мока аутентификации
 async def mock_get_current_user():
@@ -56,6 +63,24 @@ def current_user():
         password_hash="hashed_password"
     )
 
+@pytest.fixture
+def override_dependencies(current_user):
+    """Подменяет зависимости приложения на время теста, запросы идут от current_user"""
+    overridden = set()
+
+    def provide(value):
+        # Без параметров: FastAPI принял бы их за параметры запроса
+        return lambda: value
+
+    def override(overrides):
+        for dependency, value in {get_current_user: current_user, **overrides}.items():
+            app.dependency_overrides[dependency] = provide(value)
+            overridden.add(dependency)
+
+    yield override
+    for dependency in overridden:
+        app.dependency_overrides.pop(dependency, None)
+
 # Тесты для эндпоинтов аутентификации
 class TestAuthEndpoints:
     def test_register_success(self, client):
@@ -138,6 +163,18 @@ class TestAuthEndpoints:
             assert data["email"] == current_user.email
             assert data["id"] == str(current_user.id)
 
+    def test_login_rejected_while_hasher_is_saturated(self, client, override_dependencies):
+        user_use_cases = AsyncMock()
+        user_use_cases.authenticate_user.side_effect = PasswordHasherBusy("Too many password checks in progress")
+        override_dependencies({get_user_use_cases: user_use_cases})
+        response = client.post(
+            "/api/auth/login",
+            data={"username": "test@example.com", "password": "password123"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
 # Тесты для эндпоинтов файлов
 class TestFileEndpoints:
     def test_upload_file(self, client, current_user):
@@ -420,3 +457,478 @@ class TestFolderEndpoints:
                     "507f1f77bcf86cd799439031", 
                     str(ObjectId("507f1f77bcf86cd799439011"))
                 )
+
+# Тесты для частичной загрузки файлов (Range)
+class TestFileDownloadRanges:
+    content = b"0123456789abcdefghij"
+
+    @pytest.fixture
+    def stored_file(self):
+        return File(
+            id=ObjectId("507f1f77bcf86cd799439021"),
+            filename="uuid_test.txt",
+            original_filename="test.txt",
+            content_type="text/plain",
+            size=len(self.content),
+            checksum="abc123",
+            owner_id=ObjectId("507f1f77bcf86cd799439011")
+        )
+
+    @pytest.fixture
+    def file_use_cases_mock(self, stored_file):
+        async def read_file(file, start=0, length=None):
+            end = len(self.content) if length is None else start + length
+
+            async def chunks():
+                yield self.content[start:end]
+            return chunks()
+
+        use_cases = MagicMock()
+        use_cases.get_file = AsyncMock(return_value=stored_file)
+        use_cases.read_file = AsyncMock(side_effect=read_file)
+        return use_cases
+
+    @pytest.fixture
+    def range_client(self, client, file_use_cases_mock, override_dependencies):
+        override_dependencies({get_file_use_cases: file_use_cases_mock})
+        return client
+
+    def test_metadata_lookup_does_not_open_blob(self, range_client, file_use_cases_mock):
+        response = range_client.get("/api/files/507f1f77bcf86cd799439021")
+
+        assert response.status_code == 200
+        assert response.json()["checksum"] == "abc123"
+        file_use_cases_mock.get_file.assert_awaited_once_with(
+            "507f1f77bcf86cd799439021", "507f1f77bcf86cd799439011"
+        )
+        file_use_cases_mock.read_file.assert_not_awaited()
+
+    def test_full_download_advertises_ranges(self, range_client):
+        response = range_client.get("/api/files/507f1f77bcf86cd799439021/download")
+
+        assert response.status_code == 200
+        assert response.content == self.content
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"] == '"abc123"'
+
+    def test_single_range(self, range_client):
+        response = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=5-9"}
+        )
+
+        assert response.status_code == 206
+        assert response.content == b"56789"
+        assert response.headers["content-range"] == "bytes 5-9/20"
+        assert response.headers["content-length"] == "5"
+
+    def test_suffix_range(self, range_client):
+        response = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=-3"}
+        )
+
+        assert response.status_code == 206
+        assert response.content == b"hij"
+
+    def test_multiple_ranges(self, range_client):
+        response = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=0-1,10-11"}
+        )
+
+        assert response.status_code == 206
+        assert response.headers["content-type"].startswith("multipart/byteranges; boundary=")
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert b"Content-Range: bytes 0-1/20\r\n\r\n01" in response.content
+        assert b"Content-Range: bytes 10-11/20\r\n\r\nab" in response.content
+
+    def test_unsatisfiable_range(self, range_client):
+        response = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=100-200"}
+        )
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */20"
+
+    def test_if_range_mismatch_returns_full_file(self, range_client):
+        response = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=5-9", "If-Range": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert response.content == self.content
+
+    def test_if_range_match_returns_partial(self, range_client):
+        response = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=5-9", "If-Range": '"abc123"'}
+        )
+
+        assert response.status_code == 206
+        assert response.content == b"56789"
+
+    def test_local_file_is_served_from_path(self, range_client, file_use_cases_mock, override_dependencies, tmp_path, monkeypatch):
+        file_path = tmp_path / "uuid_test.txt"
+        file_path.write_bytes(self.content)
+        file_use_cases_mock.get_file_path = AsyncMock(return_value=str(file_path))
+        monkeypatch.setattr("interfaces.api.SENDFILE_MIN_SIZE", 0)
+        io_executor = BoundedIOExecutor(max_workers=2)
+        override_dependencies({get_io_executor: io_executor})
+
+        full = range_client.get("/api/files/507f1f77bcf86cd799439021/download")
+        partial = range_client.get(
+            "/api/files/507f1f77bcf86cd799439021/download",
+            headers={"Range": "bytes=2-4"}
+        )
+        io_executor.shutdown()
+
+        assert full.status_code == 200
+        assert full.content == self.content
+        assert partial.status_code == 206
+        assert partial.content == b"234"
+        file_use_cases_mock.read_file.assert_not_awaited()
+        # open, pread and close for each response
+        assert io_executor.stats()["completed"] >= 6
+
+# Тесты для потоковой загрузки файлов
+class TestStreamUpload:
+    @pytest.fixture
+    def file_use_cases_mock(self):
+        received = {}
+
+        async def create_file_from_stream(chunks, original_filename, content_type, owner_id, parent_folder_id=None):
+            received["content"] = b"".join([chunk async for chunk in chunks])
+            return File(
+                id=ObjectId("507f1f77bcf86cd799439021"),
+                filename="uuid_test.bin",
+                original_filename=original_filename,
+                content_type=content_type,
+                size=len(received["content"]),
+                owner_id=ObjectId(owner_id),
+                parent_folder_id=ObjectId(parent_folder_id) if parent_folder_id else None
+            )
+
+        use_cases = MagicMock()
+        use_cases.received = received
+        use_cases.create_file_from_stream = AsyncMock(side_effect=create_file_from_stream)
+        return use_cases
+
+    @pytest.fixture
+    def stream_client(self, client, file_use_cases_mock, override_dependencies):
+        override_dependencies({get_file_use_cases: file_use_cases_mock})
+        return client
+
+    def test_upload_raw_body(self, stream_client, file_use_cases_mock):
+        response = stream_client.post(
+            "/api/files/stream",
+            params={"filename": "test.bin", "folder_id": "507f1f77bcf86cd799439031"},
+            content=b"raw file content",
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["original_filename"] == "test.bin"
+        assert data["size"] == len(b"raw file content")
+        assert data["parent_folder_id"] == "507f1f77bcf86cd799439031"
+        assert file_use_cases_mock.received["content"] == b"raw file content"
+
+    def test_upload_into_foreign_folder(self, stream_client, file_use_cases_mock):
+        file_use_cases_mock.create_file_from_stream.side_effect = ValueError("Parent folder not found")
+
+        response = stream_client.post(
+            "/api/files/stream",
+            params={"filename": "test.bin", "folder_id": "507f1f77bcf86cd799439031"},
+            content=b"data"
+        )
+
+        assert response.status_code == 400
+
+    def test_upload_requires_filename(self, stream_client):
+        response = stream_client.post("/api/files/stream", content=b"data")
+
+        assert response.status_code == 422
+
+
+class TestBulkUpload:
+    @pytest.fixture
+    def file_use_cases_mock(self):
+        async def upload_files(upload_files, owner_id, parent_folder_id=None, concurrency=8):
+            return [
+                (
+                    File(
+                        id=ObjectId("507f1f77bcf86cd799439021"),
+                        filename="uuid_a.txt",
+                        original_filename="a.txt",
+                        content_type="text/plain",
+                        size=1,
+                        owner_id=ObjectId(owner_id)
+                    ),
+                    None
+                ),
+                (None, "Failed to store file")
+            ]
+
+        use_cases = MagicMock()
+        use_cases.upload_files = AsyncMock(side_effect=upload_files)
+        return use_cases
+
+    @pytest.fixture
+    def bulk_client(self, client, file_use_cases_mock, override_dependencies):
+        override_dependencies({get_file_use_cases: file_use_cases_mock})
+        return client
+
+    def test_upload_reports_each_file(self, bulk_client, file_use_cases_mock):
+        response = bulk_client.post(
+            "/api/files/bulk",
+            files=[
+                ("files", ("a.txt", b"a", "text/plain")),
+                ("files", ("b.txt", b"b", "text/plain"))
+            ]
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["original_filename"] == "a.txt"
+        assert data[0]["file"]["id"] == "507f1f77bcf86cd799439021"
+        assert data[0]["error"] is None
+        assert data[1] == {"original_filename": "b.txt", "file": None, "error": "Failed to store file"}
+        assert len(file_use_cases_mock.upload_files.await_args.kwargs["upload_files"]) == 2
+
+
+class TestFolderArchive:
+    @pytest.fixture
+    def archive_client(self, client, current_user, override_dependencies):
+        folder = Folder(id=ObjectId("507f1f77bcf86cd799439031"), name='Документы "2024"', owner_id=current_user.id)
+        files = [
+            File(
+                filename="uuid_notes.txt",
+                original_filename="notes.txt",
+                content_type="text/plain",
+                size=11,
+                owner_id=current_user.id
+            ),
+            File(
+                filename="uuid_photo.jpg",
+                original_filename="photo.jpg",
+                content_type="image/jpeg",
+                size=5,
+                owner_id=current_user.id
+            )
+        ]
+        contents = {"uuid_notes.txt": b"hello notes", "uuid_photo.jpg": b"\xff\xd8jpg"}
+
+        async def walk_folder(folder, user_id):
+            yield "Docs", None
+            for file in files:
+                yield f"Docs/{file.original_filename}", file
+
+        async def read_file(file, start, length):
+            async def chunks():
+                yield contents[file.filename]
+            return chunks()
+
+        folder_use_cases = MagicMock()
+        folder_use_cases.get_folder = AsyncMock(side_effect=lambda folder_id, user_id: folder if folder_id == str(folder.id) else None)
+        folder_use_cases.walk_folder = walk_folder
+        file_use_cases = MagicMock()
+        file_use_cases.read_file = AsyncMock(side_effect=read_file)
+        override_dependencies({get_file_use_cases: file_use_cases, get_folder_use_cases: folder_use_cases})
+        return client
+
+    def test_streams_zip(self, archive_client):
+        response = archive_client.get("/api/folders/507f1f77bcf86cd799439031/archive")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert response.headers["content-disposition"] == (
+            "attachment; filename=\"_________ _2024_.zip\"; "
+            "filename*=UTF-8''%D0%94%D0%BE%D0%BA%D1%83%D0%BC%D0%B5%D0%BD%D1%82%D1%8B%20%222024%22.zip"
+        )
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == ["Docs/", "Docs/notes.txt", "Docs/photo.jpg"]
+            assert archive.read("Docs/notes.txt") == b"hello notes"
+            assert archive.getinfo("Docs/notes.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert archive.getinfo("Docs/photo.jpg").compress_type == zipfile.ZIP_STORED
+            assert archive.testzip() is None
+
+    def test_unknown_folder(self, archive_client):
+        response = archive_client.get("/api/folders/507f1f77bcf86cd799439099/archive")
+
+        assert response.status_code == 404
+
+
+class TestListPagination:
+    @pytest.fixture
+    def files(self, current_user):
+        return [
+            File(
+                id=ObjectId(f"507f1f77bcf86cd7994390{index:02d}"),
+                filename=f"uuid_{index}.txt",
+                original_filename=f"{index}.txt",
+                content_type="text/plain",
+                size=1,
+                owner_id=current_user.id
+            )
+            for index in range(3)
+        ]
+
+    @pytest.fixture
+    def file_use_cases_mock(self, files):
+        use_cases = MagicMock()
+        use_cases.list_files = AsyncMock(side_effect=lambda owner_id, folder_id, limit, after_id, fields: files[:limit])
+        return use_cases
+
+    @pytest.fixture
+    def list_client(self, client, file_use_cases_mock, override_dependencies):
+        override_dependencies({get_file_use_cases: file_use_cases_mock})
+        return client
+
+    def test_page_sets_next_cursor(self, list_client, file_use_cases_mock, files):
+        response = list_client.get("/api/files/", params={"limit": 2})
+
+        assert response.status_code == 200
+        assert [file["id"] for file in response.json()] == [str(files[0].id), str(files[1].id)]
+        cursor = response.headers["X-Next-Cursor"]
+        assert file_use_cases_mock.list_files.await_args.kwargs["limit"] == 3
+
+        list_client.get("/api/files/", params={"limit": 2, "cursor": cursor})
+        assert file_use_cases_mock.list_files.await_args.kwargs["after_id"] == str(files[1].id)
+
+    def test_last_page_has_no_cursor(self, list_client):
+        response = list_client.get("/api/files/", params={"limit": 5})
+
+        assert len(response.json()) == 3
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, list_client):
+        response = list_client.get("/api/files/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_fields_trim_the_response(self, list_client, file_use_cases_mock):
+        response = list_client.get("/api/files/", params={"fields": "original_filename,size"})
+
+        assert response.status_code == 200
+        assert response.json()[0] == {"id": "507f1f77bcf86cd799439000", "original_filename": "0.txt", "size": 1}
+        assert file_use_cases_mock.list_files.await_args.kwargs["fields"] == ["id", "original_filename", "size"]
+
+    def test_unknown_field(self, list_client):
+        response = list_client.get("/api/files/", params={"fields": "password_hash"})
+
+        assert response.status_code == 400
+
+    def test_limit_is_bounded(self, list_client):
+        response = list_client.get("/api/files/", params={"limit": 100000})
+
+        assert response.status_code == 422
+
+class TestExport:
+    @pytest.fixture
+    def files(self, current_user):
+        return [
+            File(
+                id=ObjectId(f"507f1f77bcf86cd7994390{index:02d}"),
+                filename=f"uuid_{index}.txt",
+                original_filename=f"{index}.txt",
+                content_type="text/plain",
+                size=index,
+                owner_id=current_user.id
+            )
+            for index in range(3)
+        ]
+
+    @pytest.fixture
+    def file_use_cases_mock(self, files):
+        async def iter_files(owner_id, folder_id, after_id, fields):
+            for file in files:
+                yield file
+
+        use_cases = MagicMock()
+        use_cases.iter_files = MagicMock(side_effect=iter_files)
+        return use_cases
+
+    @pytest.fixture
+    def export_client(self, client, file_use_cases_mock, override_dependencies):
+        override_dependencies({get_file_use_cases: file_use_cases_mock})
+        return client
+
+    def test_streams_one_object_per_line(self, export_client, file_use_cases_mock, files):
+        response = export_client.get("/api/files/export", params={"fields": "size"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": str(file.id), "size": file.size} for file in files]
+        assert file_use_cases_mock.iter_files.call_args.kwargs["fields"] == ["id", "size"]
+
+    def test_resumes_after_cursor(self, export_client, file_use_cases_mock, files):
+        cursor = encode_cursor(files[0].id)
+
+        export_client.get("/api/files/export", params={"cursor": cursor})
+
+        assert file_use_cases_mock.iter_files.call_args.kwargs["after_id"] == str(files[0].id)
+
+    def test_unknown_field(self, export_client):
+        response = export_client.get("/api/files/export", params={"fields": "password_hash"})
+
+        assert response.status_code == 400
+
+class TestFolderContents:
+    @pytest.fixture
+    def contents(self, current_user):
+        return FolderContents(
+            folders=[
+                Folder(id=ObjectId(f"507f1f77bcf86cd7994390{index:02d}"), name=f"folder {index}", owner_id=current_user.id)
+                for index in range(3)
+            ],
+            files=[
+                File(
+                    id=ObjectId("507f1f77bcf86cd799439051"),
+                    filename="uuid_a.txt",
+                    original_filename="a.txt",
+                    content_type="text/plain",
+                    size=5,
+                    owner_id=current_user.id
+                )
+            ],
+            folder_count=3,
+            file_count=1,
+            total_size=5
+        )
+
+    @pytest.fixture
+    def contents_client(self, client, contents, override_dependencies):
+        folder_use_cases = MagicMock()
+        folder_use_cases.get_folder_contents = AsyncMock(return_value=contents)
+        override_dependencies({get_folder_use_cases: folder_use_cases})
+        return client, folder_use_cases
+
+    def test_root_contents_are_paginated_per_list(self, contents_client, contents):
+        client, folder_use_cases = contents_client
+
+        response = client.get("/api/folders/contents", params={"limit": 2})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["folder"] is None
+        assert [folder["name"] for folder in data["folders"]] == ["folder 0", "folder 1"]
+        assert [file["original_filename"] for file in data["files"]] == ["a.txt"]
+        assert (data["folder_count"], data["file_count"], data["total_size"]) == (3, 1, 5)
+        assert data["next_folders_cursor"]
+        assert data["next_files_cursor"] is None
+        assert folder_use_cases.get_folder_contents.await_args.kwargs["limit"] == 3
+
+        client.get("/api/folders/contents", params={"limit": 2, "folders_cursor": data["next_folders_cursor"]})
+        assert folder_use_cases.get_folder_contents.await_args.kwargs["folders_after_id"] == str(contents.folders[1].id)
+
+    def test_missing_folder(self, contents_client):
+        client, folder_use_cases = contents_client
+        folder_use_cases.get_folder_contents.return_value = None
+
+        response = client.get("/api/folders/contents", params={"folder_id": "507f1f77bcf86cd799439099"})
+
+        assert response.status_code == 404
@@ -0,0 +1,151 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from bson import ObjectId
+from domain.entities import File
+from infrastructure.cache import CacheRegistry, LocalInvalidationChannel, TTLCache
+from infrastructure.database.cached_repositories import (
+    CachedFileRepository,
+    CachedFolderRepository,
+    CachedUserRepository
+)
+
+FILE_ID = "507f1f77bcf86cd799439011"
+
+def make_file():
+    return File(
+        id=ObjectId(FILE_ID),
+        filename="uuid_test.txt",
+        original_filename="test.txt",
+        content_type="text/plain",
+        size=4,
+        owner_id=ObjectId("507f1f77bcf86cd799439012")
+    )
+
+class TestTTLCache:
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+    
+    def test_entries_expire(self):
+        cache = TTLCache(max_entries=2, ttl=10)
+        with patch("infrastructure.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("infrastructure.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+    
+    def test_set_from_stale_generation_is_dropped(self):
+        cache = TTLCache()
+        generation = cache.generation
+        cache.invalidate("a")
+        cache.set("a", 1, generation)
+
+        assert cache.get("a") is None
+
+class TestCachedRepositories:
+    @pytest.fixture
+    def registry(self):
+        return CacheRegistry(LocalInvalidationChannel(), max_entries=10, ttl=60)
+    
+    @pytest.fixture
+    def file_repository_mock(self):
+        return Mock(
+            get_by_id=AsyncMock(return_value=make_file()),
+            update=AsyncMock(return_value=make_file()),
+            trash=AsyncMock(return_value=True),
+            trash_by_ancestor=AsyncMock(return_value=1),
+            collection=Mock(name="files")
+        )
+    
+    @pytest.mark.asyncio
+    async def test_get_by_id_reads_through(self, registry, file_repository_mock):
+        repository = CachedFileRepository(file_repository_mock, registry)
+
+        first = await repository.get_by_id(FILE_ID)
+        second = await repository.get_by_id(FILE_ID)
+
+        assert first is second
+        file_repository_mock.get_by_id.assert_awaited_once_with(FILE_ID)
+        assert repository.collection is file_repository_mock.collection
+    
+    @pytest.mark.asyncio
+    async def test_missing_entities_are_not_cached(self, registry, file_repository_mock):
+        file_repository_mock.get_by_id.return_value = None
+        repository = CachedFileRepository(file_repository_mock, registry)
+
+        assert await repository.get_by_id(FILE_ID) is None
+        assert await repository.get_by_id(FILE_ID) is None
+        assert file_repository_mock.get_by_id.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_update_invalidates_entry(self, registry, file_repository_mock):
+        repository = CachedFileRepository(file_repository_mock, registry)
+        await repository.get_by_id(FILE_ID)
+
+        await repository.update(FILE_ID, {"original_filename": "renamed.txt"})
+        await repository.get_by_id(FILE_ID)
+
+        assert file_repository_mock.get_by_id.await_count == 2
+        assert registry.stats()["files"]["invalidations"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_uppercase_id_shares_entry(self, registry, file_repository_mock):
+        repository = CachedFileRepository(file_repository_mock, registry)
+        await repository.get_by_id(FILE_ID.upper())
+        await repository.get_by_id(FILE_ID)
+
+        await repository.trash(FILE_ID, "507f1f77bcf86cd799439012")
+        await repository.get_by_id(FILE_ID.upper())
+
+        assert file_repository_mock.get_by_id.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_subtree_writes_clear_namespace(self, registry, file_repository_mock):
+        repository = CachedFileRepository(file_repository_mock, registry)
+        await repository.get_by_id(FILE_ID)
+
+        await repository.trash_by_ancestor("507f1f77bcf86cd799439013")
+
+        assert registry.stats()["files"]["size"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_channel_messages_reach_other_namespaces(self, registry):
+        folder_repository_mock = Mock(get_by_id=AsyncMock(return_value=Mock()), move=AsyncMock())
+        repository = CachedFolderRepository(folder_repository_mock, registry)
+        await repository.get_by_id("507f1f77bcf86cd799439013")
+
+        registry.channel._notify("folders", "507f1f77bcf86cd799439013")
+        await repository.get_by_id("507f1f77bcf86cd799439013")
+
+        assert folder_repository_mock.get_by_id.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_user_lookups_by_id_are_cached_until_update(self, registry):
+        user_repository_mock = Mock(
+            get_by_id=AsyncMock(return_value=Mock()),
+            get_by_email=AsyncMock(return_value=Mock()),
+            update=AsyncMock()
+        )
+        repository = CachedUserRepository(user_repository_mock, registry, ttl=5)
+
+        await repository.get_by_id("507f1f77bcf86cd799439012")
+        await repository.get_by_id("507f1f77bcf86cd799439012")
+        await repository.get_by_email("test@example.com")
+        await repository.get_by_email("test@example.com")
+        await repository.get_by_id("507F1F77BCF86CD799439012")
+        await repository.update("507f1f77bcf86cd799439012", {"username": "renamed"})
+        await repository.get_by_id("507F1F77BCF86CD799439012")
+
+        assert user_repository_mock.get_by_id.await_count == 2
+        assert user_repository_mock.get_by_email.await_count == 2
+        assert registry.stats()["users"]["ttl"] == 5
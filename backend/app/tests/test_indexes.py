@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from infrastructure.database.indexes import IndexBootstrap
+from infrastructure.database.mongodb import MongoDBFileRepository, MongoDBUserRepository
+
+def make_collection(name, existing, winning_plan):
+    collection = Mock()
+    collection.name = name
+    collection.index_information = AsyncMock(return_value=existing)
+    collection.create_indexes = AsyncMock()
+    collection.drop_index = AsyncMock()
+    collection.find = Mock(return_value=Mock(
+        explain=AsyncMock(return_value={"queryPlanner": {"winningPlan": winning_plan}})
+    ))
+    return collection
+
+class TestIndexBootstrap:
+    @pytest.mark.asyncio
+    async def test_creates_missing_indexes(self):
+        collection = make_collection(
+            "files",
+            {"_id_": {"key": [("_id", 1)]}},
+            {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}
+        )
+        bootstrap = IndexBootstrap()
+
+        await bootstrap.run([MongoDBFileRepository(collection)])
+
+        created = [index.document["name"] for index in collection.create_indexes.await_args.args[0]]
+        assert created == [index.document["name"] for index in MongoDBFileRepository.INDEXES]
+        collection.drop_index.assert_not_awaited()
+        stats = bootstrap.stats()["files"]
+        assert stats["status"] == "ready"
+        assert stats["collection_scans"] == []
+    
+    @pytest.mark.asyncio
+    async def test_keeps_matching_and_rebuilds_drifted_indexes(self):
+        collection = make_collection(
+            "users",
+            {
+                "_id_": {"key": [("_id", 1)]},
+                "email_unique": {"key": [("email", 1)], "unique": True},
+                "username_1": {"key": [("username", 1)]}
+            },
+            {"stage": "COLLSCAN"}
+        )
+        bootstrap = IndexBootstrap()
+
+        await bootstrap.run([MongoDBUserRepository(collection)])
+
+        collection.drop_index.assert_awaited_once_with("username_1")
+        created = [index.document["name"] for index in collection.create_indexes.await_args.args[0]]
+        assert created == ["username_unique"]
+        stats = bootstrap.stats()["users"]
+        assert stats["rebuilt"] == ["username_unique"]
+        assert stats["collection_scans"] == ["get_by_email", "get_by_username"]
+    
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self):
+        collection = make_collection("users", {}, {})
+        collection.index_information.side_effect = RuntimeError("unreachable")
+        bootstrap = IndexBootstrap()
+
+        await bootstrap.run([MongoDBUserRepository(collection)])
+
+        assert bootstrap.stats()["users"]["status"] == "failed"
+        assert bootstrap.stats()["users"]["error"] == "unreachable"
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import pytest
+from infrastructure.io_executor import BoundedIOExecutor
+
+class TestBoundedIOExecutor:
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        executor = BoundedIOExecutor(max_workers=2, max_pending=4)
+
+        assert await executor.run(sum, [1, 2, 3]) == 6
+        stats = executor.stats()
+        assert stats["completed"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["in_flight"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_queue_depth_is_bounded_by_workers(self):
+        executor = BoundedIOExecutor(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert stats["in_flight"] == 1
+        assert stats["queue_depth"] == 2
+        assert executor.stats()["completed"] == 3
+        assert executor.stats()["wait_time_max_ms"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_call_holds_its_slot_until_done(self):
+        executor = BoundedIOExecutor(max_workers=2, max_pending=1)
+        release = threading.Event()
+
+        running = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        waiting = asyncio.create_task(executor.run(sum, [1, 2]))
+        await asyncio.sleep(0.05)
+        started_early = waiting.done()
+        release.set()
+
+        assert await waiting == 3
+        assert not started_early
+        assert executor.stats()["completed"] == 2
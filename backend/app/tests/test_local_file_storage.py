@@ -0,0 +1,225 @@
+import hashlib
+import pytest
+from io import BytesIO
+from unittest.mock import AsyncMock, Mock
+from fastapi import UploadFile
+from pymongo.errors import DuplicateKeyError
+from infrastructure.database.local_file_storage_repository import LocalFileStorageRepository
+from infrastructure.database.content_addressable_file_storage_repository import ContentAddressableFileStorageRepository
+
+class TestLocalFileStorageRepository:
+    @pytest.fixture
+    def storage_repository(self, tmp_path):
+        return LocalFileStorageRepository(str(tmp_path), chunk_size=4)
+    
+    @pytest.mark.asyncio
+    async def test_save_streams_in_chunks(self, storage_repository, tmp_path):
+        content = b"test file content"
+        upload_file = UploadFile(filename="test.txt", file=BytesIO(content))
+        upload_file.file.seek(5)
+
+        result = await storage_repository.save(upload_file, "uuid_test.txt")
+
+        assert result.filename == "uuid_test.txt"
+        assert result.size == len(content)
+        assert result.checksum == hashlib.sha256(content).hexdigest()
+        assert (tmp_path / "uuid_test.txt").read_bytes() == content
+        assert list((tmp_path / ".tmp").iterdir()) == []
+    
+    @pytest.mark.asyncio
+    async def test_save_reads_bounded_chunks(self, storage_repository):
+        upload_file = UploadFile(filename="test.txt", file=BytesIO(b"0123456789"))
+        read_sizes = []
+        original_read = upload_file.read
+
+        async def tracking_read(size=-1):
+            read_sizes.append(size)
+            return await original_read(size)
+
+        upload_file.read = tracking_read
+        await storage_repository.save(upload_file, "uuid_test.txt")
+
+        assert read_sizes and all(size == 4 for size in read_sizes)
+    
+    @pytest.mark.asyncio
+    async def test_delete(self, storage_repository, tmp_path):
+        (tmp_path / "uuid_test.txt").write_bytes(b"data")
+
+        assert await storage_repository.delete("uuid_test.txt") is True
+        assert await storage_repository.delete("uuid_test.txt") is False
+    
+    @pytest.mark.asyncio
+    async def test_open_range(self, storage_repository, tmp_path):
+        (tmp_path / "uuid_test.txt").write_bytes(b"0123456789")
+
+        content = await storage_repository.open_range("uuid_test.txt", 3, 6)
+
+        assert b"".join([chunk async for chunk in content]) == b"345678"
+        assert await storage_repository.open_range("missing.txt") is None
+    
+    @pytest.mark.asyncio
+    async def test_parts_are_assembled_in_order(self, storage_repository, tmp_path):
+        async def chunks(data):
+            yield data
+
+        await storage_repository.save_part("session", 1, chunks(b"world"))
+        await storage_repository.save_part("session", 0, chunks(b"hello "))
+        result = await storage_repository.save_stream(storage_repository.iter_parts("session", 2), "uuid_test.txt")
+        await storage_repository.delete_parts("session")
+
+        assert (tmp_path / "uuid_test.txt").read_bytes() == b"hello world"
+        assert result.size == 11
+        assert not (tmp_path / ".uploads" / "session").exists()
+
+class TestShardedLocalFileStorageRepository:
+    @pytest.fixture
+    def storage_repository(self, tmp_path):
+        return LocalFileStorageRepository(str(tmp_path), chunk_size=4, fanout_levels=2)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("filename", ["6b8225c8_../../../../outside.txt", "..", "6b8225c8_a\0.txt"])
+    async def test_rejects_names_outside_storage(self, tmp_path, filename):
+        storage_path = tmp_path / "store"
+        storage_repository = LocalFileStorageRepository(str(storage_path), chunk_size=4, fanout_levels=2)
+        upload_file = UploadFile(filename="test.txt", file=BytesIO(b"data"))
+
+        with pytest.raises(ValueError):
+            await storage_repository.save(upload_file, filename)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["store"]
+        assert [path.name for path in storage_path.iterdir() if path.name != ".tmp"] == []
+    
+    @pytest.mark.asyncio
+    async def test_save_uses_hex_prefix_directories(self, storage_repository, tmp_path):
+        upload_file = UploadFile(filename="test.txt", file=BytesIO(b"data"))
+
+        await storage_repository.save(upload_file, "6b8225c8_test.txt")
+
+        assert (tmp_path / "6b" / "82" / "6b8225c8_test.txt").read_bytes() == b"data"
+        stored = await storage_repository.get("6b8225c8_test.txt")
+        assert stored.read() == b"data"
+        stored.close()
+    
+    @pytest.mark.asyncio
+    async def test_non_hex_names_stay_flat(self, storage_repository, tmp_path):
+        upload_file = UploadFile(filename="test.txt", file=BytesIO(b"data"))
+
+        await storage_repository.save(upload_file, "legacy.txt")
+
+        assert (tmp_path / "legacy.txt").exists()
+    
+    @pytest.mark.asyncio
+    async def test_migrate_layout_keeps_files_readable(self, storage_repository, tmp_path):
+        (tmp_path / "f4df2c6a_test.txt").write_bytes(b"data")
+        (tmp_path / "legacy.txt").write_bytes(b"legacy")
+
+        stored = await storage_repository.get("f4df2c6a_test.txt")
+        assert stored.read() == b"data"
+        stored.close()
+
+        assert await storage_repository.migrate_layout() == 1
+        assert (tmp_path / "f4" / "df" / "f4df2c6a_test.txt").exists()
+        assert (tmp_path / "legacy.txt").exists()
+        assert await storage_repository.delete("f4df2c6a_test.txt") is True
+    
+    @pytest.mark.asyncio
+    async def test_iter_blob_names_merges_flat_and_sharded_in_order(self, storage_repository, tmp_path):
+        for name in ("f4df2c6a_b.txt", "6b8225c8_a.txt", "legacy.txt", "0a000000_c.txt"):
+            await storage_repository.save(UploadFile(filename=name, file=BytesIO(b"data")), name)
+
+        names = [name async for name in storage_repository.iter_blob_names()]
+        resumed = [name async for name in storage_repository.iter_blob_names("6b8225c8_a.txt")]
+
+        assert names == ["0a000000_c.txt", "6b8225c8_a.txt", "f4df2c6a_b.txt", "legacy.txt"]
+        assert resumed == ["f4df2c6a_b.txt", "legacy.txt"]
+    
+    @pytest.mark.asyncio
+    async def test_quarantine_moves_blob_out_of_listing(self, storage_repository, tmp_path):
+        await storage_repository.save(UploadFile(filename="a.txt", file=BytesIO(b"data")), "6b8225c8_a.txt")
+
+        assert await storage_repository.quarantine("6b8225c8_a.txt") is True
+
+        assert (tmp_path / ".quarantine" / "6b8225c8_a.txt").read_bytes() == b"data"
+        assert [name async for name in storage_repository.iter_blob_names()] == []
+        assert await storage_repository.quarantine("6b8225c8_a.txt") is False
+
+class TestContentAddressableFileStorageRepository:
+    @pytest.fixture
+    def blob_collection_mock(self):
+        collection = AsyncMock()
+        collection.update_one = AsyncMock()
+        collection.find_one_and_update = AsyncMock()
+        collection.delete_one = AsyncMock()
+        collection.insert_one = AsyncMock()
+        return collection
+    
+    @pytest.fixture
+    def storage_repository(self, tmp_path, blob_collection_mock):
+        return ContentAddressableFileStorageRepository(str(tmp_path), blob_collection_mock, chunk_size=4)
+    
+    @pytest.mark.asyncio
+    async def test_save_deduplicates_by_content(self, storage_repository, blob_collection_mock, tmp_path):
+        content = b"same content"
+        digest = hashlib.sha256(content).hexdigest()
+
+        first = await storage_repository.save(UploadFile(filename="a.txt", file=BytesIO(content)), "uuid_a.txt", "file_a")
+        second = await storage_repository.save(UploadFile(filename="b.txt", file=BytesIO(content)), "uuid_b.txt", "file_b")
+
+        assert first.filename == second.filename == digest
+        assert (tmp_path / digest).read_bytes() == content
+        assert list((tmp_path / ".tmp").iterdir()) == []
+        assert blob_collection_mock.update_one.await_count == 2
+        assert blob_collection_mock.update_one.await_args.args[1]["$addToSet"] == {"refs": "file_b"}
+    
+    @pytest.mark.asyncio
+    async def test_delete_keeps_blob_while_referenced(self, storage_repository, blob_collection_mock, tmp_path):
+        (tmp_path / "digest").write_bytes(b"data")
+        blob_collection_mock.find_one_and_update.return_value = {"_id": "digest", "refs": ["file_b"]}
+
+        assert await storage_repository.delete("digest", "file_a") is True
+        assert blob_collection_mock.find_one_and_update.await_args.args[1] == {"$pull": {"refs": "file_a"}}
+        assert (tmp_path / "digest").exists()
+        blob_collection_mock.delete_one.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_last_reference(self, storage_repository, blob_collection_mock, tmp_path):
+        (tmp_path / "digest").write_bytes(b"data")
+        blob_collection_mock.find_one_and_update.return_value = {"_id": "digest", "refs": []}
+        blob_collection_mock.update_one.return_value = Mock(modified_count=1)
+
+        assert await storage_repository.delete("digest", "file_a") is True
+        assert not (tmp_path / "digest").exists()
+        claim = blob_collection_mock.update_one.await_args.args[1]["$set"]["deleting"]
+        blob_collection_mock.delete_one.assert_awaited_once_with({"_id": "digest", "deleting": claim})
+    
+    @pytest.mark.asyncio
+    async def test_delete_keeps_blob_when_claim_is_lost(self, storage_repository, blob_collection_mock, tmp_path):
+        (tmp_path / "digest").write_bytes(b"data")
+        blob_collection_mock.find_one_and_update.return_value = {"_id": "digest", "refs": []}
+        blob_collection_mock.update_one.return_value = Mock(modified_count=0)
+
+        assert await storage_repository.delete("digest", "file_a") is True
+        assert (tmp_path / "digest").exists()
+        blob_collection_mock.delete_one.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_delete_is_idempotent_once_blob_is_gone(self, storage_repository, blob_collection_mock, tmp_path):
+        (tmp_path / "digest").write_bytes(b"data")
+        blob_collection_mock.find_one_and_update.return_value = None
+        blob_collection_mock.insert_one.side_effect = DuplicateKeyError("saved again meanwhile")
+
+        assert await storage_repository.delete("digest", "file_a") is True
+        assert (tmp_path / "digest").exists()
+        blob_collection_mock.delete_one.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_save_waits_for_pending_delete(self, storage_repository, blob_collection_mock, tmp_path):
+        content = b"same content"
+        digest = hashlib.sha256(content).hexdigest()
+        blob_collection_mock.update_one.side_effect = [DuplicateKeyError("claimed"), Mock(modified_count=1)]
+
+        result = await storage_repository.save(UploadFile(filename="a.txt", file=BytesIO(content)), "uuid_a.txt")
+
+        assert result.filename == digest
+        assert blob_collection_mock.update_one.await_count == 2
+        assert (tmp_path / digest).read_bytes() == content
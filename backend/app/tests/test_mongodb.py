@@ -1,9 +1,9 @@
 import pytest
 from unittest.mock import AsyncMock, Mock, MagicMock, patch
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta
 from domain.entities import User, File, Folder
-from infrastructure.database.mongodb import MongoDBUserRepository, MongoDBFileRepository, MongoDBFolderRepository
+from infrastructure.database.mongodb import MongoDBUserRepository, MongoDBFileRepository, MongoDBFolderRepository, STREAM_BATCH_SIZE
 
 class TestMongoDBUserRepository:
     @pytest.fixture
@@ -29,14 +29,10 @@ class TestMongoDBUserRepository:
         inserted_id = ObjectId("507f1f77bcf86cd799439011")
         collection_mock.insert_one.return_value = Mock(inserted_id=inserted_id)
     
-        user_dict = user.mongo_dict()
-        user_dict["_id"] = inserted_id
-        collection_mock.find_one.return_value = user_dict
-
         result = await user_repository.create(user)
 
         collection_mock.insert_one.assert_awaited_once()
-        collection_mock.find_one.assert_awaited_once_with({"_id": inserted_id})
+        collection_mock.find_one.assert_not_awaited()
         assert result.id == inserted_id
         assert result.username == "testuser"
         assert result.email == "test@example.com"
@@ -141,6 +137,111 @@ class TestMongoDBFileRepository:
         assert result[0].filename == "uuid_test1.txt"
         assert result[1].filename == "uuid_test2.txt"
 
+    @pytest.mark.asyncio
+    async def test_list_by_owner_page(self, file_repository, collection_mock):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.__aiter__.return_value = []
+        collection_mock.find = Mock(return_value=cursor)
+
+        await file_repository.list_by_owner(
+            "507f1f77bcf86cd799439012", limit=50, after_id="507f1f77bcf86cd799439021"
+        )
+
+        collection_mock.find.assert_called_once_with({
+            "owner_id": ObjectId("507f1f77bcf86cd799439012"),
+            "trashed_at": None,
+            "parent_folder_id": None,
+            "_id": {"$gt": ObjectId("507f1f77bcf86cd799439021")}
+        }, None)
+        cursor.sort.assert_called_once_with("_id", 1)
+        cursor.limit.assert_called_once_with(50)
+    
+    @pytest.mark.asyncio
+    async def test_list_by_owner_shared_with(self, file_repository, collection_mock):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.__aiter__.return_value = []
+        collection_mock.find = Mock(return_value=cursor)
+
+        await file_repository.list_by_owner(
+            "507f1f77bcf86cd799439012", "507f1f77bcf86cd799439023", shared_with="507f1f77bcf86cd799439013"
+        )
+
+        collection_mock.find.assert_called_once_with({
+            "owner_id": ObjectId("507f1f77bcf86cd799439012"),
+            "parent_folder_id": ObjectId("507f1f77bcf86cd799439023"),
+            "trashed_at": None,
+            "$or": [{"shared_with": ObjectId("507f1f77bcf86cd799439013")}, {"is_public": True}]
+        }, None)
+    
+    @pytest.mark.asyncio
+    async def test_list_by_owner_projects_fields(self, file_repository, collection_mock):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.__aiter__.return_value = [
+            {"_id": ObjectId("507f1f77bcf86cd799439021"), "original_filename": "test.txt", "size": 4}
+        ]
+        collection_mock.find = Mock(return_value=cursor)
+
+        files = await file_repository.list_by_owner(
+            "507f1f77bcf86cd799439012", fields=["id", "original_filename", "size"]
+        )
+
+        assert collection_mock.find.call_args.args[1] == {"original_filename": 1, "size": 1, "_id": 1}
+        assert files[0].id == ObjectId("507f1f77bcf86cd799439021")
+        assert files[0].original_filename == "test.txt"
+        assert files[0].size == 4
+    
+    @pytest.mark.asyncio
+    async def test_iter_by_owner_streams_in_batches(self, file_repository, collection_mock):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.batch_size.return_value = cursor
+        cursor.__aiter__.return_value = [
+            {"_id": ObjectId("507f1f77bcf86cd799439021"), "size": 4},
+            {"_id": ObjectId("507f1f77bcf86cd799439022"), "size": 8}
+        ]
+        collection_mock.find = Mock(return_value=cursor)
+
+        files = [
+            file async for file in file_repository.iter_by_owner(
+                "507f1f77bcf86cd799439012", folder_id="507f1f77bcf86cd799439013", fields=["id", "size"]
+            )
+        ]
+
+        assert collection_mock.find.call_args.args[0] == {
+            "owner_id": ObjectId("507f1f77bcf86cd799439012"),
+            "parent_folder_id": ObjectId("507f1f77bcf86cd799439013"),
+            "trashed_at": None
+        }
+        cursor.limit.assert_not_called()
+        cursor.batch_size.assert_called_once_with(STREAM_BATCH_SIZE)
+        assert [file.size for file in files] == [4, 8]
+
+    @pytest.mark.asyncio
+    async def test_claim_trashed_claims_each_file(self, file_repository, collection_mock):
+        trashed = {
+            "_id": ObjectId("507f1f77bcf86cd799439021"),
+            "filename": "uuid_a.txt",
+            "original_filename": "a.txt",
+            "content_type": "text/plain",
+            "size": 4,
+            "owner_id": ObjectId("507f1f77bcf86cd799439012"),
+            "trashed_at": datetime.utcnow()
+        }
+        collection_mock.find_one_and_update = AsyncMock(side_effect=[trashed, None])
+
+        files = await file_repository.claim_trashed(10, 5, timedelta(minutes=10))
+
+        assert [file.id for file in files] == [trashed["_id"]]
+        assert collection_mock.find_one_and_update.await_count == 2
+        query, update = collection_mock.find_one_and_update.await_args.args
+        assert query["purge_attempts"] == {"$lt": 5}
+        assert query["$or"][0] == {"purge_claimed_at": None}
+        assert "purge_claimed_at" in update["$set"]
+
 class TestMongoDBFolderRepository:
     @pytest.fixture
     def collection_mock(self):
@@ -199,8 +300,6 @@ class TestMongoDBFolderRepository:
         folder_id = ObjectId("507f1f77bcf86cd799439011")
         update_data = {"name": "Updated Folder Name"}
         
-        collection_mock.update_one.return_value = Mock(modified_count=1)
-        
         updated_folder_dict = {
             "_id": folder_id,
             "name": "Updated Folder Name",
@@ -210,13 +309,36 @@ class TestMongoDBFolderRepository:
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
-        collection_mock.find_one.return_value = updated_folder_dict
+        collection_mock.find_one_and_update.return_value = updated_folder_dict
         
         result = await folder_repository.update(str(folder_id), update_data)
         
-        collection_mock.update_one.assert_awaited_once()
+        collection_mock.find_one_and_update.assert_awaited_once()
+        collection_mock.find_one.assert_not_awaited()
         assert result.name == "Updated Folder Name"
     
+    @pytest.mark.asyncio
+    async def test_add_shared_user(self, folder_repository, collection_mock):
+        folder_id = ObjectId("507f1f77bcf86cd799439011")
+        owner_id = ObjectId("507f1f77bcf86cd799439012")
+        user_id = ObjectId("507f1f77bcf86cd799439013")
+        collection_mock.find_one_and_update.return_value = {
+            "_id": folder_id,
+            "name": "Shared Folder",
+            "owner_id": owner_id,
+            "parent_folder_id": None,
+            "shared_with": [user_id],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        
+        result = await folder_repository.add_shared_user(str(folder_id), str(owner_id), str(user_id))
+        
+        query, update = collection_mock.find_one_and_update.await_args.args
+        assert query == {"_id": folder_id, "owner_id": owner_id}
+        assert update["$addToSet"] == {"shared_with": user_id}
+        assert result.shared_with == [user_id]
+    
     @pytest.mark.asyncio
     async def test_delete(self, folder_repository, collection_mock):
         folder_id = ObjectId("507f1f77bcf86cd799439011")
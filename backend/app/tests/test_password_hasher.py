@@ -0,0 +1,40 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from domain.password_hasher import PasswordHasher, PasswordHasherBusy
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        password_hasher = PasswordHasher(rounds=4)
+
+        password_hash = await password_hasher.hash("password123")
+
+        assert password_hash.startswith("$2b$04$")
+        assert await password_hasher.verify("password123", password_hash) is True
+        assert await password_hasher.verify("wrong", password_hash) is False
+        assert await password_hasher.verify("password123", "not-a-hash") is False
+        assert password_hasher.stats()["completed"] == 4
+    
+    def test_needs_rehash_compares_cost(self):
+        password_hasher = PasswordHasher(rounds=12)
+
+        assert password_hasher.needs_rehash("$2b$12$" + "a" * 53) is False
+        assert password_hasher.needs_rehash("$2b$10$" + "a" * 53) is True
+        assert password_hasher.needs_rehash("plain") is True
+    
+    @pytest.mark.asyncio
+    async def test_rejects_calls_beyond_max_pending(self):
+        password_hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        with patch("domain.password_hasher.bcrypt.checkpw", side_effect=lambda *args: release.wait()):
+            pending = asyncio.create_task(password_hasher.verify("a", "b"))
+            await asyncio.sleep(0.01)
+            with pytest.raises(PasswordHasherBusy):
+                await password_hasher.verify("a", "b")
+            release.set()
+            assert await pending is True
+
+        assert password_hasher.stats()["rejected"] == 1
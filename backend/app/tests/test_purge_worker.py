@@ -0,0 +1,91 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+from bson import ObjectId
+from domain.entities import File
+from infrastructure.purge_worker import PurgeWorker
+
+def make_file(file_id, filename, size):
+    return File(
+        id=ObjectId(file_id),
+        filename=filename,
+        original_filename=filename,
+        content_type="text/plain",
+        size=size,
+        owner_id=ObjectId("507f1f77bcf86cd799439012")
+    )
+
+class TestPurgeWorker:
+    @pytest.fixture
+    def file_repository_mock(self):
+        return Mock(
+            count_trashed=AsyncMock(return_value=2),
+            claim_trashed=AsyncMock(),
+            delete_many=AsyncMock(),
+            record_purge_failures=AsyncMock()
+        )
+    
+    @pytest.fixture
+    def file_storage_repository_mock(self):
+        return Mock(delete=AsyncMock(return_value=True))
+    
+    @pytest.fixture
+    def purge_worker(self, file_repository_mock, file_storage_repository_mock):
+        return PurgeWorker(file_repository_mock, file_storage_repository_mock, batch_size=10, retries=2)
+    
+    @pytest.mark.asyncio
+    async def test_purges_blobs_then_metadata(self, purge_worker, file_repository_mock, file_storage_repository_mock):
+        file_repository_mock.claim_trashed.return_value = [
+            make_file("507f1f77bcf86cd799439021", "uuid_a.txt", 10),
+            make_file("507f1f77bcf86cd799439022", "uuid_b.txt", 20)
+        ]
+        
+        purged = await purge_worker.purge_batch()
+        
+        assert purged == 2
+        file_repository_mock.claim_trashed.assert_awaited_once_with(
+            10, purge_worker.max_attempts, timedelta(seconds=purge_worker.claim_timeout)
+        )
+        file_storage_repository_mock.delete.assert_any_await("uuid_a.txt", "507f1f77bcf86cd799439021")
+        assert file_storage_repository_mock.delete.await_count == 2
+        file_repository_mock.delete_many.assert_awaited_once_with(
+            ["507f1f77bcf86cd799439021", "507f1f77bcf86cd799439022"]
+        )
+        file_repository_mock.record_purge_failures.assert_not_awaited()
+        stats = purge_worker.stats()
+        assert stats["purged_files"] == 2
+        assert stats["purged_bytes"] == 30
+        assert stats["backlog"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_retries_then_records_failure(self, purge_worker, file_repository_mock, file_storage_repository_mock, monkeypatch):
+        monkeypatch.setattr("infrastructure.purge_worker.RETRY_BACKOFF", 0)
+        file_repository_mock.claim_trashed.return_value = [
+            make_file("507f1f77bcf86cd799439021", "uuid_a.txt", 10),
+            make_file("507f1f77bcf86cd799439022", "uuid_b.txt", 20)
+        ]
+        
+        async def delete(filename, reference):
+            if filename == "uuid_b.txt":
+                raise OSError("device busy")
+            return True
+        
+        file_storage_repository_mock.delete.side_effect = delete
+        
+        purged = await purge_worker.purge_batch()
+        
+        assert purged == 1
+        file_repository_mock.delete_many.assert_awaited_once_with(["507f1f77bcf86cd799439021"])
+        file_repository_mock.record_purge_failures.assert_awaited_once_with(["507f1f77bcf86cd799439022"])
+        stats = purge_worker.stats()
+        assert stats["failed"] == 1
+        assert stats["retried"] == 1
+        assert stats["backlog"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_empty_backlog(self, purge_worker, file_repository_mock):
+        file_repository_mock.count_trashed.return_value = 0
+        file_repository_mock.claim_trashed.return_value = []
+        
+        assert await purge_worker.purge_batch() == 0
+        file_repository_mock.delete_many.assert_not_awaited()
@@ -0,0 +1,116 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+from bson import ObjectId
+from domain.entities import File
+from infrastructure.reconciler import StorageReconciler
+
+OLD = datetime.utcnow() - timedelta(days=1)
+
+
+def make_file(file_id, filename, created_at=OLD, trashed_at=None):
+    return File(
+        id=ObjectId(file_id),
+        filename=filename,
+        original_filename=filename,
+        content_type="text/plain",
+        size=4,
+        owner_id=ObjectId("507f1f77bcf86cd799439012"),
+        created_at=created_at,
+        trashed_at=trashed_at
+    )
+
+
+async def iterate(items):
+    for item in items:
+        yield item
+
+
+class TestStorageReconciler:
+    @pytest.fixture
+    def file_repository_mock(self):
+        return Mock(trash=AsyncMock(return_value=True))
+    
+    @pytest.fixture
+    def file_storage_repository_mock(self):
+        return Mock(
+            get_modified_at=AsyncMock(return_value=OLD),
+            quarantine=AsyncMock(return_value=True),
+            remove_orphan=AsyncMock(return_value=True)
+        )
+    
+    @pytest.fixture
+    def checkpoint_collection_mock(self):
+        return Mock(find_one=AsyncMock(return_value=None), update_one=AsyncMock())
+    
+    def make_reconciler(self, file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock, blobs, files, mode="quarantine"):
+        file_storage_repository_mock.iter_blob_names = Mock(return_value=iterate(blobs))
+        file_repository_mock.iter_by_filename = Mock(return_value=iterate(files))
+        return StorageReconciler(file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock, mode=mode)
+    
+    @pytest.mark.asyncio
+    async def test_quarantines_orphans_and_trashes_dangling_records(
+        self, file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock
+    ):
+        reconciler = self.make_reconciler(
+            file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock,
+            ["a", "b", "d"],
+            [
+                make_file("507f1f77bcf86cd799439021", "a"),
+                make_file("507f1f77bcf86cd799439022", "a"),
+                make_file("507f1f77bcf86cd799439023", "c")
+            ]
+        )
+
+        stats = await reconciler.run()
+
+        assert stats["matched"] == 1
+        assert stats["orphan_blobs"] == 2
+        assert stats["dangling_records"] == 1
+        assert stats["complete"] is True
+        assert [call.args[0] for call in file_storage_repository_mock.quarantine.await_args_list] == ["b", "d"]
+        file_repository_mock.trash.assert_awaited_once_with("507f1f77bcf86cd799439023", "507f1f77bcf86cd799439012")
+        file_storage_repository_mock.remove_orphan.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_report_mode_changes_nothing_and_skips_recent_entries(
+        self, file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock
+    ):
+        file_storage_repository_mock.get_modified_at.return_value = datetime.utcnow()
+        reconciler = self.make_reconciler(
+            file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock,
+            ["b"],
+            [
+                make_file("507f1f77bcf86cd799439021", "a"),
+                make_file("507f1f77bcf86cd799439022", "c", created_at=datetime.utcnow()),
+                make_file("507f1f77bcf86cd799439023", "d", trashed_at=OLD)
+            ],
+            mode="report"
+        )
+
+        stats = await reconciler.run()
+
+        assert stats["dangling_records"] == 1
+        assert stats["orphan_blobs"] == 0
+        assert stats["skipped_recent"] == 2
+        file_repository_mock.trash.assert_not_awaited()
+        file_storage_repository_mock.quarantine.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_stops_at_max_entries_and_resumes_from_checkpoint(
+        self, file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock
+    ):
+        checkpoint_collection_mock.find_one.return_value = {"_id": "storage", "after": "a"}
+        reconciler = self.make_reconciler(
+            file_repository_mock, file_storage_repository_mock, checkpoint_collection_mock,
+            ["b", "c", "d"], [], mode="delete"
+        )
+
+        stats = await reconciler.run(max_entries=2)
+
+        file_storage_repository_mock.iter_blob_names.assert_called_once_with("a")
+        file_repository_mock.iter_by_filename.assert_called_once_with("a")
+        assert stats["deleted"] == 2
+        assert stats["complete"] is False
+        assert stats["checkpoint"] == "c"
+        assert checkpoint_collection_mock.update_one.await_args.args[1]["$set"]["after"] == "c"
@@ -4,9 +4,11 @@ import jwt
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi import UploadFile, File as FastAPIFile
 from io import BytesIO
+from starlette.datastructures import Headers
 from bson import ObjectId
-from domain.entities import User, File, Folder
-from domain.use_cases import UserUseCases, FileUseCases, FolderUseCases
+from domain.entities import User, File, Folder, StoredBlob, UploadSession
+from domain.password_hasher import PasswordHasher
+from domain.use_cases import MAX_UPLOAD_CHUNKS, UserUseCases, FileUseCases, FolderUseCases, UploadSessionUseCases
 
 class TestUserUseCases:
     @pytest.fixture
@@ -36,7 +38,7 @@ class TestUserUseCases:
         )
         user_repository_mock.create.return_value = created_user
 
-        with patch('domain.use_cases.bcrypt') as bcrypt_mock:
+        with patch('domain.password_hasher.bcrypt') as bcrypt_mock:
             bcrypt_mock.hashpw.return_value = b'hashed_password'
             bcrypt_mock.gensalt.return_value = b'salt'
             
@@ -79,7 +81,7 @@ class TestUserUseCases:
         )
         user_repository_mock.get_by_email.return_value = user
         
-        with patch('domain.use_cases.bcrypt') as bcrypt_mock, \
+        with patch('domain.password_hasher.bcrypt') as bcrypt_mock, \
              patch('domain.use_cases.jwt.encode') as jwt_encode_mock:
             bcrypt_mock.checkpw.return_value = True
             jwt_encode_mock.return_value = "test-token"
@@ -102,7 +104,7 @@ class TestUserUseCases:
         )
         user_repository_mock.get_by_email.return_value = user
         
-        with patch('domain.use_cases.bcrypt') as bcrypt_mock:
+        with patch('domain.password_hasher.bcrypt') as bcrypt_mock:
             bcrypt_mock.checkpw.return_value = False
             
             token = await user_use_cases.authenticate_user(
@@ -111,17 +113,38 @@ class TestUserUseCases:
             )
         
         assert token is None
+    
+    @pytest.mark.asyncio
+    async def test_authenticate_user_rehashes_outdated_cost(self, user_repository_mock):
+        password_hasher = PasswordHasher(rounds=5)
+        user_use_cases = UserUseCases(user_repository_mock, "test-secret-key", password_hasher)
+        user_repository_mock.get_by_email.return_value = User(
+            id=ObjectId("507f1f77bcf86cd799439011"),
+            username="testuser",
+            email="test@example.com",
+            password_hash=await PasswordHasher(rounds=4).hash("password123")
+        )
+
+        token = await user_use_cases.authenticate_user(email="test@example.com", password="password123")
+
+        assert token is not None
+        user_id, data = user_repository_mock.update.await_args.args
+        assert user_id == "507f1f77bcf86cd799439011"
+        assert data["password_hash"].startswith("$2b$05$")
+        assert await password_hasher.verify("password123", data["password_hash"])
 
 class TestFileUseCases:
     @pytest.fixture
     def file_repository_mock(self):
         return Mock(
             create=AsyncMock(),
+            create_many=AsyncMock(),
             get_by_id=AsyncMock(),
             list_by_owner=AsyncMock(),
             list_shared_with_user=AsyncMock(),
             list_public_by_link=AsyncMock(),
             update=AsyncMock(),
+            add_shared_user=AsyncMock(),
             delete=AsyncMock()
         )
     
@@ -129,6 +152,7 @@ class TestFileUseCases:
     def file_storage_repository_mock(self):
         return Mock(
             save=AsyncMock(),
+            save_stream=AsyncMock(),
             get=AsyncMock(),
             delete=AsyncMock()
         )
@@ -141,16 +165,18 @@ class TestFileUseCases:
     
     @pytest.mark.asyncio
     async def test_upload_file_success(self, file_use_cases, file_repository_mock, file_storage_repository_mock):
-        return
-        """Тест успешной загрузки файла."""
         file_content = b"test file content"
         upload_file = UploadFile(
             filename="test.txt",
             file=BytesIO(file_content),
-            content_type="text/plain"
+            headers=Headers({"content-type": "text/plain"})
         )
         
-        file_storage_repository_mock.save.return_value = "uuid_test.txt"
+        file_storage_repository_mock.save.return_value = StoredBlob(
+            filename="uuid_test.txt",
+            size=len(file_content),
+            checksum="abc123"
+        )
         
         created_file = File(
             id=ObjectId("507f1f77bcf86cd799439011"),
@@ -158,67 +184,163 @@ class TestFileUseCases:
             original_filename="test.txt",
             content_type="text/plain",
             size=len(file_content),
+            checksum="abc123",
             owner_id=ObjectId("507f1f77bcf86cd799439012")
         )
         file_repository_mock.create.return_value = created_file
     
-        with patch.object(file_use_cases, '_get_file_size', return_value=len(file_content)):
-            result = await file_use_cases.upload_file(
-                upload_file=upload_file,
-                owner_id="507f1f77bcf86cd799439012"
-            )
+        result = await file_use_cases.upload_file(
+            upload_file=upload_file,
+            owner_id="507f1f77bcf86cd799439012"
+        )
         
         assert result == created_file
         file_storage_repository_mock.save.assert_awaited_once()
         file_repository_mock.create.assert_awaited_once()
+        stored_file = file_repository_mock.create.await_args.args[0]
+        assert stored_file.size == len(file_content)
+        assert stored_file.checksum == "abc123"
+        assert file_storage_repository_mock.save.await_args.args[2] == str(stored_file.id)
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("original_filename, expected", [
+        ("../../../../escaped.txt", "escaped.txt"),
+        ("..\\..\\escaped.txt", "escaped.txt"),
+        ("..", "file")
+    ])
+    async def test_upload_strips_path_from_filename(
+        self, file_use_cases, file_repository_mock, file_storage_repository_mock, original_filename, expected
+    ):
+        file_storage_repository_mock.save_stream.side_effect = lambda chunks, filename, reference: StoredBlob(
+            filename=filename, size=4, checksum="abc123"
+        )
+        file_repository_mock.create.side_effect = lambda file: file
+        
+        result = await file_use_cases.create_file_from_stream(
+            chunks="chunks",
+            original_filename=original_filename,
+            content_type="text/plain",
+            owner_id="507f1f77bcf86cd799439012"
+        )
+        
+        stored_name = file_storage_repository_mock.save_stream.await_args.args[1]
+        assert "/" not in stored_name and "\\" not in stored_name
+        assert stored_name.endswith(f"_{expected}")
+        assert result.original_filename == expected
+    
+    @pytest.mark.asyncio
+    async def test_upload_into_foreign_folder(self, file_repository_mock, file_storage_repository_mock):
+        folder_repository_mock = Mock(get_by_id=AsyncMock(return_value=Folder(
+            id=ObjectId("507f1f77bcf86cd799439031"),
+            name="theirs",
+            owner_id=ObjectId("507f1f77bcf86cd799439013")
+        )))
+        file_use_cases = FileUseCases(file_repository_mock, file_storage_repository_mock, folder_repository_mock)
+        
+        with pytest.raises(ValueError):
+            await file_use_cases.create_file_from_stream(
+                chunks="chunks",
+                original_filename="test.txt",
+                content_type="text/plain",
+                owner_id="507f1f77bcf86cd799439012",
+                parent_folder_id="507f1f77bcf86cd799439031"
+            )
+        
+        file_storage_repository_mock.save_stream.assert_not_awaited()
+        file_repository_mock.create.assert_not_awaited()
     
     @pytest.mark.asyncio
-    async def test_download_file_success(self, file_use_cases, file_repository_mock, file_storage_repository_mock):
+    async def test_upload_files_reports_per_file_errors(self, file_use_cases, file_repository_mock, file_storage_repository_mock):
+        upload_files = [
+            UploadFile(filename=name, file=BytesIO(b"content"), headers=Headers({"content-type": "text/plain"}))
+            for name in ("a.txt", "b.txt", "c.txt")
+        ]
+        
+        async def save(upload_file, filename, reference):
+            if upload_file.filename == "b.txt":
+                raise OSError("disk full")
+            return StoredBlob(filename=filename, size=7, checksum="abc123")
+        
+        file_storage_repository_mock.save.side_effect = save
+        file_repository_mock.create_many.side_effect = lambda files: [files[0], None]
+        
+        results = await file_use_cases.upload_files(
+            upload_files=upload_files,
+            owner_id="507f1f77bcf86cd799439012"
+        )
+        
+        assert results[0][0].original_filename == "a.txt"
+        assert results[0][1] is None
+        assert results[1] == (None, "Failed to store file")
+        assert results[2] == (None, "Failed to save file metadata")
+        file_repository_mock.create_many.assert_awaited_once()
+        assert len(file_repository_mock.create_many.await_args.args[0]) == 2
+        file_storage_repository_mock.delete.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_upload_files_cleans_up_when_metadata_write_fails(self, file_use_cases, file_repository_mock, file_storage_repository_mock):
+        upload_files = [
+            UploadFile(filename=name, file=BytesIO(b"content"), headers=Headers({"content-type": "text/plain"}))
+            for name in ("a.txt", "b.txt")
+        ]
+        file_storage_repository_mock.save.side_effect = (
+            lambda upload_file, filename, reference: StoredBlob(filename=filename, size=7, checksum="abc123")
+        )
+        file_repository_mock.create_many.side_effect = TimeoutError("server selection timed out")
+        
+        with pytest.raises(TimeoutError):
+            await file_use_cases.upload_files(
+                upload_files=upload_files,
+                owner_id="507f1f77bcf86cd799439012"
+            )
+        
+        assert file_storage_repository_mock.delete.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_file_is_metadata_only(self, file_use_cases, file_repository_mock, file_storage_repository_mock):
         file = File(
             id=ObjectId("507f1f77bcf86cd799439011"),
             filename="uuid_test.txt",
             original_filename="test.txt",
             content_type="text/plain",
             size=100,
-            owner_id=ObjectId("507f1f77bcf86cd799439012")
+            owner_id=ObjectId("507f1f77bcf86cd799439012"),
+            shared_with=[ObjectId("507f1f77bcf86cd799439013")]
         )
         file_repository_mock.get_by_id.return_value = file
-        
-        file_content = BytesIO(b"test file content")
-        file_storage_repository_mock.get.return_value = file_content
-        
-        result = await file_use_cases.download_file(
-            file_id="507f1f77bcf86cd799439011",
-            user_id="507f1f77bcf86cd799439012"
-        )
 
-        assert result is not None
-        assert result[0] == file_content
-        assert result[1] == "test.txt"
-        assert result[2] == "text/plain"
-        file_repository_mock.get_by_id.assert_awaited_once_with("507f1f77bcf86cd799439011")
-        file_storage_repository_mock.get.assert_awaited_once_with("uuid_test.txt")
+        shared = await file_use_cases.get_file("507f1f77bcf86cd799439011", "507f1f77bcf86cd799439013")
+        denied = await file_use_cases.get_file("507f1f77bcf86cd799439011", "507f1f77bcf86cd799439014")
+
+        assert shared == file
+        assert denied is None
+        assert file_repository_mock.get_by_id.await_count == 2
+        file_storage_repository_mock.get.assert_not_awaited()
     
     @pytest.mark.asyncio
-    async def test_download_file_no_access(self, file_use_cases, file_repository_mock):
-        file = File(
+    async def test_share_file_is_single_update(self, file_use_cases, file_repository_mock):
+        shared_file = File(
             id=ObjectId("507f1f77bcf86cd799439011"),
             filename="uuid_test.txt",
             original_filename="test.txt",
             content_type="text/plain",
             size=100,
             owner_id=ObjectId("507f1f77bcf86cd799439012"),
-            is_public=False,
-            shared_with=[]
+            shared_with=[ObjectId("507f1f77bcf86cd799439013")]
         )
-        file_repository_mock.get_by_id.return_value = file
+        file_repository_mock.add_shared_user.return_value = shared_file
         
-        result = await file_use_cases.download_file(
+        result = await file_use_cases.share_file(
             file_id="507f1f77bcf86cd799439011",
-            user_id="507f1f77bcf86cd799439013"
+            owner_id="507f1f77bcf86cd799439012",
+            shared_with_id="507f1f77bcf86cd799439013"
         )
         
-        assert result is None
+        assert result == shared_file
+        file_repository_mock.add_shared_user.assert_awaited_once_with(
+            "507f1f77bcf86cd799439011", "507f1f77bcf86cd799439012", "507f1f77bcf86cd799439013"
+        )
+        file_repository_mock.get_by_id.assert_not_awaited()
     
     @pytest.mark.asyncio
     async def test_create_public_link(self, file_use_cases, file_repository_mock):
@@ -264,21 +386,100 @@ class TestFolderUseCases:
             create=AsyncMock(),
             get_by_id=AsyncMock(),
             list_by_owner=AsyncMock(),
+            list_by_ancestor=AsyncMock(),
+            list_by_ids=AsyncMock(),
+            count_by_owner=AsyncMock(),
             update=AsyncMock(),
-            delete=AsyncMock()
+            move=AsyncMock(),
+            delete=AsyncMock(),
+            delete_subtree=AsyncMock()
         )
     
     @pytest.fixture
     def file_repository_mock(self):
         return Mock(
             list_by_owner=AsyncMock(),
-            delete=AsyncMock()
+            list_by_ancestor=AsyncMock(),
+            rebase_ancestors=AsyncMock(),
+            usage_by_owner=AsyncMock(),
+            delete=AsyncMock(),
+            trash_by_ancestor=AsyncMock()
         )
     
     @pytest.fixture
     def folder_use_cases(self, folder_repository_mock, file_repository_mock):
         return FolderUseCases(folder_repository_mock, file_repository_mock)
     
+    @pytest.mark.asyncio
+    async def test_get_folder_contents_with_breadcrumbs(self, folder_use_cases, folder_repository_mock, file_repository_mock):
+        root = Folder(id=ObjectId("507f1f77bcf86cd799439021"), name="root", owner_id=ObjectId("507f1f77bcf86cd799439012"))
+        middle = Folder(
+            id=ObjectId("507f1f77bcf86cd799439022"),
+            name="middle",
+            owner_id=ObjectId("507f1f77bcf86cd799439012"),
+            ancestors=[root.id],
+            shared_with=[ObjectId("507f1f77bcf86cd799439013")]
+        )
+        folder = Folder(
+            id=ObjectId("507f1f77bcf86cd799439023"),
+            name="leaf",
+            owner_id=ObjectId("507f1f77bcf86cd799439012"),
+            parent_folder_id=middle.id,
+            ancestors=[root.id, middle.id],
+            shared_with=[ObjectId("507f1f77bcf86cd799439013")]
+        )
+        folder_repository_mock.get_by_id.return_value = folder
+        folder_repository_mock.list_by_ids.return_value = [middle, root]
+        folder_repository_mock.list_by_owner.return_value = []
+        folder_repository_mock.count_by_owner.return_value = 4
+        file_repository_mock.list_by_owner.return_value = [
+            File(
+                id=ObjectId("507f1f77bcf86cd799439031"),
+                filename="uuid_report.pdf",
+                original_filename="report.pdf",
+                content_type="application/pdf",
+                size=700,
+                owner_id=ObjectId("507f1f77bcf86cd799439012"),
+                parent_folder_id=folder.id,
+                shared_with=[ObjectId("507f1f77bcf86cd799439013"), ObjectId("507f1f77bcf86cd799439014")],
+                is_public=True,
+                public_link="secret-token"
+            )
+        ]
+        file_repository_mock.usage_by_owner.return_value = (7, 700)
+
+        contents = await folder_use_cases.get_folder_contents(
+            "507f1f77bcf86cd799439013", "507f1f77bcf86cd799439023", limit=11
+        )
+
+        assert contents.folder.id == folder.id
+        assert contents.folder.shared_with == []
+        assert [ancestor.name for ancestor in contents.ancestors] == ["middle"]
+        assert (contents.folder_count, contents.file_count, contents.total_size) == (4, 7, 700)
+        assert contents.files[0].shared_with == []
+        assert contents.files[0].public_link is None
+        folder_repository_mock.list_by_owner.assert_awaited_once_with(
+            "507f1f77bcf86cd799439012", "507f1f77bcf86cd799439023", 11, None, None, "507f1f77bcf86cd799439013"
+        )
+        file_repository_mock.usage_by_owner.assert_awaited_once_with(
+            "507f1f77bcf86cd799439012", "507f1f77bcf86cd799439023", "507f1f77bcf86cd799439013"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_get_folder_contents_denied(self, folder_use_cases, folder_repository_mock, file_repository_mock):
+        folder_repository_mock.get_by_id.return_value = Folder(
+            id=ObjectId("507f1f77bcf86cd799439023"),
+            name="private",
+            owner_id=ObjectId("507f1f77bcf86cd799439012")
+        )
+
+        contents = await folder_use_cases.get_folder_contents(
+            "507f1f77bcf86cd799439013", "507f1f77bcf86cd799439023"
+        )
+
+        assert contents is None
+        file_repository_mock.list_by_owner.assert_not_awaited()
+    
     @pytest.mark.asyncio
     async def test_create_folder(self, folder_use_cases, folder_repository_mock):
         """Тест создания новой папки."""
@@ -346,3 +547,264 @@ class TestFolderUseCases:
         folder_repository_mock.list_by_owner.assert_awaited_once_with("507f1f77bcf86cd799439012", "507f1f77bcf86cd799439011")
         file_repository_mock.delete.assert_awaited_once_with("507f1f77bcf86cd799439021")
         folder_repository_mock.delete.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_walk_folder_builds_unique_paths(self, folder_use_cases, folder_repository_mock, file_repository_mock):
+        owner_id = ObjectId("507f1f77bcf86cd799439012")
+        root = Folder(id=ObjectId("507f1f77bcf86cd799439011"), name="Root", owner_id=owner_id)
+        child = Folder(
+            id=ObjectId("507f1f77bcf86cd799439031"),
+            name="a.txt",
+            owner_id=owner_id,
+            parent_folder_id=root.id,
+            ancestors=[root.id]
+        )
+        
+        def make_file(name, ancestors):
+            return File(
+                filename=f"uuid_{name}",
+                original_filename=name,
+                content_type="text/plain",
+                size=1,
+                owner_id=owner_id,
+                parent_folder_id=ancestors[-1],
+                ancestors=ancestors
+            )
+        
+        folder_repository_mock.list_by_ancestor.return_value = [child]
+        file_repository_mock.list_by_ancestor.return_value = [
+            make_file("a.txt", [root.id]),
+            make_file("a/b.txt", [root.id]),
+            make_file("c.txt", [root.id, child.id])
+        ]
+        
+        entries = [(path, file is None) async for path, file in folder_use_cases.walk_folder(root, str(owner_id))]
+        
+        assert entries == [
+            ("Root", True),
+            ("Root/a.txt", True),
+            ("Root/a (1).txt", False),
+            ("Root/a_b.txt", False),
+            ("Root/a.txt/c.txt", False)
+        ]
+        folder_repository_mock.list_by_ancestor.assert_awaited_once_with(str(root.id))
+    
+    @pytest.mark.asyncio
+    async def test_walk_folder_skips_entries_hidden_from_shared_user(self, folder_use_cases, folder_repository_mock, file_repository_mock):
+        owner_id = ObjectId("507f1f77bcf86cd799439012")
+        user_id = ObjectId("507f1f77bcf86cd799439013")
+        root = Folder(id=ObjectId("507f1f77bcf86cd799439011"), name="Root", owner_id=owner_id, shared_with=[user_id])
+        private = Folder(
+            id=ObjectId("507f1f77bcf86cd799439031"),
+            name="private",
+            owner_id=owner_id,
+            parent_folder_id=root.id,
+            ancestors=[root.id]
+        )
+        
+        def make_file(name, ancestors, shared_with):
+            return File(
+                filename=f"uuid_{name}",
+                original_filename=name,
+                content_type="text/plain",
+                size=1,
+                owner_id=owner_id,
+                parent_folder_id=ancestors[-1],
+                ancestors=ancestors,
+                shared_with=shared_with
+            )
+        
+        folder_repository_mock.list_by_ancestor.return_value = [private]
+        file_repository_mock.list_by_ancestor.return_value = [
+            make_file("shared.txt", [root.id], [user_id]),
+            make_file("secret.txt", [root.id], []),
+            make_file("nested.txt", [root.id, private.id], [user_id])
+        ]
+        
+        entries = [path async for path, file in folder_use_cases.walk_folder(root, str(user_id))]
+        
+        assert entries == ["Root", "Root/shared.txt"]
+    
+    @pytest.mark.asyncio
+    async def test_delete_folder_trashes_subtree(self, folder_use_cases, folder_repository_mock, file_repository_mock):
+        folder = Folder(
+            id=ObjectId("507f1f77bcf86cd799439011"),
+            name="Test Folder",
+            owner_id=ObjectId("507f1f77bcf86cd799439012")
+        )
+        folder_repository_mock.get_by_id.return_value = folder
+        folder_repository_mock.delete_subtree.return_value = 3
+        
+        result = await folder_use_cases.delete_folder(
+            folder_id="507f1f77bcf86cd799439011",
+            owner_id="507f1f77bcf86cd799439012"
+        )
+        
+        assert result is True
+        file_repository_mock.trash_by_ancestor.assert_awaited_once_with("507f1f77bcf86cd799439011")
+        folder_repository_mock.delete_subtree.assert_awaited_once_with("507f1f77bcf86cd799439011")
+        file_repository_mock.delete.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_move_folder_rebases_subtree(self, folder_use_cases, folder_repository_mock, file_repository_mock):
+        owner_id = ObjectId("507f1f77bcf86cd799439012")
+        folder = Folder(id=ObjectId("507f1f77bcf86cd799439011"), name="Moved", owner_id=owner_id)
+        target = Folder(
+            id=ObjectId("507f1f77bcf86cd799439041"),
+            name="Target",
+            owner_id=owner_id,
+            ancestors=[ObjectId("507f1f77bcf86cd799439051")]
+        )
+        folders = {str(folder.id): folder, str(target.id): target}
+        folder_repository_mock.get_by_id.side_effect = lambda folder_id: folders.get(folder_id)
+        folder_repository_mock.move.return_value = folder
+        
+        result = await folder_use_cases.move_folder(str(folder.id), str(owner_id), str(target.id))
+        
+        assert result == folder
+        expected_ancestors = [ObjectId("507f1f77bcf86cd799439051"), target.id]
+        folder_repository_mock.move.assert_awaited_once_with(str(folder.id), str(target.id), expected_ancestors)
+        file_repository_mock.rebase_ancestors.assert_awaited_once_with(str(folder.id), expected_ancestors)
+    
+    @pytest.mark.asyncio
+    async def test_move_folder_into_descendant(self, folder_use_cases, folder_repository_mock):
+        owner_id = ObjectId("507f1f77bcf86cd799439012")
+        folder = Folder(id=ObjectId("507f1f77bcf86cd799439011"), name="Moved", owner_id=owner_id)
+        descendant = Folder(
+            id=ObjectId("507f1f77bcf86cd799439041"),
+            name="Child",
+            owner_id=owner_id,
+            parent_folder_id=folder.id,
+            ancestors=[folder.id]
+        )
+        folders = {str(folder.id): folder, str(descendant.id): descendant}
+        folder_repository_mock.get_by_id.side_effect = lambda folder_id: folders.get(folder_id)
+        
+        with pytest.raises(ValueError):
+            await folder_use_cases.move_folder(str(folder.id), str(owner_id), str(descendant.id))
+        folder_repository_mock.move.assert_not_awaited()
+
+class TestUploadSessionUseCases:
+    @pytest.fixture
+    def upload_session(self):
+        return UploadSession(
+            id=ObjectId("507f1f77bcf86cd799439041"),
+            owner_id=ObjectId("507f1f77bcf86cd799439012"),
+            filename="video.mp4",
+            content_type="video/mp4",
+            total_chunks=3,
+            received_chunks=[2, 0],
+            expires_at=datetime.utcnow() + timedelta(hours=1)
+        )
+    
+    @pytest.fixture
+    def upload_session_repository_mock(self, upload_session):
+        return Mock(
+            create=AsyncMock(),
+            get_by_id=AsyncMock(return_value=upload_session),
+            add_received_chunk=AsyncMock(),
+            claim_for_commit=AsyncMock(return_value=upload_session),
+            release_commit=AsyncMock(),
+            list_expired=AsyncMock(),
+            delete=AsyncMock(return_value=True)
+        )
+    
+    @pytest.fixture
+    def file_storage_repository_mock(self):
+        return Mock(
+            save_part=AsyncMock(),
+            iter_parts=Mock(return_value="parts"),
+            delete_parts=AsyncMock()
+        )
+    
+    @pytest.fixture
+    def file_use_cases_mock(self):
+        return Mock(create_file_from_stream=AsyncMock())
+    
+    @pytest.fixture
+    def upload_session_use_cases(self, upload_session_repository_mock, file_storage_repository_mock, file_use_cases_mock):
+        return UploadSessionUseCases(upload_session_repository_mock, file_storage_repository_mock, file_use_cases_mock)
+    
+    @pytest.mark.asyncio
+    async def test_upload_chunk(self, upload_session_use_cases, upload_session_repository_mock, file_storage_repository_mock):
+        await upload_session_use_cases.upload_chunk(
+            session_id="507f1f77bcf86cd799439041",
+            owner_id="507f1f77bcf86cd799439012",
+            index=1,
+            chunks="chunks"
+        )
+        
+        file_storage_repository_mock.save_part.assert_awaited_once_with("507f1f77bcf86cd799439041", 1, "chunks")
+        assert upload_session_repository_mock.add_received_chunk.await_args.args[:2] == ("507f1f77bcf86cd799439041", 1)
+    
+    @pytest.mark.asyncio
+    async def test_upload_chunk_out_of_range(self, upload_session_use_cases, file_storage_repository_mock):
+        with pytest.raises(ValueError):
+            await upload_session_use_cases.upload_chunk(
+                session_id="507f1f77bcf86cd799439041",
+                owner_id="507f1f77bcf86cd799439012",
+                index=3,
+                chunks="chunks"
+            )
+        file_storage_repository_mock.save_part.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_upload_chunk_beyond_limit(self, upload_session_use_cases, upload_session, file_storage_repository_mock):
+        upload_session.total_chunks = None
+        
+        with pytest.raises(ValueError):
+            await upload_session_use_cases.upload_chunk(
+                session_id="507f1f77bcf86cd799439041",
+                owner_id="507f1f77bcf86cd799439012",
+                index=MAX_UPLOAD_CHUNKS,
+                chunks="chunks"
+            )
+        file_storage_repository_mock.save_part.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_commit_with_sparse_chunks(self, upload_session_use_cases, upload_session, upload_session_repository_mock):
+        upload_session.total_chunks = None
+        upload_session.received_chunks = [0, 10 ** 12]
+        
+        with pytest.raises(ValueError):
+            await upload_session_use_cases.commit_session(
+                session_id="507f1f77bcf86cd799439041",
+                owner_id="507f1f77bcf86cd799439012"
+            )
+        upload_session_repository_mock.claim_for_commit.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_commit_incomplete_session(self, upload_session_use_cases, upload_session_repository_mock):
+        with pytest.raises(ValueError) as exc_info:
+            await upload_session_use_cases.commit_session(
+                session_id="507f1f77bcf86cd799439041",
+                owner_id="507f1f77bcf86cd799439012"
+            )
+        
+        assert "[1]" in str(exc_info.value)
+        upload_session_repository_mock.claim_for_commit.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_commit_assembles_parts(self, upload_session_use_cases, upload_session, upload_session_repository_mock, file_storage_repository_mock, file_use_cases_mock):
+        upload_session.received_chunks = [0, 1, 2]
+        
+        await upload_session_use_cases.commit_session(
+            session_id="507f1f77bcf86cd799439041",
+            owner_id="507f1f77bcf86cd799439012"
+        )
+        
+        file_storage_repository_mock.iter_parts.assert_called_once_with("507f1f77bcf86cd799439041", 3)
+        file_use_cases_mock.create_file_from_stream.assert_awaited_once_with(
+            "parts", "video.mp4", "video/mp4", "507f1f77bcf86cd799439012", None
+        )
+        file_storage_repository_mock.delete_parts.assert_awaited_once_with("507f1f77bcf86cd799439041")
+        upload_session_repository_mock.delete.assert_awaited_once_with("507f1f77bcf86cd799439041")
+    
+    @pytest.mark.asyncio
+    async def test_purge_expired_sessions(self, upload_session_use_cases, upload_session, upload_session_repository_mock, file_storage_repository_mock):
+        upload_session_repository_mock.list_expired.return_value = [upload_session]
+        
+        purged = await upload_session_use_cases.purge_expired_sessions(batch_size=10)
+        
+        assert purged == 1
+        file_storage_repository_mock.delete_parts.assert_awaited_once_with("507f1f77bcf86cd799439041")
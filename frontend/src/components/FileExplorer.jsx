@@ -4,12 +4,15 @@ import FileItem from './FileItem';
 import FolderItem from './FolderItem';
 import FolderForm from './FolderForm';
 import FileUpload from './FileUpload';
-import { getFiles, getFolders } from '../services/file';
+import { getFolderContents } from '../services/file';
 
 const FileExplorer = ({ currentFolderId = null, onFolderClick, onRefresh }) => {
   const [files, setFiles] = useState([]);
   const [folders, setFolders] = useState([]);
+  const [nextFoldersCursor, setNextFoldersCursor] = useState(null);
+  const [nextFilesCursor, setNextFilesCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [showFolderModal, setShowFolderModal] = useState(false);
   const [showUploadModal, setShowUploadModal] = useState(false);
@@ -19,13 +22,12 @@ const FileExplorer = ({ currentFolderId = null, onFolderClick, onRefresh }) => {
       setLoading(true);
       setError(null);
       
-      const [filesData, foldersData] = await Promise.all([
-        getFiles(currentFolderId),
-        getFolders(currentFolderId)
-      ]);
+      const contents = await getFolderContents(currentFolderId);
       
-      setFiles(filesData);
-      setFolders(foldersData);
+      setFiles(contents.files);
+      setFolders(contents.folders);
+      setNextFoldersCursor(contents.next_folders_cursor);
+      setNextFilesCursor(contents.next_files_cursor);
     } catch (err) {
       console.error('Error fetching data:', err);
       setError('Failed to load files and folders. Please try again.');
@@ -34,6 +36,32 @@ const FileExplorer = ({ currentFolderId = null, onFolderClick, onRefresh }) => {
     }
   };
 
+  // Without a cursor the endpoint returns the first page again, so only the lists
+  // that had a cursor are extended.
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const contents = await getFolderContents(currentFolderId, {
+        foldersCursor: nextFoldersCursor,
+        filesCursor: nextFilesCursor,
+      });
+      
+      if (nextFoldersCursor) {
+        setFolders(previous => [...previous, ...contents.folders]);
+        setNextFoldersCursor(contents.next_folders_cursor);
+      }
+      if (nextFilesCursor) {
+        setFiles(previous => [...previous, ...contents.files]);
+        setNextFilesCursor(contents.next_files_cursor);
+      }
+    } catch (err) {
+      console.error('Error fetching data:', err);
+      setError('Failed to load files and folders. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchData();
   }, [currentFolderId]);
@@ -82,7 +110,7 @@ const FileExplorer = ({ currentFolderId = null, onFolderClick, onRefresh }) => {
                     <FolderItem 
                       key={folder.id} 
                       folder={folder} 
-                      onClick={() => onFolderClick(folder.id)}
+                      onClick={() => onFolderClick(folder.id, folder.name)}
                       onDelete={handleRefresh}
                     />
                   ))}
@@ -112,6 +140,12 @@ const FileExplorer = ({ currentFolderId = null, onFolderClick, onRefresh }) => {
                 </div>
               )
             )}
+            
+            {(nextFoldersCursor || nextFilesCursor) && (
+              <button className="btn btn-secondary load-more" onClick={handleLoadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            )}
           </>
         )}
       </div>
@@ -1,13 +1,12 @@
 import React, { useState, useEffect } from 'react';
 import { FaHome, FaFolder } from 'react-icons/fa';
 import FileExplorer from '../components/FileExplorer';
-import { getFolders } from '../services/file';
 
 const Dashboard = () => {
   const [currentFolderId, setCurrentFolderId] = useState(null);
   const [breadcrumb, setBreadcrumb] = useState([{ id: null, name: 'Home' }]);
   
-  const navigateToFolder = async (folderId) => {
+  const navigateToFolder = (folderId, folderName = null) => {
     setCurrentFolderId(folderId);
     
     if (!folderId) {
@@ -22,18 +21,10 @@ const Dashboard = () => {
     if (existingIndex >= 0) {
       // Folder exists in breadcrumb, truncate to this point
       setBreadcrumb(breadcrumb.slice(0, existingIndex + 1));
-    } else {
-      // Add folder to breadcrumb
-      try {
-        const folders = await getFolders(breadcrumb[breadcrumb.length - 1].id);
-        const folder = folders.find(f => f.id === folderId);
-        
-        if (folder) {
-          setBreadcrumb([...breadcrumb, { id: folder.id, name: folder.name }]);
-        }
-      } catch (err) {
-        console.error('Error updating breadcrumb:', err);
-      }
+    } else if (folderName) {
+      // Add folder to breadcrumb; the explorer passes the name along, so the parent's
+      // listing (which is paginated) does not need to be fetched again
+      setBreadcrumb([...breadcrumb, { id: folderId, name: folderName }]);
     }
   };
 
@@ -5,15 +5,18 @@ import { getSharedFiles } from '../services/file';
 
 const SharedFiles = () => {
   const [files, setFiles] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
   const fetchSharedFiles = async () => {
     try {
       setLoading(true);
       setError(null);
-      const data = await getSharedFiles();
-      setFiles(data);
+      const page = await getSharedFiles();
+      setFiles(page.files);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       console.error('Error fetching shared files:', err);
       setError('Failed to load shared files. Please try again.');
@@ -22,6 +25,20 @@ const SharedFiles = () => {
     }
   };
 
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await getSharedFiles(nextCursor);
+      setFiles(previous => [...previous, ...page.files]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error('Error fetching shared files:', err);
+      setError('Failed to load shared files. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchSharedFiles();
   }, []);
@@ -49,15 +66,22 @@ const SharedFiles = () => {
           ) : error ? (
             <div className="error-message">{error}</div>
           ) : files.length > 0 ? (
-            <div className="file-list">
-              {files.map(file => (
-                <FileItem 
-                  key={file.id} 
-                  file={file}
-                  onDelete={handleRefresh}
-                />
-              ))}
-            </div>
+            <>
+              <div className="file-list">
+                {files.map(file => (
+                  <FileItem 
+                    key={file.id} 
+                    file={file}
+                    onDelete={handleRefresh}
+                  />
+                ))}
+              </div>
+              {nextCursor && (
+                <button className="btn btn-secondary load-more" onClick={handleLoadMore} disabled={loadingMore}>
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              )}
+            </>
           ) : (
             <div className="empty-state">
               <FaFile size={40} />
@@ -1,18 +1,15 @@
 import api from './api';
 
-// Загрузка файла
+// Загрузка файла (тело запроса передаётся потоком, без multipart)
 export const uploadFile = async (file, folderId = null) => {
-  const formData = new FormData();
-  formData.append('file', file);
-  
-  let url = '/files/';
+  const params = new URLSearchParams({ filename: file.name });
   if (folderId) {
-    url += `?folder_id=${folderId}`;
+    params.append('folder_id', folderId);
   }
   
-  const response = await api.post(url, formData, {
+  const response = await api.post(`/files/stream?${params.toString()}`, file, {
     headers: {
-      'Content-Type': 'multipart/form-data',
+      'Content-Type': file.type || 'application/octet-stream',
     },
   });
   return response.data;
@@ -29,10 +26,14 @@ export const getFiles = async (folderId = null) => {
   return response.data;
 };
 
-// Получение файлов, доступных по ссылке
-export const getSharedFiles = async () => {
-  const response = await api.get('/files/shared');
-  return response.data;
+// Получение файлов, доступных по ссылке (постранично, курсор следующей страницы — в X-Next-Cursor)
+export const getSharedFiles = async (cursor = null) => {
+  const params = cursor ? { cursor } : {};
+  const response = await api.get('/files/shared', { params });
+  return {
+    files: response.data,
+    nextCursor: response.headers['x-next-cursor'] || null,
+  };
 };
 
 // Скачивание файла
@@ -97,6 +98,24 @@ export const getFolders = async (parentFolderId = null) => {
   return response.data;
 };
 
+// Получение содержимого папки (подпапки, файлы и счётчики одним запросом).
+// Курсоры из next_folders_cursor / next_files_cursor запрашивают следующие страницы.
+export const getFolderContents = async (folderId = null, { foldersCursor = null, filesCursor = null } = {}) => {
+  const params = {};
+  if (folderId) {
+    params.folder_id = folderId;
+  }
+  if (foldersCursor) {
+    params.folders_cursor = foldersCursor;
+  }
+  if (filesCursor) {
+    params.files_cursor = filesCursor;
+  }
+  
+  const response = await api.get('/folders/contents', { params });
+  return response.data;
+};
+
 // Удаление папки
 export const deleteFolder = async (folderId) => {
   await api.delete(`/folders/${folderId}`);